@@ -0,0 +1,73 @@
+"""
+Time-to-first-response for a cold worker process.
+
+Each run starts a fresh interpreter, imports core.wsgi (with or without the
+start-up warm-up) and sends a few requests straight to the WSGI application.
+Reports the median import time and first/second response times per mode.
+
+    python benchmark_cold_start.py --runs 5 --path / --path /maids/
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD = r'''
+import io, json, sys, time
+from wsgiref.util import setup_testing_defaults
+
+start = time.perf_counter()
+from core.wsgi import application
+ready = time.perf_counter()
+
+timings = {'import_ms': (ready - start) * 1000}
+for path in sys.argv[1:]:
+    for attempt in ('first', 'second'):
+        environ = {'PATH_INFO': path, 'SERVER_NAME': 'localhost', 'HTTP_HOST': 'localhost',
+                   'wsgi.errors': io.StringIO()}
+        setup_testing_defaults(environ)
+        statuses = []
+        t0 = time.perf_counter()
+        body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+        for _chunk in body:
+            pass
+        timings[f'{path} {attempt}_ms'] = (time.perf_counter() - t0) * 1000
+        timings[f'{path} status'] = statuses[0]
+print(json.dumps(timings))
+'''
+
+
+def run_once(paths, warmup):
+    env = {**os.environ, 'WARMUP_ON_STARTUP': '1' if warmup else '0'}
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD, *paths],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--path', action='append', dest='paths', help="Path to request (repeatable, default /).")
+    args = parser.parse_args()
+    paths = args.paths or ['/']
+
+    for warmup in (False, True):
+        runs = [run_once(paths, warmup) for _ in range(args.runs)]
+        print(f"Warm-up {'on' if warmup else 'off'} (median of {args.runs} cold processes)")
+        print(f"  import core.wsgi: {statistics.median(r['import_ms'] for r in runs):8.1f} ms")
+        for path in paths:
+            first = statistics.median(r[f'{path} first_ms'] for r in runs)
+            second = statistics.median(r[f'{path} second_ms'] for r in runs)
+            print(f"  {path} [{runs[0][f'{path} status']}]: first {first:8.1f} ms, second {second:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Response size and compression cost per language.
+
+Renders the maid listing and a maid profile in each configured language
+(in a throwaway test database) and reports, per page: the raw HTML size,
+the size after whitespace stripping, gzip and brotli sizes, and the CPU
+time each step takes per response.
+
+    python benchmark_compression.py --maids 30 --repeat 50
+"""
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('WARMUP_ON_STARTUP', '0')
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from main import compression  # noqa: E402
+from main.models import MaidProfile, Profile  # noqa: E402
+
+SKILLS = ['cleaning,cooking', 'babysitting,elder_care', 'laundry,cleaning', 'cooking', 'other,cleaning,laundry']
+
+
+def create_fixtures(count):
+    customer = User.objects.create_user('bench-customer', 'bench-customer@example.com')
+    Profile.objects.create(user=customer, full_name='Bench Customer', phone_number='9000000000', role='customer')
+    for i in range(count):
+        user = User.objects.create_user(f'bench-maid-{i}', f'bench-maid-{i}@example.com')
+        MaidProfile.objects.create(
+            user=user, name=f'Sunita Patil {i}', email=user.email, mobile_number=f'98{i:08d}',
+            location='Kothrud, Pune', expected_salary=8000 + i * 100, skills=SKILLS[i % len(SKILLS)],
+            status='verified',
+        )
+    return customer, MaidProfile.objects.order_by('id').values_list('id', flat=True).first()
+
+
+def cpu_ms(func, repeat):
+    start = time.process_time()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.process_time() - start) * 1000 / repeat
+
+
+def measure(client, path, language, repeat):
+    # Render without the middleware so each step can be measured on its own
+    response = client.get(path, HTTP_ACCEPT_LANGUAGE=language, HTTP_ACCEPT_ENCODING='identity')
+    assert response.status_code == 200, (path, response.status_code)
+    raw = response.content
+    stripped, strip_ms = cpu_ms(lambda: compression.strip_whitespace(raw), repeat)
+    row = {'raw': len(raw), 'stripped': len(stripped), 'strip_ms': strip_ms}
+    encodings = ['gzip'] + (['br'] if compression.brotli is not None else [])
+    for encoding in encodings:
+        compressed, ms = cpu_ms(lambda: compression.compress(stripped, encoding), repeat)
+        row[encoding] = len(compressed)
+        row[f'{encoding}_ms'] = ms
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--maids', type=int, default=30, help="Verified maids on the listing page.")
+    parser.add_argument('--repeat', type=int, default=50, help="Iterations per CPU measurement.")
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        customer, maid_id = create_fixtures(args.maids)
+        client = Client()
+        client.force_login(customer)
+        middleware = [m for m in settings.MIDDLEWARE if m != 'main.middleware.CompressionMiddleware']
+        pages = {'listing': '/maids/', 'profile': f'/maid-profile/{maid_id}/'}
+
+        header = f"{'page':<8} {'lang':<4} {'raw':>8} {'stripped':>9} {'gzip':>7} {'br':>7}   cpu ms: strip / gzip / br"
+        print(header)
+        print('-' * len(header))
+        with override_settings(MIDDLEWARE=middleware, ALLOWED_HOSTS=['testserver']):
+            for page, path in pages.items():
+                for language, _name in settings.LANGUAGES:
+                    row = measure(client, path, language, args.repeat)
+                    print(
+                        f"{page:<8} {language:<4} {row['raw']:>8} {row['stripped']:>9} "
+                        f"{row['gzip']:>7} {row.get('br', '-'):>7}   "
+                        f"{row['strip_ms']:.2f} / {row['gzip_ms']:.2f} / {row.get('br_ms', 0):.2f}"
+                    )
+        if compression.brotli is None:
+            print("brotli is not installed; only gzip was measured.")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Load check for live message delivery.
+
+Opens many Server-Sent Events connections against the ASGI application in
+this process (a throwaway test database is created and destroyed), posts
+messages to random connected users and reports connect time, delivery
+latency and (with --trace-memory) memory per open connection.
+
+    python benchmark_messaging.py --connections 2000 --messages 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('WARMUP_ON_STARTUP', '0')
+django.setup()
+
+from asgiref.sync import sync_to_async  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.contrib.sessions.backends.db import SessionStore  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from core.asgi import application  # noqa: E402
+from main import messaging  # noqa: E402
+from main.models import Conversation, MaidProfile  # noqa: E402
+
+
+def create_fixtures(count):
+    maid_user = User.objects.create_user('bench-maid', 'bench-maid@example.com')
+    maid = MaidProfile.objects.create(
+        user=maid_user, name='Bench Maid', email=maid_user.email, mobile_number='9000000000',
+        location='Pune', expected_salary=9000, skills='cleaning', status='verified',
+    )
+    User.objects.bulk_create(
+        User(username=f'bench-{i}', email=f'bench-{i}@example.com', password='!') for i in range(count)
+    )
+    customers = list(User.objects.filter(username__startswith='bench-').exclude(pk=maid_user.pk))
+    Conversation.objects.bulk_create(Conversation(customer=c, maid=maid) for c in customers)
+    conversations = {c.customer_id: c for c in Conversation.objects.select_related('maid')}
+
+    sessions = {}
+    for customer in customers:
+        session = SessionStore()
+        session[SESSION_KEY] = str(customer.pk)
+        session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+        session[HASH_SESSION_KEY] = customer.get_session_auth_hash()
+        session.create()
+        sessions[customer.pk] = session.session_key
+    return maid_user, conversations, sessions
+
+
+class Connection:
+    """One SSE client driven straight through the ASGI callable."""
+
+    def __init__(self, user_id, session_key, received):
+        self.user_id = user_id
+        self.session_key = session_key
+        self.received = received
+        self.disconnect = asyncio.Event()
+        self.status = None
+
+    def scope(self):
+        return {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': '/messages/stream/', 'raw_path': b'/messages/stream/',
+            'query_string': b'after=0', 'root_path': '',
+            'headers': [
+                (b'host', b'localhost'),
+                (b'cookie', f'{settings.SESSION_COOKIE_NAME}={self.session_key}'.encode()),
+            ],
+            'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+        }
+
+    async def receive(self):
+        if self.status is None:
+            self.status = 'requested'
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.disconnect.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, event):
+        if event['type'] == 'http.response.start':
+            self.status = event['status']
+        elif event['type'] == 'http.response.body':
+            for line in event.get('body', b'').decode().splitlines():
+                if line.startswith('id: '):
+                    self.received(self.user_id, int(line[4:]), time.perf_counter())
+
+
+async def run(count, message_count, trace_memory):
+    maid_user, conversations, sessions = await sync_to_async(create_fixtures)(count)
+    sent_at = {}
+    arrived = {}
+
+    def received(user_id, message_id, now):
+        arrived.setdefault(message_id, now)
+
+    if trace_memory:
+        # tracemalloc slows everything down; connect time is only meaningful without it
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    clients = [Connection(user_id, key, received) for user_id, key in sessions.items()]
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(application(c.scope(), c.receive, c.send)) for c in clients]
+    while messaging.hub.connection_count() < count:
+        await asyncio.sleep(0.05)
+    connect_time = time.perf_counter() - start
+    print(f"{count} connections open in {connect_time:.2f} s")
+    if trace_memory:
+        per_connection = (tracemalloc.get_traced_memory()[0] - baseline) / count
+        tracemalloc.stop()
+        print(f"~{per_connection / 1024:.1f} KiB allocated per open connection")
+
+    post = sync_to_async(messaging.post_message)
+    for _ in range(message_count):
+        customer_id = random.choice(list(conversations))
+        posted = time.perf_counter()
+        message = await post(conversations[customer_id], maid_user, 'benchmark')
+        sent_at[message.id] = posted
+        await asyncio.sleep(0.005)
+    deadline = time.perf_counter() + 10
+    while set(sent_at) - set(arrived) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+
+    for client in clients:
+        client.disconnect.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    latencies = sorted(arrived[i] - sent_at[i] for i in sent_at if i in arrived)
+    if latencies:
+        print(f"delivered {len(latencies)}/{message_count} messages; "
+              f"post-to-delivery latency median {statistics.median(latencies) * 1000:.1f} ms, "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+    print(f"connections still open after disconnect: {messaging.hub.connection_count()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--messages', type=int, default=100)
+    parser.add_argument('--trace-memory', action='store_true', help="Measure memory per connection with tracemalloc.")
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        asyncio.run(run(args.connections, args.messages, args.trace_memory))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
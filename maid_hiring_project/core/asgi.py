@@ -1,7 +1,15 @@
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_asgi_application()
+
+# Compile templates, URL patterns and catalogues before the first request.
+# Servers such as uvicorn import this inside their event loop; warm_up()
+# then runs its database phases in a thread.
+if settings.WARMUP_ON_STARTUP:
+    from main.warmup import warm_up
+    warm_up()
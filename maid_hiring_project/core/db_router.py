@@ -0,0 +1,122 @@
+"""
+Read-replica routing.
+
+Views decorated with @use_read_replica send their reads to the 'replica'
+alias. Every write goes to 'default'. Once a request writes, the rest of that
+request and the client's next requests (for REPLICA_STICKY_SECONDS) read from
+'default' again, so users always see their own changes even if the replica
+lags behind. Only the main app's models are read from the replica: sessions,
+auth and content types always come from 'default', so a lagging replica can
+neither forget a fresh login nor keep a logged-out session alive.
+"""
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+REPLICA_ALIAS = 'replica'
+PRIMARY_ALIAS = 'default'
+PIN_COOKIE = 'db_pin_primary'
+# Apps whose reads may go to the replica
+REPLICA_APP_LABELS = {'main'}
+
+_routing_state = ContextVar('db_routing_state', default=None)
+
+
+class RoutingState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.read_only = False
+        self.wrote = False
+
+    @property
+    def use_replica(self):
+        return self.read_only and not self.pinned and not self.wrote
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def use_read_replica(view_func):
+    """Mark a view whose safe (GET/HEAD) requests may read from the replica."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        return view_func(request, *args, **kwargs)
+    wrapper.use_read_replica = True
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if (
+            state is not None and state.use_replica and replica_configured()
+            and model._meta.app_label in REPLICA_APP_LABELS
+        ):
+            return REPLICA_ALIAS
+        return PRIMARY_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Tracks per-request routing state. Must sit above SessionMiddleware so
+    that session writes also pin the client to the primary.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        return self.pin_if_written(state, response)
+
+    async def __acall__(self, request):
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        return self.pin_if_written(state, response)
+
+    def pin_if_written(self, state, response):
+        if state.wrote and replica_configured():
+            response.set_cookie(PIN_COOKIE, '1', max_age=self.sticky_seconds, httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _routing_state.get()
+        if state is not None and request.method in ('GET', 'HEAD'):
+            state.read_only = getattr(view_func, 'use_read_replica', False)
+        return None
@@ -26,6 +26,10 @@ INSTALLED_APPS = [
 
 # Middleware
 MIDDLEWARE = [
+    'main.middleware.MetricsMiddleware',
+    'main.middleware.CompressionMiddleware',
+    'main.middleware.PerformanceTimingMiddleware',
+    'core.db_router.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -43,7 +47,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -51,6 +54,14 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Compiled templates are kept for the life of the worker
+            # (the dev server's autoreloader still clears them on change)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -65,6 +76,20 @@ DATABASES = {
     }
 }
 
+# Optional read replica for listing/profile reads. Locally this can be a second
+# SQLite file kept up to date with `python manage.py sync_replica`.
+if os.getenv("DATABASE_REPLICA_NAME"):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv("DATABASE_REPLICA_NAME"),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
+# How long a client keeps reading from the primary after its own write
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
 AUTH_PASSWORD_VALIDATORS = []
 
 # Internationalization
@@ -84,12 +109,54 @@ TIME_ZONE = 'UTC'
 USE_I18N = True
 USE_TZ = True
 
+# Cache (a shared backend such as Redis is required in production with more
+# than one worker, so rate limits and cached counters are shared; see
+# main/caching.py)
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv("CACHE_BACKEND", 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv("CACHE_LOCATION", ''),
+    }
+}
+# With a per-process cache, cached counters and summaries are recomputed at
+# least this often, since other workers' invalidations never reach them
+PROCESS_LOCAL_CACHE_TIMEOUT = int(os.getenv("PROCESS_LOCAL_CACHE_TIMEOUT", "30"))
+# Cached maid counts by status are recounted from the database this often
+MAID_COUNT_CACHE_TIMEOUT = int(os.getenv("MAID_COUNT_CACHE_TIMEOUT", "600"))
+
+# Rate limiting for login, registration and maid inquiry emails
+RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "1") == "1"
+RATELIMIT_TRUST_X_FORWARDED_FOR = os.getenv("RATELIMIT_TRUST_X_FORWARDED_FOR", "0") == "1"
+
 # Session Settings
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 SESSION_COOKIE_AGE = 1209600  # 2 weeks
 
 # Static & Media
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Content-hashed static filenames outside development (requires collectstatic)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+        else 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage',
+    },
+}
+
+# Serve STATIC_ROOT from Django (precompressed + immutable caching) when no
+# web server sits in front of the app
+SERVE_STATIC = os.getenv("SERVE_STATIC", "0") == "1"
+
+# Images that `manage.py build_assets` turns into responsive AVIF/WebP variants
+RESPONSIVE_IMAGES = [
+    'images/home-hero-v2.jpg',
+    'images/home-hero-v3.jpg',
+]
+RESPONSIVE_IMAGE_WIDTHS = [480, 768, 1024, 1600]
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_URL = '/media/'
@@ -97,6 +164,80 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 LOGIN_URL = 'login'
 
+# ================= MAID LISTING CACHE =================
+
+# Cities (by verified maids) whose listing snapshots each worker keeps in memory
+HOT_CITY_COUNT = int(os.getenv("HOT_CITY_COUNT", "5"))
+# Lifetime of per-city listing snapshots and their version keys in the shared
+# cache (snapshots are also replaced whenever a maid in that city changes)
+CITY_CACHE_TIMEOUT = int(os.getenv("CITY_CACHE_TIMEOUT", "3600"))
+# Lifetime of the cached per-user summary on the admin user profile page
+# (also dropped whenever the user's bookings, messages or profiles change;
+# capped at PROCESS_LOCAL_CACHE_TIMEOUT unless the cache is shared)
+USER_SUMMARY_CACHE_TIMEOUT = int(os.getenv("USER_SUMMARY_CACHE_TIMEOUT", "900"))
+
+# ================= MESSAGING =================
+
+# Seconds between keep-alive comments on an idle SSE connection
+MESSAGE_STREAM_HEARTBEAT = int(os.getenv("MESSAGE_STREAM_HEARTBEAT", "20"))
+# How long a long-poll request waits for a new message
+MESSAGE_POLL_TIMEOUT = int(os.getenv("MESSAGE_POLL_TIMEOUT", "25"))
+# Under WSGI polls are answered at once; clients poll again after this many seconds
+MESSAGE_POLL_INTERVAL = int(os.getenv("MESSAGE_POLL_INTERVAL", "10"))
+# How often each worker checks for messages posted by other workers
+MESSAGE_WATCH_INTERVAL = float(os.getenv("MESSAGE_WATCH_INTERVAL", "2"))
+
+# ================= RESPONSE COMPRESSION =================
+
+# Remove template indentation and trailing spaces from HTML responses
+STRIP_HTML_WHITESPACE = os.getenv("STRIP_HTML_WHITESPACE", "1") == "1"
+# Dynamic pages are compressed on every request, so favour speed over ratio
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# Smaller bodies are sent as they are
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "512"))
+# Streamed bodies are flushed to the client every this many input bytes
+COMPRESSION_STREAM_BUFFER = int(os.getenv("COMPRESSION_STREAM_BUFFER", "32768"))
+
+# ================= ARCHIVAL =================
+
+# Age after which `manage.py archive_records` moves rows to the archive tables:
+# rejected registrations (since rejection) and completed bookings (since the
+# service date)
+ARCHIVE_REJECTED_AFTER_DAYS = int(os.getenv("ARCHIVE_REJECTED_AFTER_DAYS", "90"))
+ARCHIVE_BOOKINGS_AFTER_DAYS = int(os.getenv("ARCHIVE_BOOKINGS_AFTER_DAYS", "365"))
+
+# ================= PERFORMANCE INSTRUMENTATION =================
+
+# Precompile templates, URL patterns and translation catalogues when a
+# worker starts instead of on its first requests
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "0" if DEBUG else "1") == "1"
+
+# Fraction of requests that get Server-Timing headers and a timing log line
+PERFORMANCE_SAMPLE_RATE = float(os.getenv("PERFORMANCE_SAMPLE_RATE", "1.0" if DEBUG else "0.05"))
+
+# Optional bearer token required to scrape /metrics. Without one, /metrics
+# only answers INTERNAL_IPS unless DEBUG is on.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+INTERNAL_IPS = [ip.strip() for ip in os.getenv("INTERNAL_IPS", "127.0.0.1,::1").split(",") if ip.strip()]
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'main.performance': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 # ================= EMAIL CONFIGURATION (SECURE) =================
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -109,4 +250,3 @@ EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
-print("Using Email:", EMAIL_HOST_USER)
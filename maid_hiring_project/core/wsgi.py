@@ -1,7 +1,13 @@
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_wsgi_application()
+
+# Compile templates, URL patterns and catalogues before the first request
+if settings.WARMUP_ON_STARTUP:
+    from main.warmup import warm_up
+    warm_up()
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class MainConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'main'
+
+    def ready(self):
+        from . import caching, instrumentation, signals  # noqa: F401
+        instrumentation.install()
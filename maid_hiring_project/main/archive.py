@@ -0,0 +1,191 @@
+"""
+Archival of cold rows.
+
+Rejected registrations and completed bookings past their retention window
+(ARCHIVE_REJECTED_AFTER_DAYS, ARCHIVE_BOOKINGS_AFTER_DAYS) are copied to
+ArchivedMaidProfile / ArchivedBooking and deleted from the hot tables, one
+batch per transaction. A batch moves completely or not at all, so an
+interrupted run is resumed by running it again: whatever is still in the
+hot tables is picked up.
+
+A rejected maid's documents are written to one deflated zip under
+MEDIA_ROOT/archive/maids inside the batch, and the original files are
+deleted only once the batch has committed. Its reviews are copied into the
+archived row before the maid, and with it the reviews, is deleted.
+Registrations that still have a message thread are left in place, since
+deleting them would delete the messages.
+"""
+import os
+import zipfile
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, Max, OuterRef, Q
+from django.utils import timezone
+
+from .models import (
+    ArchivedBooking, ArchivedMaidProfile, Booking, Conversation, MaidProfile, MaidStatusEvent, Review,
+)
+
+DOCUMENT_FIELDS = ('aadhaar_document', 'police_verification')
+ARCHIVE_DIR = 'archive/maids'
+
+ARCHIVED_BOOKING_FIELDS = ('id', 'customer_id', 'maid_id', 'service_date', 'message', 'status', 'created_at')
+
+
+def archivable_maids(now=None):
+    cutoff = (now or timezone.now()) - timedelta(days=settings.ARCHIVE_REJECTED_AFTER_DAYS)
+    return (
+        MaidProfile.objects.filter(status='rejected')
+        .exclude(Exists(Conversation.objects.filter(maid=OuterRef('pk'))))
+        .annotate(rejected_at=Max('status_events__created_at', filter=Q(status_events__to_status='rejected')))
+        .filter(Q(rejected_at__lt=cutoff) | Q(rejected_at__isnull=True, created_at__lt=cutoff))
+        .order_by('id')
+    )
+
+
+def archivable_bookings(now=None):
+    cutoff = (now or timezone.now()) - timedelta(days=settings.ARCHIVE_BOOKINGS_AFTER_DAYS)
+    return (
+        Booking.objects.filter(status='completed')
+        .filter(Q(service_date__lt=cutoff.date()) | Q(service_date__isnull=True, created_at__lt=cutoff))
+        .order_by('id')
+    )
+
+
+def zip_documents(maid):
+    """Zip the maid's stored documents; returns the zip's name under MEDIA_ROOT, or ''."""
+    documents = [(field, getattr(maid, field)) for field in DOCUMENT_FIELDS]
+    documents = [(field, document) for field, document in documents if document and document.storage.exists(document.name)]
+    if not documents:
+        return ''
+
+    name = f'{ARCHIVE_DIR}/{maid.pk}.zip'
+    path = os.path.join(settings.MEDIA_ROOT, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Written under a temporary name so a crash never leaves a truncated zip
+    with zipfile.ZipFile(f'{path}.tmp', 'w', zipfile.ZIP_DEFLATED) as archive:
+        for field, document in documents:
+            with document.open('rb'), archive.open(f'{field}/{os.path.basename(document.name)}', 'w') as out:
+                for chunk in document.chunks():
+                    out.write(chunk)
+    os.replace(f'{path}.tmp', path)
+    return name
+
+
+def _delete_files(files):
+    for storage, name in files:
+        try:
+            storage.delete(name)
+        except OSError:
+            pass
+
+
+def _move_bookings(rows):
+    """Copy booking rows (dicts of ARCHIVED_BOOKING_FIELDS + maid_name) and delete the originals."""
+    ArchivedBooking.objects.bulk_create(
+        [
+            ArchivedBooking(
+                original_id=row['id'], customer_id=row['customer_id'], maid_original_id=row['maid_id'],
+                maid_name=row['maid_name'], service_date=row['service_date'], message=row['message'],
+                status=row['status'], created_at=row['created_at'],
+            )
+            for row in rows
+        ],
+        ignore_conflicts=True,
+    )
+    # Reviews of these bookings stay, with booking set to NULL
+    Booking.objects.filter(id__in=[row['id'] for row in rows]).delete()
+
+
+def archive_maid_batch(maid_ids):
+    """Move one batch of rejected registrations, with their bookings. Returns the number moved."""
+    with transaction.atomic():
+        # Re-read under lock: a maid may have been re-verified since it was selected
+        maids = list(MaidProfile.objects.select_for_update().filter(pk__in=maid_ids, status='rejected'))
+        if not maids:
+            return 0
+        ids = [maid.pk for maid in maids]
+
+        history = defaultdict(list)
+        rejected_at = {}
+        events = MaidStatusEvent.objects.filter(maid_id__in=ids).order_by('created_at', 'id')
+        for maid_id, from_status, to_status, actor_id, created_at in events.values_list(
+            'maid_id', 'from_status', 'to_status', 'actor_id', 'created_at'
+        ):
+            history[maid_id].append([from_status, to_status, actor_id, created_at.isoformat()])
+            if to_status == 'rejected':
+                rejected_at[maid_id] = created_at
+
+        reviews = defaultdict(list)
+        for maid_id, booking_id, customer_id, rating, comment, created_at in (
+            Review.objects.filter(maid_id__in=ids).order_by('created_at', 'id')
+            .values_list('maid_id', 'booking_id', 'customer_id', 'rating', 'comment', 'created_at')
+        ):
+            reviews[maid_id].append([booking_id, customer_id, rating, comment, created_at.isoformat()])
+
+        ArchivedMaidProfile.objects.bulk_create(
+            [
+                ArchivedMaidProfile(
+                    original_id=maid.pk, user_id=maid.user_id, name=maid.name, email=maid.email,
+                    mobile_number=maid.mobile_number, location=maid.location,
+                    expected_salary=maid.expected_salary, skills=maid.skills, status=maid.status,
+                    created_at=maid.created_at, rejected_at=rejected_at.get(maid.pk),
+                    status_history=history[maid.pk], reviews=reviews[maid.pk], documents=zip_documents(maid),
+                )
+                for maid in maids
+            ],
+            ignore_conflicts=True,
+        )
+        _move_bookings(list(
+            Booking.objects.filter(maid_id__in=ids).values(*ARCHIVED_BOOKING_FIELDS, maid_name=F('maid__name'))
+        ))
+
+        files = [
+            (document.storage, document.name)
+            for maid in maids for document in (getattr(maid, field) for field in DOCUMENT_FIELDS) if document
+        ]
+        MaidProfile.objects.filter(pk__in=ids).delete()
+        transaction.on_commit(lambda: _delete_files(files))
+    return len(ids)
+
+
+def archive_booking_batch(booking_ids):
+    with transaction.atomic():
+        rows = list(
+            Booking.objects.filter(pk__in=booking_ids, status='completed')
+            .values(*ARCHIVED_BOOKING_FIELDS, maid_name=F('maid__name'))
+        )
+        if rows:
+            _move_bookings(rows)
+    return len(rows)
+
+
+def _run(queryset, archive_batch, label, batch_size, dry_run, stdout):
+    if dry_run:
+        count = queryset.count()
+        if stdout:
+            stdout.write(f"{count} {label} would be archived")
+        return count
+
+    moved = 0
+    last_id = 0
+    while True:
+        # Keyset over ids so rows skipped by a batch are never selected again
+        ids = list(queryset.filter(id__gt=last_id).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return moved
+        moved += archive_batch(ids)
+        last_id = ids[-1]
+        if stdout:
+            stdout.write(f"Archived {moved} {label} so far")
+
+
+def archive_rejected_maids(batch_size=100, dry_run=False, stdout=None, now=None):
+    return _run(archivable_maids(now), archive_maid_batch, 'rejected registrations', batch_size, dry_run, stdout)
+
+
+def archive_completed_bookings(batch_size=1000, dry_run=False, stdout=None, now=None):
+    return _run(archivable_bookings(now), archive_booking_batch, 'completed bookings', batch_size, dry_run, stdout)
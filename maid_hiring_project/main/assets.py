@@ -0,0 +1,55 @@
+"""
+Helpers shared by the static asset build (manage.py build_assets), the
+{% responsive_image %} template tag and the production static file view.
+"""
+import json
+import os
+import re
+from functools import lru_cache
+
+from django.conf import settings
+
+RESPONSIVE_MANIFEST = 'responsive-images.json'
+
+# Source types in order of preference for <picture>
+IMAGE_FORMATS = [
+    ('AVIF', 'image/avif', 'avif'),
+    ('WEBP', 'image/webp', 'webp'),
+]
+
+# Text assets that get .gz / .br siblings
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.txt', '.map', '.html', '.xml'}
+
+# Content-hashed names written by ManifestStaticFilesStorage or build_assets,
+# e.g. "admin/css/base.5af66c1b1797.css"
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[A-Za-z0-9]+$')
+
+
+def manifest_path():
+    return os.path.join(settings.STATIC_ROOT, RESPONSIVE_MANIFEST)
+
+
+@lru_cache(maxsize=1)
+def _read_manifest(path, mtime):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError, TypeError):
+        return {}
+
+
+def load_manifest():
+    """
+    The responsive image manifest, or {} if build_assets has not run. Kept
+    parsed per modification time, so a rebuild is picked up without a restart.
+    """
+    path = manifest_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    return _read_manifest(path, mtime)
+
+
+def is_hashed(path):
+    return bool(HASHED_NAME.search(path))
@@ -0,0 +1,183 @@
+"""
+Location autocomplete for the maid listing.
+
+Each worker keeps the distinct locations of verified maids, with counts, as
+a sorted list of (search term, entry) pairs. Every word of a location is a
+term, so "mum" finds "Andheri, Mumbai". Known cities are also entries of
+their own, findable by every spelling in cities.CITY_ALIASES ("bomb",
+"मुं"). A keystroke is one bisect plus a scan of the matching range, and
+never touches the database. Answers for short prefixes, whose ranges are
+wide, are kept until the index changes.
+
+Like the match catalogue (recommendations.py), saves in this process update
+the index in place, and changes made by other workers bump a version number
+in the cache that makes this worker reload on its next query.
+"""
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from .cities import CITY_ALIASES, city_key, normalize
+from .models import MaidProfile
+
+VERSION_KEY = 'autocomplete:locations_version'
+
+# Sorts after any character a search term can contain
+_HIGHEST = '\U0010ffff'
+
+# Prefixes matching more terms than this (typically the first one or two
+# keystrokes) have their answer kept until the index next changes
+WIDE_PREFIX_TERMS = 256
+
+
+def _location_terms(key):
+    words = key.split(' ')
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+
+def _city_terms(city):
+    return {normalize(alias) for alias in [city, *CITY_ALIASES.get(city, [])]}
+
+
+class LocationIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.version = None
+        self._reset()
+
+    def _reset(self):
+        self.terms = []
+        # ('location', normalized location) or ('city', city key) -> count
+        self.counts = Counter()
+        self.labels = {}
+        self.wide_answers = {}
+
+    def _entry_terms(self, entry):
+        kind, key = entry
+        return _location_terms(key) if kind == 'location' else _city_terms(key)
+
+    def _adjust(self, entry, label, delta):
+        self.wide_answers.clear()
+        count = self.counts[entry] + delta
+        if count > 0:
+            if entry not in self.labels:
+                self.labels[entry] = label
+                for term in self._entry_terms(entry):
+                    insort(self.terms, (term, entry))
+            self.counts[entry] = count
+        else:
+            del self.counts[entry]
+            if self.labels.pop(entry, None) is not None:
+                for term in self._entry_terms(entry):
+                    position = bisect_left(self.terms, (term, entry))
+                    if position < len(self.terms) and self.terms[position] == (term, entry):
+                        del self.terms[position]
+
+    def _entries(self, location):
+        """The index entries one maid's location counts towards, with their labels."""
+        key = normalize(location)
+        if not key:
+            return []
+        city = city_key(location)
+        return [
+            (('location', key), ' '.join((location or '').split())),
+            (('city', city), city.title()),
+        ]
+
+    def load(self):
+        """Rebuild from the database (one grouped query)."""
+        rows = (
+            MaidProfile.objects.filter(status='verified')
+            .values_list('location').annotate(maids=Count('id')).order_by()
+        )
+        with self.lock:
+            self._reset()
+            terms = set()
+            for location, maids in rows:
+                for entry, label in self._entries(location):
+                    self.counts[entry] += maids
+                    self.labels.setdefault(entry, label)
+            for entry in self.labels:
+                terms.update((term, entry) for term in self._entry_terms(entry))
+            self.terms = sorted(terms)
+            self.loaded = True
+            self.version = cache.get_or_set(VERSION_KEY, 0, None)
+
+    def ensure_fresh(self):
+        if not self.loaded or cache.get(VERSION_KEY) != self.version:
+            self.load()
+
+    def apply_change(self, old_location=None, new_location=None):
+        """A verified maid left old_location and/or arrived at new_location."""
+        try:
+            new_version = cache.incr(VERSION_KEY)
+        except ValueError:
+            new_version = None
+        if not self.loaded:
+            return
+        with self.lock:
+            for location, delta in ((old_location, -1), (new_location, 1)):
+                if location is not None:
+                    for entry, label in self._entries(location):
+                        self._adjust(entry, label, delta)
+            if new_version is not None and self.version is not None and new_version == self.version + 1:
+                self.version = new_version
+            else:
+                self.loaded = False
+
+    def suggest(self, prefix, limit=8):
+        """Up to `limit` {'label', 'count'} suggestions, most maids first."""
+        needle = normalize(prefix)
+        if not needle:
+            return []
+        self.ensure_fresh()
+        with self.lock:
+            start = bisect_left(self.terms, (needle,))
+            end = bisect_left(self.terms, (needle + _HIGHEST,), start)
+            wide = end - start > WIDE_PREFIX_TERMS
+            if wide and (needle, limit) in self.wide_answers:
+                return self.wide_answers[(needle, limit)]
+
+            entries = {entry for _term, entry in self.terms[start:end]}
+            # One extra per city, whose location of the same name is skipped below
+            ranked = heapq.nsmallest(
+                limit * 2, entries,
+                # Cities before locations with the same count
+                key=lambda entry: (-self.counts[entry], entry[0] != 'city', self.labels[entry]),
+            )
+            results, seen = [], set()
+            for entry in ranked:
+                label = self.labels[entry]
+                # "Pune" the location and "Pune" the city are one suggestion
+                if normalize(label) in seen:
+                    continue
+                seen.add(normalize(label))
+                results.append({'label': label, 'count': self.counts[entry]})
+                if len(results) == limit:
+                    break
+            if wide:
+                self.wide_answers[(needle, limit)] = results
+            return results
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LocationIndex()
+    return _index
+
+
+def maid_changed(old_location=None, new_location=None):
+    """Called from MaidProfile signals with the verified locations before and after."""
+    get_index().apply_change(old_location, new_location)
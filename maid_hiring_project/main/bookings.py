@@ -0,0 +1,152 @@
+"""
+Booking requests as seen by the maid.
+
+The maid dashboard costs the same number of queries however many bookings
+a maid has: one conditional aggregate for the per-status counts and one
+page of bookings with the customer and their profile joined in. Pages are
+keyset paginated on (service_date, id), so a deep page is as cheap as the
+first. Status changes are conditional UPDATEs: a change only applies if
+the booking is still in the state it was shown in, so a double click or
+two racing requests cannot both succeed.
+
+Availability is checked against accepted bookings' recurrence rules (see
+main/recurrence.py): one row per booking, however long it repeats. Checking
+a maid's availability and then writing a booking for them (a request, or
+accepting one) happen in one transaction holding lock_maid(), so two
+requests for the same maid cannot both pass the check.
+"""
+from datetime import date, timedelta
+
+from django.db.models import Count, F, Q
+
+from . import recurrence, user_summary
+from .models import Booking, MaidProfile
+
+PAGE_SIZE = 20
+
+# How far ahead the listing's availability filter looks for clashes
+AVAILABILITY_HORIZON = timedelta(days=365)
+
+TABS = ('pending', 'upcoming', 'accepted')
+
+SCHEDULE_FIELDS = ('service_date', 'recurrence', 'recurrence_interval', 'recurrence_weekdays', 'recurrence_until')
+
+# action -> (required current status, new status)
+TRANSITIONS = {
+    'accept': ('pending', 'accepted'),
+    'reject': ('pending', 'rejected'),
+    'complete': ('accepted', 'completed'),
+}
+
+
+def tab_filter(tab, today):
+    if tab == 'upcoming':
+        # Including recurring bookings that started earlier and are still running
+        return Q(status='accepted') & recurrence.active_filter(today)
+    return Q(status=tab)
+
+
+def status_counts(maid_id, today):
+    counts = {
+        status: Count('id', filter=Q(status=status))
+        for status, _label in Booking.STATUS_CHOICES
+    }
+    counts['upcoming'] = Count('id', filter=tab_filter('upcoming', today))
+    return Booking.objects.filter(maid_id=maid_id).aggregate(**counts)
+
+
+def encode_cursor(booking):
+    service_date = booking.service_date.isoformat() if booking.service_date else ''
+    return f'{service_date}:{booking.id}'
+
+
+def decode_cursor(value):
+    """(service_date or None, id) from encode_cursor(), or None if malformed."""
+    try:
+        service_date, booking_id = (value or '').split(':')
+        return (date.fromisoformat(service_date) if service_date else None), int(booking_id)
+    except ValueError:
+        return None
+
+
+def booking_page(maid_id, tab, today, after=None, size=PAGE_SIZE):
+    """One page of a maid's bookings, soonest first. Returns (bookings, next cursor or None)."""
+    bookings = (
+        Booking.objects.filter(maid_id=maid_id).filter(tab_filter(tab, today))
+        .select_related('customer__profile')
+        # Requests without a date come last
+        .order_by(F('service_date').asc(nulls_last=True), 'id')
+    )
+    if after is not None:
+        after_date, after_id = after
+        if after_date is None:
+            bookings = bookings.filter(service_date__isnull=True, id__gt=after_id)
+        else:
+            bookings = bookings.filter(
+                Q(service_date__gt=after_date)
+                | Q(service_date=after_date, id__gt=after_id)
+                | Q(service_date__isnull=True)
+            )
+
+    rows = list(bookings[:size + 1])
+    next_cursor = encode_cursor(rows[size - 1]) if len(rows) > size else None
+    return rows[:size], next_cursor
+
+
+def respond(booking_id, maid_id, action, today):
+    """Apply a maid's action to one booking. Returns False if it no longer applies."""
+    from_status, to_status = TRANSITIONS[action]
+    bookings = Booking.objects.filter(pk=booking_id, maid_id=maid_id, status=from_status)
+    if action == 'complete':
+        # Only once the service date has come
+        bookings = bookings.filter(Q(service_date__isnull=True) | Q(service_date__lte=today))
+    if bookings.update(status=to_status) != 1:
+        return False
+    user_summary.invalidate_booking(booking_id)
+    return True
+
+
+def lock_maid(maid_id):
+    """Lock the maid's row until the current transaction ends."""
+    list(MaidProfile.objects.select_for_update().filter(pk=maid_id).values_list('pk', flat=True))
+
+
+def _last_date(schedule):
+    return schedule.until if schedule.recurrence else schedule.start
+
+
+def _accepted_bookings(start, end):
+    """Accepted bookings that may have a date between start and end (None: open-ended), as dicts."""
+    return (
+        Booking.objects.filter(status='accepted').filter(recurrence.active_filter(start, end))
+        .values('id', 'maid_id', *SCHEDULE_FIELDS)
+    )
+
+
+def busy_maids(schedule, maid_ids):
+    """
+    Which of maid_ids (a list, or a queryset of ids) have an accepted booking
+    on a date of the schedule within AVAILABILITY_HORIZON of its start.
+    """
+    if schedule.start is None:
+        return set()
+    horizon = schedule.start + AVAILABILITY_HORIZON
+    end = min(_last_date(schedule) or horizon, horizon)
+    busy = set()
+    for row in _accepted_bookings(schedule.start, end).filter(maid_id__in=maid_ids):
+        if row['maid_id'] in busy:
+            continue
+        day = recurrence.first_conflict(schedule, recurrence.schedule_of(row))
+        if day is not None and day <= end:
+            busy.add(row['maid_id'])
+    return busy
+
+
+def first_clash(maid_id, schedule, exclude_id=None):
+    """Earliest date the schedule clashes with one of the maid's accepted bookings, or None."""
+    if schedule.start is None:
+        return None  # a booking without a date is agreed on later
+    rows = _accepted_bookings(schedule.start, _last_date(schedule)).filter(maid_id=maid_id).exclude(id=exclude_id)
+    dates = [recurrence.first_conflict(schedule, recurrence.schedule_of(row)) for row in rows]
+    dates = [day for day in dates if day is not None]
+    return min(dates) if dates else None
@@ -0,0 +1,44 @@
+"""
+Helpers for data kept in the default cache.
+
+Rate limits, maid counters and admin user summaries live in the default
+cache and are invalidated by whichever worker made a change. Other workers
+only see that with a shared backend (Redis, Memcached, the database cache).
+With a per-process backend such as the default LocMemCache every worker has
+its own copy, so bounded_timeout() caps how long cached values live and
+workers converge by recomputing them; outside DEBUG a system check warns.
+"""
+from django.conf import settings
+from django.core import checks
+
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_process_local():
+    return settings.CACHES['default']['BACKEND'] in PROCESS_LOCAL_BACKENDS
+
+
+def bounded_timeout(timeout):
+    """`timeout`, capped at PROCESS_LOCAL_CACHE_TIMEOUT when the cache is not shared."""
+    if not is_process_local():
+        return timeout
+    limit = settings.PROCESS_LOCAL_CACHE_TIMEOUT
+    return limit if timeout is None else min(timeout, limit)
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    if settings.DEBUG or not is_process_local():
+        return []
+    return [checks.Warning(
+        "The default cache is local to each process.",
+        hint=(
+            "Set CACHE_BACKEND and CACHE_LOCATION to a shared cache such as Redis when running more "
+            "than one worker. Rate limits, maid counters and admin user summaries are otherwise "
+            "per worker and only converge every PROCESS_LOCAL_CACHE_TIMEOUT seconds."
+        ),
+        id='main.W001',
+    )]
@@ -0,0 +1,54 @@
+"""
+Builds the denormalized MaidCard read model.
+
+Everything the listing and profile pages used to derive per request
+(first name, initial, title-cased and translated skill labels) is computed
+once here when a MaidProfile is saved.
+"""
+from django.conf import settings
+from django.utils import translation
+
+# Languages we keep skill labels for, e.g. ['en', 'hi', 'mr']
+CARD_LANGUAGES = [code for code, _name in settings.LANGUAGES]
+
+SKILL_LABELS = {
+    'cleaning': 'Cleaning',
+    'cooking': 'Cooking',
+    'babysitting': 'Babysitting',
+    'elder_care': 'Elder Care',
+    'laundry': 'Laundry',
+    'other': 'Other Household Work',
+}
+
+
+def card_language(language_code=None):
+    """Map the active language (e.g. 'en-us') onto a CARD_LANGUAGES key."""
+    code = (language_code or translation.get_language() or settings.LANGUAGE_CODE).split('-')[0]
+    return code if code in CARD_LANGUAGES else CARD_LANGUAGES[0]
+
+
+def skill_keys(skills):
+    return [s.strip() for s in (skills or '').split(',') if s.strip()]
+
+
+def card_fields(name, skills):
+    """Display fields for a maid, with skill labels for every language."""
+    first_name = name.split()[0] if name else ""
+    skill_labels = {}
+    for language in CARD_LANGUAGES:
+        with translation.override(language):
+            skill_labels[language] = [
+                translation.gettext(SKILL_LABELS[key]) if key in SKILL_LABELS else key.title()
+                for key in skill_keys(skills)
+            ]
+    return {
+        'first_name': first_name,
+        'display_name': name,
+        'display_initial': name[0].upper() if name else "?",
+        'skill_labels': skill_labels,
+    }
+
+
+def refresh_card(maid):
+    from .models import MaidCard
+    MaidCard.objects.update_or_create(maid=maid, defaults=card_fields(maid.name, maid.skills))
@@ -0,0 +1,56 @@
+"""
+Canonical city keys.
+
+Locations are free text ("Andheri, Mumbai", "bombay", "मुंबई"). city_key()
+maps them onto one lowercase key per city so listings, caches and counts can
+be partitioned by city. Known cities, with their old names and Devanagari
+spellings, are listed in CITY_ALIASES. Any other location uses its last
+comma-separated part, normalized.
+"""
+import re
+
+# canonical key -> other ways people write it
+CITY_ALIASES = {
+    'mumbai': ['bombay', 'मुंबई', 'मुम्बई'],
+    'navi mumbai': ['new mumbai', 'नवी मुंबई', 'नवी मुम्बई'],
+    'thane': ['ठाणे'],
+    'pune': ['poona', 'पुणे'],
+    'nagpur': ['नागपूर', 'नागपुर'],
+    'nashik': ['nasik', 'नाशिक'],
+    'aurangabad': ['chhatrapati sambhajinagar', 'sambhajinagar', 'औरंगाबाद', 'छत्रपती संभाजीनगर'],
+    'kolhapur': ['कोल्हापूर', 'कोल्हापुर'],
+    'solapur': ['sholapur', 'सोलापूर', 'सोलापुर'],
+    'delhi': ['new delhi', 'दिल्ली', 'नई दिल्ली', 'नवी दिल्ली'],
+    'bengaluru': ['bangalore', 'बेंगलुरु', 'बंगळूरु'],
+    'hyderabad': ['हैदराबाद'],
+    'chennai': ['madras', 'चेन्नई'],
+    'kolkata': ['calcutta', 'कोलकाता'],
+    'ahmedabad': ['अहमदाबाद'],
+}
+
+# every spelling -> canonical key
+ALIAS_TO_CITY = {alias: city for city, aliases in CITY_ALIASES.items() for alias in [city, *aliases]}
+
+# Longest aliases first so "navi mumbai" wins over "mumbai"
+_ALIAS_PATTERN = re.compile(
+    r'(?<!\w)(%s)(?!\w)' % '|'.join(re.escape(alias) for alias in sorted(ALIAS_TO_CITY, key=len, reverse=True))
+)
+
+
+def normalize(text):
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s\u0900-\u097F]', ' ', (text or '').lower())).strip()
+
+
+def city_key(location):
+    """Canonical city for a free-text location, or '' if it is empty."""
+    text = normalize(location)
+    if not text:
+        return ''
+    if text in ALIAS_TO_CITY:
+        return ALIAS_TO_CITY[text]
+    match = _ALIAS_PATTERN.search(text)
+    if match:
+        return ALIAS_TO_CITY[match.group(1)]
+    # Unknown city: "Sector 5, Bhilai" -> "bhilai"
+    parts = [normalize(part) for part in (location or '').split(',')]
+    return [part for part in parts if part][-1][:100]
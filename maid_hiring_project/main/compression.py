@@ -0,0 +1,131 @@
+"""
+Response size reduction: HTML whitespace stripping and brotli/gzip.
+
+Templates are indented for readability, and in hi/mr every Devanagari
+character is three bytes of UTF-8, so listing and profile pages compress
+very well. Stripping only removes indentation and trailing spaces. Every
+newline is kept, blank lines included, so the rendered page is unchanged:
+user text shown with white-space: pre-line (messages, booking notes) keeps
+its paragraphs. <pre>, <textarea>, <script> and <style> contents are left
+alone.
+
+brotli is optional; without it only gzip is offered.
+"""
+import re
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+_PRESERVED = re.compile(rb'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+_INDENTATION = re.compile(rb'[ \t\r]*\n\s*')
+
+
+def _newlines(match):
+    return b'\n' * match.group().count(b'\n')
+
+
+def strip_whitespace(html):
+    """Remove indentation and trailing spaces from HTML bytes."""
+    parts = _PRESERVED.split(html)
+    # split() returns [text, block, tag name, text, block, tag name, ..., text]
+    for index in range(0, len(parts), 3):
+        parts[index] = _INDENTATION.sub(_newlines, parts[index])
+    return b''.join(part for index, part in enumerate(parts) if index % 3 != 2)
+
+
+def accepted_encodings(header):
+    """Encodings with a non-zero q-value in an Accept-Encoding header."""
+    accepted = set()
+    for item in (header or '').lower().split(','):
+        name, _sep, params = item.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.add(name)
+    return accepted
+
+
+def choose_encoding(header):
+    accepted = accepted_encodings(header)
+    if brotli is not None and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+class Compressor:
+    """Incremental brotli or gzip compression with a common interface."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits 16 + 15: gzip container
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        if self.encoding == 'br':
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def flush(self):
+        """Everything so far, decodable by the client before the stream ends."""
+        if self.encoding == 'br':
+            return self._brotli.flush()
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+def compress(data, encoding):
+    compressor = Compressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+
+def compress_stream(chunks, encoding):
+    """
+    Compress a streamed body. Input is buffered up to COMPRESSION_STREAM_BUFFER
+    bytes before each flush: a flush per small chunk (a CSV row, say) costs a
+    block header and resets the match window, and can make the body larger.
+    """
+    compressor = Compressor(encoding)
+    buffered = []
+    size = 0
+    for chunk in chunks:
+        buffered.append(chunk)
+        size += len(chunk)
+        if size >= settings.COMPRESSION_STREAM_BUFFER:
+            yield compressor.compress(b''.join(buffered)) + compressor.flush()
+            buffered, size = [], 0
+    yield compressor.compress(b''.join(buffered)) + compressor.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    """compress_stream() for async iterators."""
+    compressor = Compressor(encoding)
+    buffered = []
+    size = 0
+    async for chunk in chunks:
+        buffered.append(chunk)
+        size += len(chunk)
+        if size >= settings.COMPRESSION_STREAM_BUFFER:
+            yield compressor.compress(b''.join(buffered)) + compressor.flush()
+            buffered, size = [], 0
+    yield compressor.compress(b''.join(buffered)) + compressor.finish()
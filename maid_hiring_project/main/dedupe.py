@@ -0,0 +1,136 @@
+"""
+Duplicate registration detection.
+
+Each MaidProfile stores three normalized, indexed keys (filled by a pre_save
+signal):
+
+- phone_key: the mobile number as its last 10 digits, without +91/0 prefixes
+- aadhaar_sha256: SHA-256 of the uploaded Aadhaar document
+- name_key: a phonetic skeleton of the name that ignores vowels,
+  aspiration and spelling variants ("Suneeta"/"Sunita"/"सुनीता" -> "snt"),
+  with the words sorted
+
+Candidate search is blocking: one equality lookup per key, each served by
+its index, so the cost does not depend on how many maids are registered.
+"""
+import hashlib
+import re
+import unicodedata
+
+from .models import MaidProfile
+
+# Rows fetched per blocking key; a block bigger than this is a common name
+BLOCK_LIMIT = 20
+
+LATIN_DIGRAPHS = [
+    ('ch', 'c'), ('sh', 's'), ('ph', 'f'), ('kh', 'k'), ('gh', 'g'),
+    ('th', 't'), ('dh', 'd'), ('bh', 'b'), ('jh', 'j'), ('ck', 'k'),
+]
+LATIN_LETTERS = str.maketrans({'q': 'k', 'z': 'j', 'w': 'v', 'x': 'k'})
+VOWELS = set('aeiouyh')
+
+DEVANAGARI_CONSONANTS = {
+    'क': 'k', 'ख': 'k', 'ग': 'g', 'घ': 'g', 'ङ': 'n',
+    'च': 'c', 'छ': 'c', 'ज': 'j', 'झ': 'j', 'ञ': 'n',
+    'ट': 't', 'ठ': 't', 'ड': 'd', 'ढ': 'd', 'ण': 'n',
+    'त': 't', 'थ': 't', 'द': 'd', 'ध': 'd', 'न': 'n',
+    'प': 'p', 'फ': 'f', 'ब': 'b', 'भ': 'b', 'म': 'm',
+    'र': 'r', 'ल': 'l', 'ळ': 'l', 'व': 'v',
+    'श': 's', 'ष': 's', 'स': 's',
+    # Anusvara / chandrabindu are nasal sounds, usually written "n"
+    'ं': 'n', 'ँ': 'n',
+}
+DEVANAGARI_VOWELS = set('अआइईउऊऋएऐओऔ')
+
+# Honorifics that should not make two names differ
+NAME_STOPWORDS = {'smt', 'shrimati', 'mrs', 'ms', 'miss', 'kumari', 'km', 'bai'}
+
+
+def canonical_phone(number):
+    """Digits only, with an Indian +91 or trunk 0 prefix removed."""
+    digits = ''.join(str(unicodedata.digit(ch)) for ch in number or '' if unicodedata.digit(ch, None) is not None)
+    if len(digits) == 12 and digits.startswith('91'):
+        digits = digits[2:]
+    elif len(digits) == 11 and digits.startswith('0'):
+        digits = digits[1:]
+    return digits
+
+
+def _word_key(word):
+    if not word:
+        return ''
+    if word[0] in DEVANAGARI_VOWELS or word[0] in VOWELS - {'h', 'y'}:
+        skeleton = ['a']
+    else:
+        skeleton = []
+
+    if any(ch in DEVANAGARI_CONSONANTS or ch in DEVANAGARI_VOWELS for ch in word):
+        letters = [DEVANAGARI_CONSONANTS.get(ch, '') for ch in word]
+    else:
+        for digraph, replacement in LATIN_DIGRAPHS:
+            word = word.replace(digraph, replacement)
+        letters = [ch for ch in word.translate(LATIN_LETTERS) if ch not in VOWELS]
+
+    for letter in letters:
+        # Doubled consonants ("Lalitta") count once
+        if letter and (not skeleton or skeleton[-1] != letter):
+            skeleton.append(letter)
+    return ''.join(skeleton)
+
+
+def phonetic_key(name):
+    # \w alone would split Devanagari words at their vowel signs
+    words = re.findall(r'(?:[^\W_]|[\u0900-\u097F])+', (name or '').lower())
+    keys = sorted(_word_key(word) for word in words if word not in NAME_STOPWORDS)
+    return ' '.join(key for key in keys if key)[:100]
+
+
+def document_hash(document):
+    digest = hashlib.sha256()
+    for chunk in document.chunks():
+        digest.update(chunk)
+    document.seek(0)
+    return digest.hexdigest()
+
+
+def fill_keys(maid):
+    """Set the normalized keys on an unsaved MaidProfile (called from pre_save)."""
+    maid.phone_key = canonical_phone(maid.mobile_number)
+    maid.name_key = phonetic_key(maid.name)
+
+    document = maid.aadhaar_document
+    if not document:
+        return
+    try:
+        if not document._committed:
+            # New upload, read before it is written to storage
+            maid.aadhaar_sha256 = document_hash(document)
+        elif not maid.aadhaar_sha256:
+            # Stored before hashing existed
+            with document.open('rb'):
+                maid.aadhaar_sha256 = document_hash(document)
+    except OSError:
+        maid.aadhaar_sha256 = ''
+
+
+def find_candidates(maid):
+    """
+    Other registrations that may be the same person, as a list of
+    {'id', 'name', 'location', 'status', 'reasons'} dicts.
+    """
+    lookups = [
+        ('phone', {'phone_key': maid.phone_key}),
+        ('aadhaar', {'aadhaar_sha256': maid.aadhaar_sha256}),
+        # Similar names only count within the same location
+        ('name', {'name_key': maid.name_key, 'location__iexact': (maid.location or '').strip()}),
+    ]
+
+    candidates = {}
+    for reason, filters in lookups:
+        if not all(filters.values()):
+            continue
+        rows = (MaidProfile.objects.filter(**filters).exclude(pk=maid.pk)
+                .values('id', 'name', 'location', 'status').order_by('id')[:BLOCK_LIMIT])
+        for row in rows:
+            candidates.setdefault(row['id'], {**row, 'reasons': []})['reasons'].append(reason)
+    return sorted(candidates.values(), key=lambda c: (-len(c['reasons']), c['id']))
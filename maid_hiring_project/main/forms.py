@@ -1,5 +1,6 @@
 from django import forms
-from .models import MaidProfile
+from .models import Booking, MaidProfile, Review
+from . import recurrence
 from django.utils.translation import gettext_lazy as _
 
 class MaidProfileForm(forms.ModelForm):
@@ -68,3 +69,109 @@ class ContactMaidForm(forms.Form):
         }),
         label=_('Message')
     )
+
+
+class MaidImportForm(forms.Form):
+    csv_file = forms.FileField(
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.csv'}),
+        label=_('Registrations CSV')
+    )
+    documents_zip = forms.FileField(
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.zip'}),
+        label=_('Documents Archive (.zip)')
+    )
+
+
+class ReviewForm(forms.ModelForm):
+    RATING_CHOICES = [(i, str(i)) for i in range(5, 0, -1)]
+
+    rating = forms.TypedChoiceField(
+        choices=RATING_CHOICES,
+        coerce=int,
+        widget=forms.RadioSelect,
+        label=_('Rating')
+    )
+
+    class Meta:
+        model = Review
+        fields = ['rating', 'comment']
+        widgets = {
+            'comment': forms.Textarea(attrs={'class': 'form-control', 'rows': 4, 'placeholder': _('How was the service?')}),
+        }
+        labels = {
+            'comment': _('Review'),
+        }
+
+
+class BookingForm(forms.ModelForm):
+    WEEKDAY_CHOICES = [(str(day), name) for day, name in enumerate(recurrence.WEEKDAY_NAMES)]
+
+    recurrence = forms.ChoiceField(
+        choices=[('', _('One-time')), ('daily', _('Daily')), ('weekly', _('Weekly'))],
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label=_('Repeats')
+    )
+    weekdays = forms.MultipleChoiceField(
+        choices=WEEKDAY_CHOICES,
+        widget=forms.CheckboxSelectMultiple,
+        required=False,
+        label=_('On')
+    )
+
+    class Meta:
+        model = Booking
+        fields = ['service_date', 'recurrence', 'recurrence_interval', 'recurrence_until', 'message']
+        widgets = {
+            'service_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+            'recurrence_interval': forms.NumberInput(attrs={'class': 'form-control', 'min': 1, 'max': 52}),
+            'recurrence_until': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+            'message': forms.Textarea(attrs={'class': 'form-control', 'rows': 4, 'placeholder': _('Describe the work you need')}),
+        }
+        labels = {
+            'service_date': _('Start Date'),
+            'recurrence_interval': _('Every'),
+            'recurrence_until': _('Until (optional)'),
+            'message': _('Message'),
+        }
+
+    def __init__(self, *args, today=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.today = today
+        self.fields['service_date'].required = True
+
+    def clean(self):
+        cleaned_data = super().clean()
+        service_date = cleaned_data.get('service_date')
+        until = cleaned_data.get('recurrence_until')
+        interval = cleaned_data.get('recurrence_interval') or 1
+
+        if service_date and self.today and service_date < self.today:
+            self.add_error('service_date', _('The start date cannot be in the past.'))
+        if not cleaned_data.get('recurrence'):
+            cleaned_data['recurrence_until'] = None
+            cleaned_data['recurrence_interval'] = 1
+            cleaned_data['weekdays'] = []
+        elif until and service_date and until < service_date:
+            self.add_error('recurrence_until', _('The end date must be after the start date.'))
+        if not 1 <= interval <= 52:
+            self.add_error('recurrence_interval', _('Choose an interval between 1 and 52.'))
+        return cleaned_data
+
+    def save(self, commit=True):
+        booking = super().save(commit=False)
+        booking.recurrence_weekdays = (
+            recurrence.weekday_mask(self.cleaned_data['weekdays']) if booking.recurrence == 'weekly' else 0
+        )
+        if commit:
+            booking.save()
+        return booking
+
+    def schedule(self):
+        """The requested Schedule, before the booking is saved."""
+        data = self.cleaned_data
+        return recurrence.Schedule(
+            data['service_date'], data['recurrence'], data['recurrence_interval'] or 1,
+            recurrence.weekday_mask(data['weekdays']) if data['recurrence'] == 'weekly' else 0,
+            data['recurrence_until'],
+        )
@@ -0,0 +1,80 @@
+"""
+Maid verification history and turnaround analytics.
+
+Every status change appends a MaidStatusEvent and updates that day's
+VerificationDailyStats row in the same transaction (called from the
+MaidProfile post_save signal, and from moderation.transition() for admin
+decisions). The dashboard only reads the rollup rows for the days it
+shows, so its cost does not grow with the history.
+"""
+import statistics
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import MaidStatusEvent, VerificationDailyStats
+
+# Rollup counter bumped for each target status
+ROLLUP_FIELDS = {
+    'verified': 'approvals',
+    'rejected': 'rejections',
+}
+
+
+def record_status_change(maid, from_status, actor=None):
+    """Append the event and update the rollup. Called inside the save's transaction."""
+    with transaction.atomic():
+        event = MaidStatusEvent.objects.create(
+            maid=maid,
+            from_status=from_status or '',
+            to_status=maid.status,
+            actor=actor,
+        )
+        day = timezone.localdate(event.created_at)
+        stats, _ = VerificationDailyStats.objects.select_for_update().get_or_create(date=day)
+
+        if not from_status:
+            stats.registrations += 1
+        field = ROLLUP_FIELDS.get(maid.status)
+        if field and from_status:
+            setattr(stats, field, getattr(stats, field) + 1)
+            if maid.status == 'verified' and maid.created_at:
+                seconds = int((event.created_at - maid.created_at).total_seconds())
+                stats.verify_seconds = sorted(stats.verify_seconds + [seconds])
+        stats.save()
+    return event
+
+
+def _median_hours(seconds):
+    return round(statistics.median(seconds) / 3600, 1) if seconds else None
+
+
+def daily_summary(days=14):
+    """
+    Rollups for the last `days` days (newest first) plus totals for the
+    whole window, with median time-to-verify in hours.
+    """
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    rows = {row.date: row for row in VerificationDailyStats.objects.filter(date__gte=start)}
+
+    summary = []
+    totals = {'registrations': 0, 'approvals': 0, 'rejections': 0}
+    window_seconds = []
+    for offset in range(days):
+        day = today - timedelta(days=offset)
+        row = rows.get(day) or VerificationDailyStats(date=day)
+        summary.append({
+            'date': day,
+            'registrations': row.registrations,
+            'approvals': row.approvals,
+            'rejections': row.rejections,
+            'median_verify_hours': _median_hours(row.verify_seconds),
+        })
+        for key in totals:
+            totals[key] += getattr(row, key)
+        window_seconds.extend(row.verify_seconds)
+
+    totals['median_verify_hours'] = _median_hours(window_seconds)
+    return summary, totals
@@ -0,0 +1,320 @@
+"""
+Bulk account import from CSV.
+
+Rows are read lazily and processed in fixed-size chunks so memory use does
+not grow with the file. Customer chunks are inserted with bulk_create inside
+a single transaction, with password hashing spread over a process pool.
+Maid chunks are validated with MaidProfileForm and saved row by row inside
+one transaction per chunk, so model signals still run.
+"""
+import csv
+import json
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.utils.datastructures import MultiValueDict
+
+from .forms import MaidProfileForm
+from .models import Profile
+
+CUSTOMER_COLUMNS = ('full_name', 'email', 'phone_number')
+MAID_COLUMNS = (
+    'name', 'email', 'mobile_number', 'location', 'expected_salary', 'skills',
+    'aadhaar_document', 'police_verification',
+)
+MAID_DOCUMENT_FIELDS = ('aadhaar_document', 'police_verification')
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.errors = []  # (line number, email, message)
+
+    def error(self, line, email, message):
+        self.errors.append((line, email, message))
+        self.skipped += 1
+
+    def write_report(self, report_file):
+        writer = csv.writer(report_file)
+        writer.writerow(['line', 'email', 'error'])
+        writer.writerows(self.errors)
+
+
+def read_chunks(rows, size):
+    """Yield lists of `size` items from an iterator without reading ahead."""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _init_worker():
+    # Needed when the pool uses the 'spawn' start method (macOS, Windows)
+    django.setup()
+
+
+def _hash_password(raw_password):
+    return make_password(raw_password or None)
+
+
+def _clean_customer_row(line, row, seen, result):
+    email = (row.get('email') or '').strip()
+    full_name = (row.get('full_name') or '').strip()
+    if not email or not full_name:
+        result.error(line, email, "full_name and email are required")
+        return None
+    try:
+        validate_email(email)
+    except ValidationError:
+        result.error(line, email, "invalid email address")
+        return None
+    if email.lower() in seen:
+        result.error(line, email, "duplicate email in file")
+        return None
+    seen.add(email.lower())
+    return {
+        'line': line,
+        'email': email,
+        'full_name': full_name,
+        'phone_number': (row.get('phone_number') or '').strip(),
+        'location': (row.get('location') or '').strip() or None,
+        'password': row.get('password') or '',
+    }
+
+
+def _insert_customers(rows):
+    """Insert one chunk of customers. Raises IntegrityError on conflicts."""
+    with transaction.atomic():
+        User.objects.bulk_create([
+            User(username=row['email'], email=row['email'], password=row['password_hash'])
+            for row in rows
+        ])
+        # Read ids back rather than relying on the backend returning them
+        user_ids = dict(
+            User.objects.filter(username__in=[row['email'] for row in rows]).values_list('username', 'id')
+        )
+        Profile.objects.bulk_create([
+            Profile(
+                user_id=user_ids[row['email']],
+                full_name=row['full_name'],
+                phone_number=row['phone_number'],
+                location=row['location'],
+                role='customer',
+            )
+            for row in rows
+        ])
+
+
+def import_customers(csv_file, batch_size=1000, workers=None, stdout=None):
+    """
+    Import customer accounts from an open CSV file with the columns
+    full_name, email, phone_number and optional password and location.
+    Rows without a password get an unusable one.
+    """
+    result = ImportResult()
+    reader = csv.DictReader(csv_file)
+    missing = [column for column in CUSTOMER_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+    seen = set()
+    numbered = enumerate(reader, start=2)  # line 1 is the header
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for chunk in read_chunks(numbered, batch_size):
+            rows = [row for row in (_clean_customer_row(line, raw, seen, result) for line, raw in chunk) if row]
+
+            existing = set(
+                email.lower() for email in
+                User.objects.filter(username__in=[row['email'] for row in rows]).values_list('username', flat=True)
+            )
+            fresh = []
+            for row in rows:
+                if row['email'].lower() in existing:
+                    result.error(row['line'], row['email'], "email already registered")
+                else:
+                    fresh.append(row)
+            if not fresh:
+                continue
+
+            hashes = pool.map(_hash_password, [row['password'] for row in fresh], chunksize=max(1, len(fresh) // 32))
+            for row, password_hash in zip(fresh, hashes):
+                row['password_hash'] = password_hash
+
+            try:
+                _insert_customers(fresh)
+                result.created += len(fresh)
+            except IntegrityError:
+                # Someone registered one of these emails meanwhile; fall back
+                # to row-by-row inserts so only the conflicting rows fail.
+                for row in fresh:
+                    try:
+                        _insert_customers([row])
+                        result.created += 1
+                    except IntegrityError:
+                        result.error(row['line'], row['email'], "email already registered")
+
+            if stdout:
+                stdout.write(f"Imported {result.created} customers, skipped {result.skipped} rows so far")
+
+    return result
+
+
+# ---------------- Maid import ----------------
+
+def _skill_keys(value):
+    """'Cooking; elder care' -> ['cooking', 'elder_care']"""
+    parts = value.replace(';', ',').split(',')
+    return [part.strip().lower().replace(' ', '_') for part in parts if part.strip()]
+
+
+def _open_document(archive, member, field):
+    """Wrap one zip member as an upload without extracting the archive."""
+    try:
+        info = archive.getinfo(member)
+    except KeyError:
+        raise ValueError(f"{field}: '{member}' not found in documents archive")
+    return UploadedFile(
+        file=archive.open(info),
+        name=os.path.basename(member),
+        size=info.file_size,
+    )
+
+
+def _build_maid_form(row, archive):
+    data = MultiValueDict({
+        'name': [(row.get('name') or '').strip()],
+        'email': [(row.get('email') or '').strip()],
+        'mobile_number': [(row.get('mobile_number') or '').strip()],
+        'location': [(row.get('location') or '').strip()],
+        'expected_salary': [(row.get('expected_salary') or '').strip()],
+        'skills': _skill_keys(row.get('skills') or ''),
+    })
+    files = MultiValueDict()
+    for field in MAID_DOCUMENT_FIELDS:
+        member = (row.get(field) or '').strip()
+        if member:
+            files[field] = _open_document(archive, member, field)
+    return MaidProfileForm(data=data, files=files)
+
+
+def _save_maid(form):
+    email = form.cleaned_data['email']
+    user = User(username=email, email=email)
+    user.set_unusable_password()
+    user.save()
+    Profile.objects.create(
+        user=user,
+        full_name=form.cleaned_data['name'],
+        phone_number=form.cleaned_data['mobile_number'],
+        location=form.cleaned_data['location'],
+        role='maid',
+    )
+    maid = form.save(commit=False)
+    maid.user = user
+    maid.save()
+    return maid
+
+
+def _delete_documents(maid):
+    for field in MAID_DOCUMENT_FIELDS:
+        document = getattr(maid, field)
+        if document:
+            document.delete(save=False)
+
+
+def read_checkpoint(path):
+    """Last CSV line committed by a previous run, or 0."""
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path, encoding='utf-8') as f:
+        return json.load(f).get('last_line', 0)
+
+
+def write_checkpoint(path, last_line):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'last_line': last_line}, f)
+    os.replace(tmp_path, path)
+
+
+def import_maids(csv_file, archive_file, batch_size=100, checkpoint_path=None, resume=False, stdout=None):
+    """
+    Import maid registrations from an open CSV file plus a zip of documents.
+
+    The CSV columns are the MaidProfileForm fields. The two document columns
+    hold paths inside the zip, and skills are separated by ';' or ','. Each
+    batch is committed in one transaction and recorded in the checkpoint
+    file, so a failed run can be resumed from the first uncommitted line.
+    Accounts are created with unusable passwords.
+    """
+    result = ImportResult()
+    reader = csv.DictReader(csv_file)
+    missing = [column for column in MAID_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+    start_after = read_checkpoint(checkpoint_path) if resume else 0
+    numbered = ((line, row) for line, row in enumerate(reader, start=2) if line > start_after)
+
+    with zipfile.ZipFile(archive_file) as archive:
+        for chunk in read_chunks(numbered, batch_size):
+            emails = [(row.get('email') or '').strip() for _line, row in chunk]
+            existing = set(
+                email.lower() for email in
+                User.objects.filter(username__in=emails).values_list('username', flat=True)
+            )
+
+            saved = []
+            try:
+                with transaction.atomic():
+                    for line, row in chunk:
+                        email = (row.get('email') or '').strip()
+                        if email.lower() in existing:
+                            result.error(line, email, "email already registered")
+                            continue
+                        try:
+                            form = _build_maid_form(row, archive)
+                        except (ValueError, zipfile.BadZipFile) as e:
+                            result.error(line, email, str(e))
+                            continue
+                        try:
+                            if not form.is_valid():
+                                message = "; ".join(
+                                    f"{field}: {' '.join(errors)}" for field, errors in form.errors.items()
+                                )
+                                result.error(line, email, message)
+                                continue
+                            with transaction.atomic():
+                                saved.append(_save_maid(form))
+                        except IntegrityError:
+                            result.error(line, email, "email already registered")
+                        finally:
+                            for document in form.files.values():
+                                document.close()
+                        existing.add(email.lower())
+            except Exception:
+                # Roll back the whole batch, including stored documents
+                for maid in saved:
+                    _delete_documents(maid)
+                raise
+
+            result.created += len(saved)
+            if checkpoint_path:
+                write_checkpoint(checkpoint_path, chunk[-1][0])
+            if stdout:
+                stdout.write(f"Committed through line {chunk[-1][0]}: {result.created} created, {result.skipped} rejected")
+
+    return result
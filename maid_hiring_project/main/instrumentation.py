@@ -0,0 +1,139 @@
+import time
+from contextvars import ContextVar
+from functools import partial
+
+from django.core.mail.message import EmailMessage
+from django.db.backends.signals import connection_created
+from django.template.backends.django import Template as DjangoTemplate
+
+from . import metrics
+
+# Timings for the request currently being sampled (None when not sampled)
+_current_timings = ContextVar('request_timings', default=None)
+
+# execute_wrapper-style callables observing the current request's queries.
+# Database connections are per thread, and under ASGI a sync view runs in a
+# different thread from the middleware, so wrappers installed by the
+# middleware would never see the view's queries. Instead every connection
+# gets _dispatch_query() once, and it finds the observers through this
+# ContextVar, which asgiref copies into the thread running the view.
+_query_observers = ContextVar('query_observers', default=())
+
+_installed = False
+
+
+class RequestTimings:
+    """
+    Accumulates the time a single request spends in SQL, template
+    rendering and outbound mail.
+    """
+
+    def __init__(self):
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.mail_count = 0
+        self.mail_time = 0.0
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        """Hook for connection.execute_wrapper()."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.query_count += 1
+
+
+def observe_queries(observer):
+    """Send the current context's queries through `observer`. Returns a token for stop_observing()."""
+    return _query_observers.set(_query_observers.get() + (observer,))
+
+
+def stop_observing(token):
+    _query_observers.reset(token)
+
+
+def _dispatch_query(execute, sql, params, many, context):
+    call = execute
+    for observer in reversed(_query_observers.get()):
+        call = partial(observer, call)
+    return call(sql, params, many, context)
+
+
+def _install_dispatcher(sender, connection, **kwargs):
+    if _dispatch_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_dispatch_query)
+
+
+def start_timings():
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    return timings, token
+
+
+def stop_timings(token):
+    _current_timings.reset(token)
+
+
+def get_current_timings():
+    return _current_timings.get()
+
+
+def _timed_template_render(original):
+    def render(self, context=None, request=None):
+        timings = _current_timings.get()
+        if timings is None:
+            return original(self, context, request)
+
+        # Nested renders (e.g. render_to_string inside a view that is itself
+        # being rendered) must not be counted twice.
+        timings.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            timings.template_depth -= 1
+            if timings.template_depth == 0:
+                timings.template_time += time.perf_counter() - start
+
+    return render
+
+
+def _timed_mail_send(original):
+    def send(self, fail_silently=False):
+        timings = _current_timings.get()
+        start = time.perf_counter()
+        metrics.EMAIL_QUEUE_DEPTH.inc()
+        try:
+            sent = original(self, fail_silently)
+        except Exception:
+            metrics.EMAIL_SEND_FAILURES.inc()
+            raise
+        else:
+            metrics.EMAILS_SENT.inc(sent or 0)
+            return sent
+        finally:
+            metrics.EMAIL_QUEUE_DEPTH.dec()
+            if timings is not None:
+                timings.mail_time += time.perf_counter() - start
+                timings.mail_count += 1
+
+    return send
+
+
+def install():
+    """
+    Patch the template backend and EmailMessage, and hook query
+    observation into new database connections, once per process so that
+    their cost is attributed to the sampled request. Unsampled requests
+    only pay for a ContextVar lookup (and the mail counters).
+    """
+    global _installed
+    if _installed:
+        return
+    connection_created.connect(_install_dispatcher, dispatch_uid='main.instrumentation.queries')
+    DjangoTemplate.render = _timed_template_render(DjangoTemplate.render)
+    EmailMessage.send = _timed_mail_send(EmailMessage.send)
+    _installed = True
@@ -0,0 +1,185 @@
+"""
+City-partitioned caches for the maid listing.
+
+Each city has a snapshot holding its verified maids (card fields, newest
+first), skill facet counts and the total count. Snapshots are stored in the
+cache under a per-city version number. A change to a maid bumps only that
+city's version (see the signals), so other cities keep their cached data.
+
+Only known cities get a snapshot: the ones in cities.CITY_ALIASES and the
+current hot set. Any other city_key comes from free text, so caching it
+would let searches create cache keys without bound; those searches query
+the database instead. Version keys expire like the snapshots they name.
+
+The busiest cities (HOT_CITY_COUNT, by verified maids) are also kept as
+in-process snapshots, loaded at worker start-up. A request for a hot city
+then costs one cache lookup for the version number, and nothing is
+unpickled or queried.
+"""
+import threading
+import time
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F
+
+from .cards import skill_keys
+from .cities import ALIAS_TO_CITY, CITY_ALIASES, city_key, normalize
+from .models import MaidProfile
+
+# Columns the maid listing and profile cards read
+MAID_CARD_FIELDS = ('id', 'name', 'location', 'expected_salary', 'mobile_number', 'rating_score', 'rating_count')
+
+ALL_CITIES_VERSION_KEY = 'catalogue:all:version'
+
+_hot_snapshots = {}
+_hot_lock = threading.Lock()
+
+
+def _version_key(city):
+    return f'catalogue:city:{city}:version'
+
+
+def _current_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock rather than 1, so a version key that was
+        # evicted can never bring back an older snapshot
+        cache.add(key, int(time.time() * 1000), settings.CITY_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def city_version(city):
+    return _current_version(_version_key(city))
+
+
+def invalidate_city(city):
+    """Called after a maid in `city` is created, changed or removed."""
+    for key in (_version_key(city), ALL_CITIES_VERSION_KEY):
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass  # not cached yet; the next read starts a fresh version
+
+
+def skill_facets(skills_values):
+    counts = Counter(key for skills in skills_values for key in set(skill_keys(skills)))
+    return sorted(counts.items())
+
+
+def build_snapshot(city, version):
+    rows = list(
+        MaidProfile.objects.filter(status='verified', city_key=city)
+        .order_by('-created_at')
+        .values(*MAID_CARD_FIELDS, 'skills', skill_labels=F('card__skill_labels'))
+    )
+    return {
+        'city': city,
+        'version': version,
+        'rows': rows,
+        'count': len(rows),
+        'skills': skill_facets(row['skills'] for row in rows),
+    }
+
+
+def is_known_city(city):
+    return city in CITY_ALIASES or city in _hot_snapshots
+
+
+def get_city_snapshot(city):
+    """The snapshot of a known city, or None for any other city."""
+    if not is_known_city(city):
+        return None
+    version = city_version(city)
+    snapshot = _hot_snapshots.get(city)
+    if snapshot is not None and snapshot['version'] == version:
+        return snapshot
+
+    cache_key = f'catalogue:city:{city}:v{version}'
+    snapshot = cache.get(cache_key)
+    if snapshot is None:
+        snapshot = build_snapshot(city, version)
+        cache.set(cache_key, snapshot, settings.CITY_CACHE_TIMEOUT)
+
+    if city in _hot_snapshots:
+        with _hot_lock:
+            _hot_snapshots[city] = snapshot
+    return snapshot
+
+
+def search_snapshot(location):
+    """
+    The snapshot holding every match for a location search, or None.
+
+    The database search is a substring match, so "Mumbai" also finds maids
+    in Navi Mumbai. One city's snapshot is only enough when the search text
+    is not part of any other known city's name.
+    """
+    city = city_key(location)
+    if not city:
+        return None
+    text = normalize(location)
+    names = [*ALIAS_TO_CITY.items(), *((hot, hot) for hot in _hot_snapshots)]
+    if any(text in name and other != city for name, other in names):
+        return None
+    return get_city_snapshot(city)
+
+
+def preload_hot_cities(count=None):
+    """Keep in-process snapshots of the cities with the most verified maids."""
+    count = settings.HOT_CITY_COUNT if count is None else count
+    busiest = (
+        MaidProfile.objects.filter(status='verified').exclude(city_key='')
+        .values('city_key').annotate(maids=Count('id')).order_by('-maids')[:count]
+    )
+    snapshots = {}
+    for row in busiest:
+        city = row['city_key']
+        snapshots[city] = build_snapshot(city, city_version(city))
+    with _hot_lock:
+        _hot_snapshots.clear()
+        _hot_snapshots.update(snapshots)
+    return list(snapshots)
+
+
+def all_skill_facets():
+    """Skill facets across every city, for listings without a location."""
+    cache_key = f'catalogue:all:v{_current_version(ALL_CITIES_VERSION_KEY)}:skills'
+    facets = cache.get(cache_key)
+    if facets is None:
+        skills = MaidProfile.objects.filter(status='verified').values_list('skills', flat=True)
+        facets = skill_facets(skills.iterator(chunk_size=2000))
+        cache.set(cache_key, facets, settings.CITY_CACHE_TIMEOUT)
+    return facets
+
+
+def _decimal(value):
+    try:
+        return Decimal(value) if value not in (None, '') else None
+    except InvalidOperation:
+        return None
+
+
+def filter_rows(rows, skill=None, min_salary=None, max_salary=None, min_rating=None, location=None):
+    """Apply the listing's remaining filters to a city snapshot's rows."""
+    skill = (skill or '').lower()
+    # The same substring match as location__icontains, so "Andheri, Mumbai"
+    # does not return the whole of Mumbai
+    location = (location or '').lower()
+    low, high = _decimal(min_salary), _decimal(max_salary)
+    rating = _decimal(min_rating)
+    return [
+        row for row in rows
+        if (not skill or skill in row['skills'].lower())
+        and (not location or location in row['location'].lower())
+        and (low is None or row['expected_salary'] >= low)
+        and (high is None or row['expected_salary'] <= high)
+        and (rating is None or row['rating_score'] >= rating)
+    ]
+
+
+def by_rating(rows):
+    return sorted(rows, key=lambda row: (row['rating_score'], row['rating_count']), reverse=True)
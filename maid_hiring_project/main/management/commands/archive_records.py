@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from main.archive import archive_completed_bookings, archive_rejected_maids
+
+
+class Command(BaseCommand):
+    help = (
+        "Move rejected registrations and completed bookings past their retention window "
+        "to the archive tables. Safe to interrupt and rerun."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=['maids', 'bookings'], help="Archive just one kind of record.")
+        parser.add_argument('--batch-size', type=int, default=100, help="Rows moved per transaction.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count what would be archived.")
+
+    def handle(self, *args, **options):
+        kwargs = {'batch_size': options['batch_size'], 'dry_run': options['dry_run'], 'stdout': self.stdout}
+        maids = bookings = 0
+        if options['only'] in (None, 'maids'):
+            maids = archive_rejected_maids(**kwargs)
+        if options['only'] in (None, 'bookings'):
+            bookings = archive_completed_bookings(**kwargs)
+
+        verb = "Would archive" if options['dry_run'] else "Archived"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {maids} rejected registrations and {bookings} completed bookings."))
@@ -0,0 +1,134 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from main.assets import COMPRESSIBLE_EXTENSIONS, IMAGE_FORMATS, manifest_path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+MIN_COMPRESS_SIZE = 512
+
+
+class Command(BaseCommand):
+    help = (
+        "Post-process collected static files: write responsive AVIF/WebP variants of "
+        "settings.RESPONSIVE_IMAGES with content-hashed names, precompress text assets "
+        "to .gz/.br, and record the variants in the responsive image manifest. "
+        "Run after collectstatic."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quality', type=int, default=70, help="Encoder quality for AVIF/WebP.")
+        parser.add_argument('--skip-images', action='store_true')
+        parser.add_argument('--skip-compression', action='store_true')
+
+    def handle(self, *args, **options):
+        if not os.path.isdir(settings.STATIC_ROOT):
+            raise CommandError(f"{settings.STATIC_ROOT} does not exist; run collectstatic first.")
+
+        if not options['skip_images']:
+            if Image is None:
+                raise CommandError("Pillow is required for image variants (pip install pillow) or pass --skip-images.")
+            self.build_images(options['quality'])
+
+        if not options['skip_compression']:
+            self.compress_text_assets()
+
+    # ---------------- Responsive images ----------------
+
+    def build_images(self, quality):
+        formats = [fmt for fmt in IMAGE_FORMATS if features.check(fmt[2])]
+        manifest = {}
+
+        for name in settings.RESPONSIVE_IMAGES:
+            source_path = staticfiles_storage.path(name)
+            with Image.open(source_path) as image:
+                image = image.convert('RGB')
+                width, height = image.size
+                entry = {
+                    'width': width,
+                    'height': height,
+                    'fallback': self.fallback_name(name),
+                    'sources': {},
+                }
+                widths = sorted({w for w in settings.RESPONSIVE_IMAGE_WIDTHS if w < width} | {width})
+
+                for pil_format, mime_type, extension in formats:
+                    variants = []
+                    for target_width in widths:
+                        resized = image if target_width == width else image.resize(
+                            (target_width, round(height * target_width / width)), Image.LANCZOS
+                        )
+                        buffer = io.BytesIO()
+                        resized.save(buffer, pil_format, quality=quality)
+                        variants.append([self.write_hashed(name, target_width, extension, buffer.getvalue()), target_width])
+                    entry['sources'][mime_type] = variants
+
+            manifest[name] = entry
+            original = os.path.getsize(source_path)
+            smallest = min((os.path.getsize(staticfiles_storage.path(v[0])) for vs in entry['sources'].values() for v in vs), default=original)
+            self.stdout.write(f"{name}: {original // 1024} KB original, smallest variant {smallest // 1024} KB")
+
+        with open(manifest_path(), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {manifest_path()}"))
+
+    def fallback_name(self, name):
+        # Use the hashed copy written by ManifestStaticFilesStorage if there is one
+        try:
+            return staticfiles_storage.stored_name(name)
+        except (AttributeError, ValueError):
+            return name
+
+    def write_hashed(self, name, width, extension, data):
+        base, _ext = os.path.splitext(name)
+        digest = hashlib.md5(data, usedforsecurity=False).hexdigest()[:12]
+        variant_name = f"{base}.{width}w.{digest}.{extension}"
+        path = os.path.join(settings.STATIC_ROOT, variant_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return variant_name
+
+    # ---------------- Precompression ----------------
+
+    def compress_text_assets(self):
+        count = saved = 0
+        for root, _dirs, files in os.walk(settings.STATIC_ROOT):
+            for filename in files:
+                if os.path.splitext(filename)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+                    continue
+                path = os.path.join(root, filename)
+                with open(path, 'rb') as f:
+                    data = f.read()
+                if len(data) < MIN_COMPRESS_SIZE:
+                    continue
+
+                compressed = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+                if brotli is not None:
+                    compressed['.br'] = brotli.compress(data, quality=11)
+                for suffix, payload in compressed.items():
+                    # Only keep copies that are actually smaller
+                    if len(payload) < len(data):
+                        with open(path + suffix, 'wb') as f:
+                            f.write(payload)
+                        saved += len(data) - len(payload)
+                count += 1
+
+        if brotli is None:
+            self.stdout.write(self.style.WARNING("brotli not installed; wrote gzip copies only."))
+        self.stdout.write(self.style.SUCCESS(f"Precompressed {count} files ({saved // 1024} KB saved across copies)."))
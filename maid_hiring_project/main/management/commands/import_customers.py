@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main.importers import import_customers
+
+
+class Command(BaseCommand):
+    help = "Import customer accounts from a CSV file (full_name, email, phone_number[, password, location])."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows inserted per transaction.")
+        parser.add_argument('--workers', type=int, default=None, help="Password hashing processes (default: CPU count).")
+        parser.add_argument('--errors', help="Write rejected rows to this CSV file.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as csv_file:
+                result = import_customers(
+                    csv_file,
+                    batch_size=options['batch_size'],
+                    workers=options['workers'],
+                    stdout=self.stdout,
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if options['errors'] and result.errors:
+            with open(options['errors'], 'w', newline='', encoding='utf-8') as error_file:
+                result.write_report(error_file)
+
+        self.stdout.write(self.style.SUCCESS(f"Created {result.created} customers, skipped {result.skipped} rows."))
+        for line, email, message in result.errors[:20]:
+            self.stdout.write(f"  line {line} ({email}): {message}")
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main.importers import import_maids
+
+
+class Command(BaseCommand):
+    help = "Import maid registrations from a partner agency CSV plus a zip of their documents."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('documents_zip')
+        parser.add_argument('--batch-size', type=int, default=100, help="Rows committed per transaction.")
+        parser.add_argument('--checkpoint', help="Checkpoint file (default: <csv_path>.checkpoint.json).")
+        parser.add_argument('--resume', action='store_true', help="Skip rows committed by a previous run.")
+        parser.add_argument('--report', help="Write rejected rows to this CSV file.")
+
+    def handle(self, *args, **options):
+        checkpoint = options['checkpoint'] or f"{options['csv_path']}.checkpoint.json"
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as csv_file:
+                result = import_maids(
+                    csv_file,
+                    options['documents_zip'],
+                    batch_size=options['batch_size'],
+                    checkpoint_path=checkpoint,
+                    resume=options['resume'],
+                    stdout=self.stdout,
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(f"{e} (rerun with --resume to continue after the last committed batch)")
+
+        if options['report'] and result.errors:
+            with open(options['report'], 'w', newline='', encoding='utf-8') as report_file:
+                result.write_report(report_file)
+
+        self.stdout.write(self.style.SUCCESS(f"Created {result.created} maids, rejected {result.skipped} rows."))
+        for line, email, message in result.errors[:20]:
+            self.stdout.write(f"  line {line} ({email}): {message}")
@@ -0,0 +1,33 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.db_router import PRIMARY_ALIAS, REPLICA_ALIAS
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database onto the local replica file (development stand-in for replication)."
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in connections.databases:
+            raise CommandError("No 'replica' database configured. Set DATABASE_REPLICA_NAME first.")
+
+        primary = connections.databases[PRIMARY_ALIAS]
+        replica = connections.databases[REPLICA_ALIAS]
+        for db in (primary, replica):
+            if db['ENGINE'] != 'django.db.backends.sqlite3':
+                raise CommandError("sync_replica only supports SQLite databases; use real replication elsewhere.")
+
+        connections[REPLICA_ALIAS].close()
+        source = sqlite3.connect(str(primary['NAME']))
+        target = sqlite3.connect(str(replica['NAME']))
+        try:
+            # The online backup API gives a consistent snapshot even while
+            # the primary is being written to.
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+        self.stdout.write(self.style.SUCCESS(f"Replica {replica['NAME']} synced from {primary['NAME']}."))
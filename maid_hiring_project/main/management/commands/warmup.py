@@ -0,0 +1,54 @@
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.warmup import warm_up
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+\d+\s+\|\s*(\S+)')
+
+
+class Command(BaseCommand):
+    help = (
+        "Precompile templates, prime the URL resolver and translation catalogues, "
+        "and report how long each phase took. With --imports, also profile the "
+        "import time of the WSGI application in a fresh interpreter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--imports', action='store_true', help="Profile imports with python -X importtime.")
+        parser.add_argument('--top', type=int, default=15, help="Number of slowest packages to list.")
+
+    def handle(self, *args, **options):
+        report = warm_up()
+        for key, value in report.items():
+            self.stdout.write(f"  {key}: {value}")
+
+        if options['imports']:
+            self.profile_imports(options['top'])
+
+    def profile_imports(self, top):
+        # importtime writes to stderr; keep the child from warming up itself
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import core.wsgi'],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'WARMUP_ON_STARTUP': '0'},
+            capture_output=True,
+            text=True,
+        )
+        # Sum self time per top-level package (django, main, numpy, ...)
+        packages = {}
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if match:
+                self_us, module = int(match.group(1)), match.group(2)
+                package = module.split('.')[0]
+                packages[package] = packages.get(package, 0) + self_us
+
+        total_ms = sum(packages.values()) / 1000
+        self.stdout.write(f"Import time for core.wsgi: {total_ms:.1f} ms")
+        for self_us, package in sorted(((us, name) for name, us in packages.items()), reverse=True)[:top]:
+            self.stdout.write(f"  {self_us / 1000:8.1f} ms  {package}")
@@ -0,0 +1,224 @@
+"""
+In-app messaging between customers and maids, with live delivery.
+
+Messages are stored in Conversation / Message. Open SSE and long-poll
+connections subscribe to the process-wide MessageHub. A subscription is one
+asyncio.Event, so an idle connection costs a suspended coroutine and no
+thread, and a worker can hold thousands of them. When a message is posted,
+the hub wakes the sender's and recipient's subscriptions, and each woken
+connection reads its new rows from the database (id > last seen). Several
+notifications can therefore merge into one wake-up without losing anything.
+
+post_message() notifies subscriptions in this process directly. For
+messages posted by other workers, one watcher task per event loop polls
+the Message primary key every MESSAGE_WATCH_INTERVAL seconds while anyone
+is connected, and wakes the affected users.
+"""
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import metrics
+from .models import Conversation, Message
+
+FETCH_LIMIT = 100
+
+MESSAGE_FIELDS = ('id', 'conversation_id', 'sender_id', 'body', 'created_at',
+                  'sender__username', 'sender__profile__full_name')
+
+
+class Subscription:
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.event = asyncio.Event()
+
+    def notify(self):
+        # May be called from a sync view's worker thread
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            pass  # loop already closed; the connection is gone
+
+    async def wait(self, timeout):
+        """True when notified, False when the timeout expired first."""
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.event.clear()
+        return True
+
+
+class MessageHub:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = {}
+        self.watchers = {}
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id)
+        with self.lock:
+            self.subscribers.setdefault(user_id, set()).add(subscription)
+        metrics.MESSAGE_STREAMS.inc()
+        self.ensure_watcher(subscription.loop)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscribers[subscription.user_id]
+        metrics.MESSAGE_STREAMS.dec()
+
+    def notify(self, user_ids):
+        with self.lock:
+            subscriptions = [s for user_id in set(user_ids) for s in self.subscribers.get(user_id, ())]
+        for subscription in subscriptions:
+            subscription.notify()
+
+    def connection_count(self):
+        with self.lock:
+            return sum(len(subscriptions) for subscriptions in self.subscribers.values())
+
+    def ensure_watcher(self, loop):
+        with self.lock:
+            task = self.watchers.get(loop)
+            if task is None or task.done():
+                self.watchers[loop] = loop.create_task(self.watch(loop))
+
+    async def watch(self, loop):
+        """Wake local subscribers for messages written by other workers."""
+        watermark = await latest_message_id()
+        try:
+            while self.has_subscribers(loop):
+                await asyncio.sleep(settings.MESSAGE_WATCH_INTERVAL)
+                rows = [row async for row in Message.objects.filter(id__gt=watermark)
+                        .order_by('id').values_list('id', 'sender_id', 'recipient_id')[:1000]]
+                if rows:
+                    watermark = rows[-1][0]
+                    self.notify([user_id for _id, sender_id, recipient_id in rows
+                                 for user_id in (sender_id, recipient_id)])
+        finally:
+            with self.lock:
+                self.watchers.pop(loop, None)
+
+    def has_subscribers(self, loop):
+        with self.lock:
+            return any(s.loop is loop for subscriptions in self.subscribers.values() for s in subscriptions)
+
+
+hub = MessageHub()
+
+
+# ---------------- Conversations ----------------
+
+def conversations_for(user):
+    """Threads the user takes part in, as customer or as maid."""
+    return Conversation.objects.filter(Q(customer=user) | Q(maid__user=user))
+
+
+def is_customer(conversation, user):
+    return conversation.customer_id == user.pk
+
+
+def start_conversation(customer, maid, subject=''):
+    conversation, _ = Conversation.objects.get_or_create(
+        customer=customer, maid=maid, defaults={'subject': subject[:200]}
+    )
+    return conversation
+
+
+def post_message(conversation, sender, body):
+    """Store a message and wake both participants' live connections after commit."""
+    if is_customer(conversation, sender):
+        recipient_id = conversation.maid.user_id
+        read_field = 'customer_read_at'
+    else:
+        recipient_id = conversation.customer_id
+        read_field = 'maid_read_at'
+
+    with transaction.atomic():
+        message = Message.objects.create(
+            conversation=conversation, sender=sender, recipient_id=recipient_id, body=body
+        )
+        # Sending counts as reading the thread
+        Conversation.objects.filter(pk=conversation.pk).update(
+            last_message_at=message.created_at, **{read_field: message.created_at}
+        )
+        transaction.on_commit(lambda: hub.notify([sender.pk, recipient_id]))
+    return message
+
+
+def mark_read(conversation, user):
+    field = 'customer_read_at' if is_customer(conversation, user) else 'maid_read_at'
+    Conversation.objects.filter(pk=conversation.pk).update(**{field: timezone.now()})
+
+
+# ---------------- Live delivery ----------------
+
+def user_messages(user_id):
+    return Message.objects.filter(Q(recipient_id=user_id) | Q(sender_id=user_id))
+
+
+def latest_ids(user_id=None):
+    queryset = Message.objects.all() if user_id is None else user_messages(user_id)
+    return queryset.order_by('-id').values_list('id', flat=True)
+
+
+async def latest_message_id(user_id=None):
+    return await latest_ids(user_id).afirst() or 0
+
+
+async def fetch_new(user_id, after):
+    queryset = user_messages(user_id).filter(id__gt=after).order_by('id').values(*MESSAGE_FIELDS)
+    return [row async for row in queryset[:FETCH_LIMIT]]
+
+
+def serialize(row):
+    return {
+        'id': row['id'],
+        'conversation': row['conversation_id'],
+        'sender': row['sender_id'],
+        'sender_name': row['sender__profile__full_name'] or row['sender__username'],
+        'body': row['body'],
+        'created_at': row['created_at'].isoformat(),
+    }
+
+
+async def event_stream(user_id, after):
+    """Server-Sent Events for one connection. Runs until the client disconnects."""
+    subscription = hub.subscribe(user_id)
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            rows = await fetch_new(user_id, after)
+            for row in rows:
+                after = row['id']
+                yield f"id: {row['id']}\nevent: message\ndata: {json.dumps(serialize(row))}\n\n"
+            if len(rows) == FETCH_LIMIT:
+                continue
+            if not await subscription.wait(settings.MESSAGE_STREAM_HEARTBEAT):
+                yield ': keep-alive\n\n'
+    finally:
+        hub.unsubscribe(subscription)
+
+
+async def wait_for_messages(user_id, after, timeout):
+    """Long-poll: new messages after `after`, waiting up to `timeout` seconds."""
+    subscription = hub.subscribe(user_id)
+    try:
+        rows = await fetch_new(user_id, after)
+        if not rows:
+            await subscription.wait(timeout)
+            rows = await fetch_new(user_id, after)
+    finally:
+        hub.unsubscribe(subscription)
+    return [serialize(row) for row in rows]
@@ -0,0 +1,209 @@
+"""
+Minimal Prometheus text-format metrics.
+
+Counters and histograms live in process memory, so every worker exposes its
+own series (the usual setup when each worker is scraped or labelled by
+instance). Business gauges such as maid counts are kept in the cache and
+adjusted by signals once the change commits, so a scrape rarely runs
+COUNT(*) against the database; they are recounted when their entries
+expire (MAID_COUNT_CACHE_TIMEOUT), which also corrects any drift.
+"""
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .caching import bounded_timeout
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+MAID_COUNT_KEY = 'metrics:maid_count:{status}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def header(self):
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+        ]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}')
+        return lines
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][i] += 1
+                    break
+            state['sum'] += value
+
+    def collect(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted((key, dict(state, counts=list(state['counts']))) for key, state in self._values.items())
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state['counts']):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_number(bound)}"')
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_number(state["sum"])}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    'maid_http_request_duration_seconds',
+    'Time spent handling a request, by view.',
+    ['view', 'method'],
+)
+REQUESTS = Counter(
+    'maid_http_requests_total',
+    'Requests handled, by view and status code.',
+    ['view', 'status'],
+)
+DB_QUERIES = Counter(
+    'maid_db_queries_total',
+    'Database queries executed while handling requests, by view.',
+    ['view'],
+)
+EMAILS_SENT = Counter(
+    'maid_emails_sent_total',
+    'Outbound emails handed to the mail backend successfully.',
+)
+EMAIL_SEND_FAILURES = Counter(
+    'maid_email_send_failures_total',
+    'Outbound emails that raised while being sent.',
+)
+EMAIL_QUEUE_DEPTH = Gauge(
+    'maid_email_queue_depth',
+    'Emails currently waiting on the mail backend in this process.',
+)
+MESSAGE_STREAMS = Gauge(
+    'maid_message_streams_open',
+    'Live message connections (SSE and long-poll) open in this process.',
+)
+
+REGISTRY = [REQUEST_LATENCY, REQUESTS, DB_QUERIES, EMAILS_SENT, EMAIL_SEND_FAILURES, EMAIL_QUEUE_DEPTH, MESSAGE_STREAMS]
+
+
+# ---------------- Cached business counters ----------------
+
+def _maid_statuses():
+    from .models import MaidProfile
+    return [status for status, _label in MaidProfile.STATUS_CHOICES]
+
+
+def prime_maid_counts():
+    """Seed the cached maid counters with a single grouped query."""
+    from .models import MaidProfile
+    counts = {status: 0 for status in _maid_statuses()}
+    for row in MaidProfile.objects.values('status').annotate(total=Count('id')):
+        counts[row['status']] = row['total']
+    cache.set_many(
+        {MAID_COUNT_KEY.format(status=status): total for status, total in counts.items()},
+        bounded_timeout(settings.MAID_COUNT_CACHE_TIMEOUT),
+    )
+    return counts
+
+
+def get_maid_counts():
+    keys = {status: MAID_COUNT_KEY.format(status=status) for status in _maid_statuses()}
+    cached = cache.get_many(keys.values())
+    if len(cached) != len(keys):
+        return prime_maid_counts()
+    return {status: cached[key] for status, key in keys.items()}
+
+
+def adjust_maid_count(status, delta):
+    """Move a cached counter once the current transaction commits; a missing key is left for the next prime."""
+    if not status:
+        return
+
+    def adjust():
+        try:
+            cache.incr(MAID_COUNT_KEY.format(status=status), delta)
+        except ValueError:
+            pass
+    transaction.on_commit(adjust)
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+
+    lines.append('# HELP maid_profiles Maid profiles by verification status.')
+    lines.append('# TYPE maid_profiles gauge')
+    for status, total in sorted(get_maid_counts().items()):
+        lines.append(f'maid_profiles{{status="{status}"}} {total}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,224 @@
+import json
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from . import compression, instrumentation, metrics
+
+logger = logging.getLogger('main.performance')
+
+
+class PerformanceTimingMiddleware:
+    """
+    Records query count, SQL time, template render time and outbound mail
+    time for a sample of requests. Results are sent back as Server-Timing
+    headers and written as one JSON log line per request.
+
+    Controlled by settings.PERFORMANCE_SAMPLE_RATE (0.0 disables it,
+    1.0 instruments every request).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PERFORMANCE_SAMPLE_RATE', 0.0)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        timings, token = instrumentation.start_timings()
+        observing = instrumentation.observe_queries(timings.sql_wrapper)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.stop_observing(observing)
+            instrumentation.stop_timings(token)
+        return self.record(request, response, timings, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        timings, token = instrumentation.start_timings()
+        observing = instrumentation.observe_queries(timings.sql_wrapper)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.stop_observing(observing)
+            instrumentation.stop_timings(token)
+        return self.record(request, response, timings, time.perf_counter() - start)
+
+    def sampled(self):
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def record(self, request, response, timings, total):
+        response['Server-Timing'] = ', '.join([
+            f'sql;dur={timings.sql_time * 1000:.1f};desc="{timings.query_count} queries"',
+            f'tpl;dur={timings.template_time * 1000:.1f}',
+            f'mail;dur={timings.mail_time * 1000:.1f};desc="{timings.mail_count} sent"',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+        match = getattr(request, 'resolver_match', None)
+        logger.info(json.dumps({
+            'event': 'request_timing',
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': timings.query_count,
+            'sql_ms': round(timings.sql_time * 1000, 2),
+            'template_ms': round(timings.template_time * 1000, 2),
+            'mails': timings.mail_count,
+            'mail_ms': round(timings.mail_time * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+        }))
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Feeds the per-view latency histogram, request counter and DB query
+    counter exposed at /metrics. Runs for every request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        counter = QueryCounter()
+        observing = instrumentation.observe_queries(counter)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.stop_observing(observing)
+        return self.record(request, response, counter.count, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        observing = instrumentation.observe_queries(counter)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.stop_observing(observing)
+        return self.record(request, response, counter.count, time.perf_counter() - start)
+
+    def record(self, request, response, query_count, duration):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unmatched'
+        metrics.REQUEST_LATENCY.observe(duration, view=view, method=request.method)
+        metrics.REQUESTS.inc(view=view, status=response.status_code)
+        if query_count:
+            metrics.DB_QUERIES.inc(query_count, view=view)
+        return response
+
+
+class QueryCounter:
+    """execute_wrapper that just counts queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class CompressionMiddleware:
+    """
+    Strips template indentation from HTML and compresses text responses
+    with brotli or gzip, whichever the client accepts (see
+    main/compression.py). Streaming responses are compressed chunk by chunk
+    and flushed after each one, so they still arrive progressively; Server-
+    Sent Events are left alone so every event is delivered immediately.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process(request, await self.get_response(request))
+
+    def process(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if (
+            response.status_code in (204, 206, 304)
+            or response.has_header('Content-Encoding')
+            or content_type == 'text/event-stream'
+            or not content_type.startswith(compression.COMPRESSIBLE_TYPES)
+        ):
+            return response
+
+        if not response.streaming and content_type == 'text/html' and settings.STRIP_HTML_WHITESPACE:
+            stripped = compression.strip_whitespace(response.content)
+            if len(stripped) != len(response.content):
+                # Whether or not it is compressed below, the body has changed
+                response.content = stripped
+                response.headers['Content-Length'] = str(len(stripped))
+                self.weaken_etag(response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compression.acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compression.compress_stream(response.streaming_content, encoding)
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+                return response
+            compressed = compression.compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        self.weaken_etag(response)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def weaken_etag(response):
+        # The bytes sent differ from the ones a strong ETag named
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
@@ -0,0 +1,57 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_duplicate_emails(apps, schema_editor):
+    # Resolving duplicates means merging or renaming accounts, which needs a
+    # person; stop with the list instead of failing inside CREATE INDEX.
+    User = apps.get_model('auth', 'User')
+    duplicates = (
+        User.objects.using(schema_editor.connection.alias).exclude(email='')
+        .values(email_ci=Lower('email')).annotate(accounts=Count('id')).filter(accounts__gt=1)
+        .order_by('email_ci')
+    )
+    emails = [row['email_ci'] for row in duplicates]
+    if emails:
+        shown = ', '.join(emails[:20]) + (f" (and {len(emails) - 20} more)" if len(emails) > 20 else '')
+        raise RuntimeError(
+            f"Cannot add the case-insensitive unique index on auth_user.email: {len(emails)} email "
+            f"address(es) are used by more than one account, ignoring case: {shown}. Change or merge "
+            f"those accounts' emails and run migrate again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_maidprofile_status_profile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Booking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service_date', models.DateField(blank=True, help_text='When is the service required?', null=True)),
+                ('message', models.TextField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('accepted', 'Accepted'), ('rejected', 'Rejected'), ('completed', 'Completed')], default='pending', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to=settings.AUTH_USER_MODEL)),
+                ('maid', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='main.maidprofile')),
+            ],
+        ),
+        # auth.User cannot carry a model-level constraint from this app, so the
+        # case-insensitive email uniqueness used by registration is enforced
+        # with a partial expression index instead.
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX main_auth_user_email_ci_uniq ON auth_user (LOWER(email)) WHERE email <> ''",
+            reverse_sql="DROP INDEX main_auth_user_email_ci_uniq",
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from django.utils import translation
+
+# Frozen copies of main.cards as of this migration, so later changes to
+# that module cannot change what this migration does
+CARD_LANGUAGES = ['en', 'hi', 'mr']
+
+SKILL_LABELS = {
+    'cleaning': 'Cleaning',
+    'cooking': 'Cooking',
+    'babysitting': 'Babysitting',
+    'elder_care': 'Elder Care',
+    'laundry': 'Laundry',
+    'other': 'Other Household Work',
+}
+
+
+def card_fields(name, skills):
+    keys = [s.strip() for s in (skills or '').split(',') if s.strip()]
+    skill_labels = {}
+    for language in CARD_LANGUAGES:
+        with translation.override(language):
+            skill_labels[language] = [
+                translation.gettext(SKILL_LABELS[key]) if key in SKILL_LABELS else key.title()
+                for key in keys
+            ]
+    return {
+        'first_name': name.split()[0] if name else "",
+        'display_name': name,
+        'display_initial': name[0].upper() if name else "?",
+        'skill_labels': skill_labels,
+    }
+
+
+def build_cards(apps, schema_editor):
+    MaidProfile = apps.get_model('main', 'MaidProfile')
+    MaidCard = apps.get_model('main', 'MaidCard')
+    cards = (
+        MaidCard(maid_id=maid_id, **card_fields(name, skills))
+        for maid_id, name, skills in MaidProfile.objects.values_list('id', 'name', 'skills').iterator()
+    )
+    MaidCard.objects.bulk_create(cards, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_booking_user_email_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaidCard',
+            fields=[
+                ('maid', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='main.maidprofile')),
+                ('first_name', models.CharField(max_length=100)),
+                ('display_name', models.CharField(max_length=100)),
+                ('display_initial', models.CharField(max_length=1)),
+                ('skill_labels', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(build_cards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_registrations(apps, schema_editor):
+    # Earlier transitions were never recorded; registrations can be rebuilt
+    # from MaidProfile.created_at.
+    MaidProfile = apps.get_model('main', 'MaidProfile')
+    VerificationDailyStats = apps.get_model('main', 'VerificationDailyStats')
+    per_day = (
+        MaidProfile.objects.annotate(day=TruncDate('created_at'))
+        .values('day').annotate(count=Count('id')).order_by()
+    )
+    VerificationDailyStats.objects.bulk_create(
+        [VerificationDailyStats(date=row['day'], registrations=row['count']) for row in per_day if row['day']],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_maidcard'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VerificationDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('registrations', models.PositiveIntegerField(default=0)),
+                ('approvals', models.PositiveIntegerField(default=0)),
+                ('rejections', models.PositiveIntegerField(default=0)),
+                ('verify_seconds', models.JSONField(default=list)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MaidStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('pending', 'Pending Approval'), ('verified', 'Verified'), ('rejected', 'Rejected')], max_length=20)),
+                ('to_status', models.CharField(choices=[('pending', 'Pending Approval'), ('verified', 'Verified'), ('rejected', 'Rejected')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('maid', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='main.maidprofile')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['maid', 'created_at'], name='main_maidst_maid_id_2dddde_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_registrations, migrations.RunPython.noop),
+    ]
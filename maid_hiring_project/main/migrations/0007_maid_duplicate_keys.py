@@ -0,0 +1,136 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:13
+
+import hashlib
+import re
+import unicodedata
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+# Frozen copies of main.dedupe as of this migration, so later changes to
+# that module cannot change what this migration does
+LATIN_DIGRAPHS = [
+    ('ch', 'c'), ('sh', 's'), ('ph', 'f'), ('kh', 'k'), ('gh', 'g'),
+    ('th', 't'), ('dh', 'd'), ('bh', 'b'), ('jh', 'j'), ('ck', 'k'),
+]
+LATIN_LETTERS = str.maketrans({'q': 'k', 'z': 'j', 'w': 'v', 'x': 'k'})
+VOWELS = set('aeiouyh')
+
+DEVANAGARI_CONSONANTS = {
+    'क': 'k', 'ख': 'k', 'ग': 'g', 'घ': 'g', 'ङ': 'n',
+    'च': 'c', 'छ': 'c', 'ज': 'j', 'झ': 'j', 'ञ': 'n',
+    'ट': 't', 'ठ': 't', 'ड': 'd', 'ढ': 'd', 'ण': 'n',
+    'त': 't', 'थ': 't', 'द': 'd', 'ध': 'd', 'न': 'n',
+    'प': 'p', 'फ': 'f', 'ब': 'b', 'भ': 'b', 'म': 'm',
+    'र': 'r', 'ल': 'l', 'ळ': 'l', 'व': 'v',
+    'श': 's', 'ष': 's', 'स': 's',
+    # Anusvara / chandrabindu are nasal sounds, usually written "n"
+    'ं': 'n', 'ँ': 'n',
+}
+DEVANAGARI_VOWELS = set('अआइईउऊऋएऐओऔ')
+
+# Honorifics that should not make two names differ
+NAME_STOPWORDS = {'smt', 'shrimati', 'mrs', 'ms', 'miss', 'kumari', 'km', 'bai'}
+
+
+def canonical_phone(number):
+    """Digits only, with an Indian +91 or trunk 0 prefix removed."""
+    digits = ''.join(str(unicodedata.digit(ch)) for ch in number or '' if unicodedata.digit(ch, None) is not None)
+    if len(digits) == 12 and digits.startswith('91'):
+        digits = digits[2:]
+    elif len(digits) == 11 and digits.startswith('0'):
+        digits = digits[1:]
+    return digits
+
+
+def _word_key(word):
+    if not word:
+        return ''
+    if word[0] in DEVANAGARI_VOWELS or word[0] in VOWELS - {'h', 'y'}:
+        skeleton = ['a']
+    else:
+        skeleton = []
+
+    if any(ch in DEVANAGARI_CONSONANTS or ch in DEVANAGARI_VOWELS for ch in word):
+        letters = [DEVANAGARI_CONSONANTS.get(ch, '') for ch in word]
+    else:
+        for digraph, replacement in LATIN_DIGRAPHS:
+            word = word.replace(digraph, replacement)
+        letters = [ch for ch in word.translate(LATIN_LETTERS) if ch not in VOWELS]
+
+    for letter in letters:
+        # Doubled consonants ("Lalitta") count once
+        if letter and (not skeleton or skeleton[-1] != letter):
+            skeleton.append(letter)
+    return ''.join(skeleton)
+
+
+def phonetic_key(name):
+    # \w alone would split Devanagari words at their vowel signs
+    words = re.findall(r'(?:[^\W_]|[\u0900-\u097F])+', (name or '').lower())
+    keys = sorted(_word_key(word) for word in words if word not in NAME_STOPWORDS)
+    return ' '.join(key for key in keys if key)[:100]
+
+
+def document_hash(document):
+    digest = hashlib.sha256()
+    for chunk in document.chunks():
+        digest.update(chunk)
+    document.seek(0)
+    return digest.hexdigest()
+
+
+def backfill_keys(apps, schema_editor):
+    MaidProfile = apps.get_model('main', 'MaidProfile')
+    batch = []
+    for maid in MaidProfile.objects.only('id', 'name', 'mobile_number', 'aadhaar_document').iterator(chunk_size=500):
+        maid.phone_key = canonical_phone(maid.mobile_number)
+        maid.name_key = phonetic_key(maid.name)
+        if maid.aadhaar_document and default_storage.exists(maid.aadhaar_document.name):
+            with default_storage.open(maid.aadhaar_document.name, 'rb') as document:
+                maid.aadhaar_sha256 = document_hash(document)
+        batch.append(maid)
+        if len(batch) == 500:
+            MaidProfile.objects.bulk_update(batch, ['phone_key', 'name_key', 'aadhaar_sha256'])
+            batch = []
+    MaidProfile.objects.bulk_update(batch, ['phone_key', 'name_key', 'aadhaar_sha256'])
+
+    # Within each group sharing a key, every registration after the first is flagged
+    for key in ('phone_key', 'aadhaar_sha256'):
+        groups = (MaidProfile.objects.exclude(**{key: ''}).values(key)
+                  .annotate(count=Count('id'), first_id=Min('id')).filter(count__gt=1))
+        for group in groups:
+            (MaidProfile.objects.filter(**{key: group[key]}).exclude(id=group['first_id'])
+             .update(possible_duplicate=True))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_conversations_messages'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maidprofile',
+            name='aadhaar_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='maidprofile',
+            name='name_key',
+            field=models.CharField(blank=True, db_index=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='maidprofile',
+            name='phone_key',
+            field=models.CharField(blank=True, db_index=True, max_length=15),
+        ),
+        migrations.AddField(
+            model_name='maidprofile',
+            name='possible_duplicate',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.RunPython(backfill_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:16
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copies of main.cities as of this migration, so later changes to
+# that module cannot change what this migration does
+
+# canonical key -> other ways people write it
+CITY_ALIASES = {
+    'mumbai': ['bombay', 'मुंबई', 'मुम्बई'],
+    'navi mumbai': ['new mumbai', 'नवी मुंबई', 'नवी मुम्बई'],
+    'thane': ['ठाणे'],
+    'pune': ['poona', 'पुणे'],
+    'nagpur': ['नागपूर', 'नागपुर'],
+    'nashik': ['nasik', 'नाशिक'],
+    'aurangabad': ['chhatrapati sambhajinagar', 'sambhajinagar', 'औरंगाबाद', 'छत्रपती संभाजीनगर'],
+    'kolhapur': ['कोल्हापूर', 'कोल्हापुर'],
+    'solapur': ['sholapur', 'सोलापूर', 'सोलापुर'],
+    'delhi': ['new delhi', 'दिल्ली', 'नई दिल्ली', 'नवी दिल्ली'],
+    'bengaluru': ['bangalore', 'बेंगलुरु', 'बंगळूरु'],
+    'hyderabad': ['हैदराबाद'],
+    'chennai': ['madras', 'चेन्नई'],
+    'kolkata': ['calcutta', 'कोलकाता'],
+    'ahmedabad': ['अहमदाबाद'],
+}
+
+# every spelling -> canonical key
+ALIAS_TO_CITY = {alias: city for city, aliases in CITY_ALIASES.items() for alias in [city, *aliases]}
+
+# Longest aliases first so "navi mumbai" wins over "mumbai"
+_ALIAS_PATTERN = re.compile(
+    r'(?<!\w)(%s)(?!\w)' % '|'.join(re.escape(alias) for alias in sorted(ALIAS_TO_CITY, key=len, reverse=True))
+)
+
+
+def normalize(text):
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s\u0900-\u097F]', ' ', (text or '').lower())).strip()
+
+
+def city_key(location):
+    """Canonical city for a free-text location, or '' if it is empty."""
+    text = normalize(location)
+    if not text:
+        return ''
+    if text in ALIAS_TO_CITY:
+        return ALIAS_TO_CITY[text]
+    match = _ALIAS_PATTERN.search(text)
+    if match:
+        return ALIAS_TO_CITY[match.group(1)]
+    # Unknown city: "Sector 5, Bhilai" -> "bhilai"
+    parts = [normalize(part) for part in (location or '').split(',')]
+    return [part for part in parts if part][-1][:100]
+
+
+
+def backfill_city_keys(apps, schema_editor):
+    for model_name in ('MaidProfile', 'Profile'):
+        model = apps.get_model('main', model_name)
+        batch = []
+        for row in model.objects.only('id', 'location').iterator(chunk_size=500):
+            row.city_key = city_key(row.location)
+            batch.append(row)
+            if len(batch) == 500:
+                model.objects.bulk_update(batch, ['city_key'])
+                batch = []
+        model.objects.bulk_update(batch, ['city_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_maid_duplicate_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maidprofile',
+            name='city_key',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='city_key',
+            field=models.CharField(blank=True, db_index=True, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='maidprofile',
+            index=models.Index(fields=['city_key', 'status'], name='main_maidpr_city_ke_6809e8_idx'),
+        ),
+        migrations.RunPython(backfill_city_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_city_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.PositiveSmallIntegerField()),
+                ('comment', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='maidprofile',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='maidprofile',
+            name='rating_score',
+            field=models.FloatField(default=3.5),
+        ),
+        migrations.AddField(
+            model_name='maidprofile',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='maidprofile',
+            index=models.Index(fields=['status', '-rating_score'], name='main_maidpr_status_bdaf36_idx'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='booking',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='review', to='main.booking'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='customer',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='maid',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='main.maidprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['maid', '-created_at'], name='main_review_maid_id_f91089_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.CheckConstraint(condition=models.Q(('rating__gte', 1), ('rating__lte', 5)), name='main_review_rating_1_to_5'),
+        ),
+    ]
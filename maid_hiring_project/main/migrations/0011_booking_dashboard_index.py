@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_archive_tables'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['maid', 'status', 'service_date', 'id'], name='main_bookin_maid_id_494487_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_booking_dashboard_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='recurrence',
+            field=models.CharField(blank=True, choices=[('', 'One-time'), ('daily', 'Daily'), ('weekly', 'Weekly')], default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='recurrence_interval',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='recurrence_until',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='recurrence_weekdays',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_booking_recurrence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maidprofile',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_maid_status_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedmaidprofile',
+            name='reviews',
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -11,6 +11,8 @@ class Profile(models.Model):
     phone_number = models.CharField(max_length=15)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES)
     location = models.CharField(max_length=255, blank=True, null=True)
+    # Canonical city derived from location (see main/cities.py)
+    city_key = models.CharField(max_length=100, blank=True, db_index=True)
 
     def __str__(self):
         return self.user.username
@@ -21,6 +23,13 @@ class MaidProfile(models.Model):
         ('verified', 'Verified'),
         ('rejected', 'Rejected'),
     ]
+
+    # status -> statuses an admin can move it to (see main/moderation.py)
+    STATUS_TRANSITIONS = {
+        'pending': ('verified', 'rejected'),
+        'verified': ('rejected',),
+        'rejected': ('verified',),
+    }
     
     SKILL_CHOICES = [
         ('cleaning', 'Cleaning'),
@@ -42,10 +51,99 @@ class MaidProfile(models.Model):
     police_verification = models.FileField(upload_to='documents/police/')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped by every status transition; a transition only applies to the
+    # version it was loaded with
+    version = models.PositiveIntegerField(default=0)
+
+    # Normalized keys for duplicate detection (see main/dedupe.py)
+    phone_key = models.CharField(max_length=15, blank=True, db_index=True)
+    aadhaar_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    name_key = models.CharField(max_length=100, blank=True, db_index=True)
+    possible_duplicate = models.BooleanField(default=False, db_index=True)
+
+    # Canonical city derived from location (see main/cities.py)
+    city_key = models.CharField(max_length=100, blank=True)
+
+    # Review aggregates, updated with F() expressions by main/reviews.py.
+    # rating_score is a Bayesian average that starts at RATING_PRIOR_MEAN and
+    # moves towards the maid's own average as reviews come in.
+    RATING_PRIOR_MEAN = 3.5
+    RATING_PRIOR_WEIGHT = 5
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_score = models.FloatField(default=RATING_PRIOR_MEAN)
+
+    class Meta:
+        indexes = [
+            # Per-city listing snapshots: verified maids in one city
+            models.Index(fields=['city_key', 'status']),
+            # Rating sort and minimum-rating filter on the listing
+            models.Index(fields=['status', '-rating_score']),
+        ]
 
     def __str__(self):
         return self.name
 
+class MaidCard(models.Model):
+    """
+    Denormalized display data for a maid (see main/cards.py). Rebuilt on
+    every MaidProfile save so listing and profile pages only project it.
+    """
+    maid = models.OneToOneField(MaidProfile, on_delete=models.CASCADE, primary_key=True, related_name='card')
+    first_name = models.CharField(max_length=100)
+    display_name = models.CharField(max_length=100)
+    display_initial = models.CharField(max_length=1)
+    # {'en': ['Cooking', ...], 'hi': [...], 'mr': [...]}
+    skill_labels = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.display_name
+
+class MaidStatusEvent(models.Model):
+    """
+    Append-only history of MaidProfile.status. One row per change, written
+    in the same transaction as the save (see main/history.py).
+    """
+    maid = models.ForeignKey(MaidProfile, on_delete=models.CASCADE, related_name='status_events')
+    # Empty for the registration itself
+    from_status = models.CharField(max_length=20, choices=MaidProfile.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=MaidProfile.STATUS_CHOICES)
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['maid', 'created_at']),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Status events are append-only.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.maid_id}: {self.from_status or '-'} -> {self.to_status}"
+
+class VerificationDailyStats(models.Model):
+    """
+    Per-day rollup of MaidStatusEvent, updated with each event so the admin
+    dashboard reads one row per day instead of scanning the history.
+    """
+    date = models.DateField(unique=True)
+    registrations = models.PositiveIntegerField(default=0)
+    approvals = models.PositiveIntegerField(default=0)
+    rejections = models.PositiveIntegerField(default=0)
+    # Registration-to-verification time of each approval that day, sorted
+    verify_seconds = models.JSONField(default=list)
+
+    class Meta:
+        ordering = ['-date']
+
+    def __str__(self):
+        return str(self.date)
+
 class Booking(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -54,6 +152,12 @@ class Booking(models.Model):
         ('completed', 'Completed'),
     ]
 
+    RECURRENCE_CHOICES = [
+        ('', 'One-time'),
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+    ]
+
     customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bookings')
     maid = models.ForeignKey(MaidProfile, on_delete=models.CASCADE, related_name='bookings')
     service_date = models.DateField(help_text="When is the service required?", null=True, blank=True)
@@ -61,5 +165,137 @@ class Booking(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Recurrence rule; occurrences are computed, never stored (see main/recurrence.py)
+    recurrence = models.CharField(max_length=10, choices=RECURRENCE_CHOICES, default='', blank=True)
+    # Every N days (daily) or weeks (weekly)
+    recurrence_interval = models.PositiveSmallIntegerField(default=1)
+    # Weekly rules: bitmask of weekdays, Monday = 1; 0 means service_date's weekday
+    recurrence_weekdays = models.PositiveSmallIntegerField(default=0)
+    # Last possible date of a recurring booking; empty means it has no end
+    recurrence_until = models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Maid dashboard: one status, ordered by service date (main/bookings.py)
+            models.Index(fields=['maid', 'status', 'service_date', 'id']),
+        ]
+
     def __str__(self):
         return f"Booking: {self.customer.username} -> {self.maid.name} ({self.status})"
+
+class Conversation(models.Model):
+    """A message thread between one customer and one maid."""
+    customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='conversations')
+    maid = models.ForeignKey(MaidProfile, on_delete=models.CASCADE, related_name='conversations')
+    subject = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_message_at = models.DateTimeField(auto_now_add=True)
+    # When each side last opened the thread, for unread markers
+    customer_read_at = models.DateTimeField(null=True, blank=True)
+    maid_read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-last_message_at']
+        constraints = [
+            models.UniqueConstraint(fields=['customer', 'maid'], name='main_conversation_customer_maid_uniq'),
+        ]
+        indexes = [
+            # Inbox pages: a participant's threads, most recent first
+            models.Index(fields=['customer', '-last_message_at']),
+            models.Index(fields=['maid', '-last_message_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.customer.username} <-> {self.maid.name}"
+
+class Message(models.Model):
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='messages')
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='received_messages')
+    body = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['conversation', 'id']),
+            # "New messages for this user since id N" (live delivery)
+            models.Index(fields=['recipient', 'id']),
+            models.Index(fields=['sender', 'id']),
+        ]
+
+    def __str__(self):
+        return f"Message {self.pk} in conversation {self.conversation_id}"
+
+class Review(models.Model):
+    """A customer's rating of a maid, one per completed booking."""
+    # Kept when the booking is archived (see main/archive.py)
+    booking = models.OneToOneField(Booking, on_delete=models.SET_NULL, null=True, blank=True, related_name='review')
+    # Copied into ArchivedMaidProfile.reviews before an archived maid is deleted
+    maid = models.ForeignKey(MaidProfile, on_delete=models.CASCADE, related_name='reviews')
+    customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviews')
+    rating = models.PositiveSmallIntegerField()
+    comment = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.CheckConstraint(condition=models.Q(rating__gte=1, rating__lte=5), name='main_review_rating_1_to_5'),
+        ]
+        indexes = [
+            models.Index(fields=['maid', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.rating}/5 for {self.maid_id} (booking {self.booking_id})"
+
+class ArchivedMaidProfile(models.Model):
+    """
+    A rejected registration moved out of MaidProfile by the archive_records
+    command (see main/archive.py). Its documents are zipped under
+    MEDIA_ROOT/archive.
+    """
+    original_id = models.PositiveBigIntegerField(unique=True)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_maid_profiles')
+    name = models.CharField(max_length=100)
+    email = models.EmailField()
+    mobile_number = models.CharField(max_length=15)
+    location = models.CharField(max_length=255)
+    expected_salary = models.DecimalField(max_digits=10, decimal_places=2)
+    skills = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=MaidProfile.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    rejected_at = models.DateTimeField(null=True, blank=True)
+    # [[from_status, to_status, actor_id, ISO time], ...] oldest first
+    status_history = models.JSONField(default=list)
+    # [[booking_id, customer_id, rating, comment, ISO time], ...] oldest first
+    reviews = models.JSONField(default=list)
+    # Zip of the uploaded documents, relative to MEDIA_ROOT
+    documents = models.CharField(max_length=255, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-archived_at']
+
+    def __str__(self):
+        return f"{self.name} (archived {self.original_id})"
+
+class ArchivedBooking(models.Model):
+    """A booking moved out of Booking by the archive_records command."""
+    original_id = models.PositiveBigIntegerField(unique=True)
+    customer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_bookings')
+    # Not a foreign key: the maid may be archived too
+    maid_original_id = models.PositiveBigIntegerField(db_index=True)
+    maid_name = models.CharField(max_length=100)
+    service_date = models.DateField(null=True, blank=True)
+    message = models.TextField()
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Archived booking {self.original_id} ({self.status})"
@@ -0,0 +1,83 @@
+"""
+Maid moderation: status transitions with optimistic concurrency.
+
+A transition is one conditional UPDATE that only matches the row if it is
+still in the status and version the admin was shown, and bumps the version.
+When two admins act on the same registration, the second UPDATE matches
+nothing and raises TransitionConflict instead of overwriting the first
+decision. Everything that follows a status change (history event and
+rollup, counters, listing, match, autocomplete and user summary caches)
+runs only for the UPDATE that won, and notifications are up to the
+caller once transition() has returned.
+
+A queryset update() sends no signals, so maid_changed() is also what the
+MaidProfile post_save signal calls for ordinary saves.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from . import autocomplete, history, listings, metrics, recommendations, user_summary
+from .models import MaidProfile
+
+
+class TransitionConflict(Exception):
+    """The maid was moderated by someone else since it was loaded."""
+
+    def __init__(self, status):
+        super().__init__(f"Maid status changed concurrently (now {status!r})")
+        self.status = status
+
+
+def maid_changed(maid, created=False, old_status=None, old_city_key=None, old_location=None):
+    """Update counters and caches after a maid was saved with a new status or location."""
+    # Verified maids (or maids leaving/entering verified) affect matching
+    # and the listing snapshots of their old and new city
+    if maid.status == 'verified' or old_status == 'verified':
+        transaction.on_commit(lambda: recommendations.maid_changed(maid))
+        cities = {maid.city_key, old_city_key} - {None}
+        transaction.on_commit(lambda: [listings.invalidate_city(city) for city in cities])
+
+        old_verified_location = old_location if old_status == 'verified' else None
+        new_verified_location = maid.location if maid.status == 'verified' else None
+        if old_verified_location != new_verified_location:
+            transaction.on_commit(lambda: autocomplete.maid_changed(old_verified_location, new_verified_location))
+
+    if created:
+        metrics.adjust_maid_count(maid.status, 1)
+    elif old_status != maid.status:
+        metrics.adjust_maid_count(old_status, -1)
+        metrics.adjust_maid_count(maid.status, 1)
+
+
+def transition(maid, status, actor=None, expected_version=None):
+    """
+    Move a loaded maid to `status`, provided nobody has changed it since it
+    was loaded, or since `expected_version` if given (the version shown on
+    the admin's page). Returns False if it already has that status. Raises
+    TransitionConflict if another change got there first, and ValueError
+    for a transition MaidProfile.STATUS_TRANSITIONS does not allow.
+    """
+    if expected_version is not None and expected_version != maid.version:
+        raise TransitionConflict(maid.status)
+    from_status = maid.status
+    if status == from_status:
+        return False
+    if status not in MaidProfile.STATUS_TRANSITIONS.get(from_status, ()):
+        raise ValueError(f"Cannot move a maid from {from_status!r} to {status!r}")
+
+    with transaction.atomic():
+        updated = (
+            MaidProfile.objects.filter(pk=maid.pk, status=from_status, version=maid.version)
+            .update(status=status, version=F('version') + 1)
+        )
+        if not updated:
+            current = MaidProfile.objects.filter(pk=maid.pk).values_list('status', flat=True).first()
+            raise TransitionConflict(current)
+
+        maid.status = status
+        maid.version += 1
+        history.record_status_change(maid, from_status, actor)
+        maid_changed(maid, old_status=from_status, old_city_key=maid.city_key, old_location=maid.location)
+        user_summary.invalidate(maid.user_id)
+    maid._loaded_status = status
+    return True
@@ -0,0 +1,226 @@
+"""
+Maid-to-customer match scoring for the "Best match" sort.
+
+The verified catalogue is held in each worker as parallel NumPy arrays
+(skill bitmask, location code, salary), so a query scores every maid with a
+few vectorized operations and takes the top k with argpartition, without
+touching the database. Status changes in this process update the arrays
+in place. Changes made by other workers bump a version number in the cache,
+which makes this worker reload on its next query.
+
+NumPy is optional. Without it, `available()` is False and the listing keeps
+its default ordering.
+"""
+import threading
+
+from django.core.cache import cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .cards import skill_keys
+from .models import MaidProfile
+
+VERSION_KEY = 'recommendations:catalogue_version'
+
+SKILL_BITS = {key: 1 << i for i, (key, _label) in enumerate(MaidProfile.SKILL_CHOICES)}
+
+# Score weights
+SKILL_WEIGHT = 0.5
+LOCATION_WEIGHT = 0.3
+SALARY_WEIGHT = 0.2
+
+
+def available():
+    return np is not None
+
+
+def skill_mask(skills):
+    mask = 0
+    for key in skill_keys(skills):
+        mask |= SKILL_BITS.get(key, 0)
+    return mask
+
+
+def location_key(location):
+    return (location or '').strip().lower()
+
+
+class MatchCatalogue:
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.version = None
+        self._reset(self.INITIAL_CAPACITY)
+
+    def _reset(self, capacity):
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.skills = np.zeros(capacity, dtype=np.uint8)
+        self.locations = np.full(capacity, -1, dtype=np.int32)
+        self.salaries = np.zeros(capacity, dtype=np.float32)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.row_of = {}
+        self.free_rows = []
+        self.size = 0
+        self.location_codes = {}
+        # popcount of every possible uint8 mask
+        self.popcount = np.array([bin(i).count('1') for i in range(256)], dtype=np.float32)
+
+    def _location_code(self, location):
+        key = location_key(location)
+        code = self.location_codes.get(key)
+        if code is None:
+            code = self.location_codes[key] = len(self.location_codes)
+        return code
+
+    def _grow(self):
+        capacity = len(self.ids) * 2
+        for name in ('ids', 'skills', 'locations', 'salaries', 'active'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _put(self, maid_id, skills, location, salary):
+        row = self.row_of.get(maid_id)
+        if row is None:
+            if self.free_rows:
+                row = self.free_rows.pop()
+            else:
+                if self.size == len(self.ids):
+                    self._grow()
+                row = self.size
+                self.size += 1
+            self.row_of[maid_id] = row
+        self.ids[row] = maid_id
+        self.skills[row] = skill_mask(skills)
+        self.locations[row] = self._location_code(location)
+        self.salaries[row] = float(salary)
+        self.active[row] = True
+
+    def _drop(self, maid_id):
+        row = self.row_of.pop(maid_id, None)
+        if row is not None:
+            self.active[row] = False
+            self.free_rows.append(row)
+
+    def load(self):
+        """Rebuild from the database (one projected query)."""
+        rows = MaidProfile.objects.filter(status='verified').values_list(
+            'id', 'skills', 'location', 'expected_salary'
+        )
+        with self.lock:
+            self._reset(max(self.INITIAL_CAPACITY, len(rows)))
+            for maid_id, skills, location, salary in rows:
+                self._put(maid_id, skills, location, salary)
+            self.loaded = True
+            self.version = cache.get_or_set(VERSION_KEY, 0, None)
+
+    def ensure_fresh(self):
+        if not self.loaded or cache.get(VERSION_KEY) != self.version:
+            self.load()
+
+    def apply_change(self, maid, removed=False):
+        """Update one maid in place after a save/delete in this process."""
+        try:
+            new_version = cache.incr(VERSION_KEY)
+        except ValueError:
+            new_version = None
+        if not self.loaded:
+            return
+        with self.lock:
+            if maid.status == 'verified' and not removed:
+                self._put(maid.pk, maid.skills, maid.location, maid.expected_salary)
+            else:
+                self._drop(maid.pk)
+            # Only keep our arrays if nobody else changed the catalogue meanwhile
+            if new_version is not None and self.version is not None and new_version == self.version + 1:
+                self.version = new_version
+            else:
+                self.loaded = False
+
+    def top_k(self, k=50, skills=None, location=None, budget=None, min_salary=None, max_salary=None,
+              location_contains=None):
+        """
+        Ids of the k best matching verified maids, best first.
+
+        skills: comma separated skill keys the customer wants (also a hard
+        filter); location: customer location used for scoring;
+        location_contains: listing search text (hard filter, like icontains);
+        budget: target monthly salary (ignored unless positive).
+        """
+        self.ensure_fresh()
+        with self.lock:
+            n = self.size
+            wanted = skill_mask(skills)
+            candidates = self.active[:n].copy()
+            skills_arr = self.skills[:n]
+            salaries = self.salaries[:n]
+
+            if wanted:
+                candidates &= (skills_arr & wanted) == wanted
+            if min_salary is not None:
+                candidates &= salaries >= float(min_salary)
+            if max_salary is not None:
+                candidates &= salaries <= float(max_salary)
+            if location_contains:
+                needle = location_key(location_contains)
+                codes = [code for key, code in self.location_codes.items() if needle in key]
+                candidates &= np.isin(self.locations[:n], codes)
+
+            rows = np.flatnonzero(candidates)
+            if rows.size == 0:
+                return []
+
+            # Skill overlap with what the customer asked for (or breadth of
+            # skills when nothing specific was asked).
+            if wanted:
+                skill_score = self.popcount[skills_arr[rows] & wanted] / self.popcount[wanted]
+            else:
+                skill_score = self.popcount[skills_arr[rows]] / max(len(SKILL_BITS), 1)
+
+            location_code = self.location_codes.get(location_key(location)) if location else None
+            if location_code is None:
+                location_score = 0.0
+            else:
+                location_score = (self.locations[rows] == location_code).astype(np.float32)
+
+            budget = float(budget) if budget else 0.0
+            if budget > 0:
+                salary_score = 1.0 - np.minimum(np.abs(salaries[rows] - budget) / budget, 1.0)
+            else:
+                salary_score = 0.5
+
+            scores = SKILL_WEIGHT * skill_score + LOCATION_WEIGHT * location_score + SALARY_WEIGHT * salary_score
+            if np.ndim(scores) == 0:
+                scores = np.full(rows.size, scores, dtype=np.float32)
+
+            if rows.size > k:
+                best = np.argpartition(-scores, k - 1)[:k]
+            else:
+                best = np.arange(rows.size)
+            best = best[np.argsort(-scores[best], kind='stable')]
+            return self.ids[rows[best]].tolist()
+
+
+_catalogue = None
+_catalogue_lock = threading.Lock()
+
+
+def get_catalogue():
+    global _catalogue
+    if _catalogue is None:
+        with _catalogue_lock:
+            if _catalogue is None:
+                _catalogue = MatchCatalogue()
+    return _catalogue
+
+
+def maid_changed(maid, removed=False):
+    """Called from MaidProfile signals."""
+    if available():
+        get_catalogue().apply_change(maid, removed)
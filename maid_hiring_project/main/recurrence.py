@@ -0,0 +1,157 @@
+"""
+Recurring bookings.
+
+A booking stores its rule (daily or weekly, every `interval` days/weeks,
+optional weekdays, optional end date), never its occurrences. Every rule
+is a small set of arithmetic progressions of day numbers: "every 2 days"
+is one, "weekly on Mon and Thu" is two with a step of 7. From that:
+
+- occurrences() walks any date window lazily, jumping straight to the first
+  occurrence inside it, so asking about next year costs the same as asking
+  about next week.
+- first_conflict() decides whether two rules ever share a day with a gcd
+  check and the Chinese remainder theorem, without enumerating either.
+"""
+import heapq
+from collections import namedtuple
+from datetime import date, timedelta
+from math import gcd
+
+from django.db.models import Q
+from django.utils.formats import date_format
+from django.utils.translation import gettext as _, gettext_lazy
+
+WEEKDAY_NAMES = [
+    gettext_lazy('Mon'), gettext_lazy('Tue'), gettext_lazy('Wed'), gettext_lazy('Thu'),
+    gettext_lazy('Fri'), gettext_lazy('Sat'), gettext_lazy('Sun'),
+]
+
+Schedule = namedtuple('Schedule', ['start', 'recurrence', 'interval', 'weekdays', 'until'], defaults=['', 1, 0, None])
+Schedule.__doc__ = """
+start: first service date; recurrence: '' (one-off), 'daily' or 'weekly';
+interval: every N days/weeks; weekdays: bitmask (Monday = 1) for weekly
+rules, 0 meaning start's weekday; until: last possible date, or None.
+"""
+
+
+def schedule_of(booking):
+    """The Schedule of a Booking instance or a values() dict of its fields."""
+    get = booking.get if isinstance(booking, dict) else lambda name: getattr(booking, name)
+    return Schedule(
+        get('service_date'), get('recurrence'), get('recurrence_interval') or 1,
+        get('recurrence_weekdays'), get('recurrence_until'),
+    )
+
+
+def weekday_mask(days):
+    mask = 0
+    for day in days:
+        mask |= 1 << int(day)
+    return mask
+
+
+def weekday_list(mask):
+    return [day for day in range(7) if mask & (1 << day)]
+
+
+def progressions(schedule):
+    """(first day, step, last day or None) triples, as date ordinals."""
+    if schedule.start is None:
+        return []
+    first = schedule.start.toordinal()
+    last = schedule.until.toordinal() if schedule.until else None
+
+    if schedule.recurrence == 'daily':
+        result = [(first, schedule.interval, last)]
+    elif schedule.recurrence == 'weekly':
+        days = weekday_list(schedule.weekdays) or [schedule.start.weekday()]
+        step = 7 * schedule.interval
+        # First date on or after the start with each weekday
+        result = [(first + (day - schedule.start.weekday()) % 7, step, last) for day in days]
+    else:
+        return [(first, 1, first)]
+    return [(start, step, end) for start, step, end in result if end is None or start <= end]
+
+
+def _walk(first, step, last, window_start, window_end):
+    if window_start > first:
+        # Jump to the first occurrence inside the window
+        first += -((first - window_start) // step) * step
+    end = window_end if last is None else min(last, window_end)
+    for day in range(first, end + 1, step):
+        yield day
+
+
+def occurrences(schedule, start, end):
+    """Dates of the schedule between start and end (inclusive), in order, generated lazily."""
+    walks = [_walk(*p, start.toordinal(), end.toordinal()) for p in progressions(schedule)]
+    previous = None
+    for day in heapq.merge(*walks):
+        if day != previous:
+            yield date.fromordinal(day)
+        previous = day
+
+
+def next_occurrence(schedule, on_or_after):
+    return next(occurrences(schedule, on_or_after, date.max - timedelta(days=1)), None)
+
+
+def _first_common_day(a, b):
+    """Smallest day in both progressions, or None."""
+    (first_a, step_a, last_a), (first_b, step_b, last_b) = a, b
+    divisor = gcd(step_a, step_b)
+    if (first_b - first_a) % divisor:
+        return None
+    # x = first_a + step_a * k with x = first_b (mod step_b)
+    modulus = step_b // divisor
+    k = ((first_b - first_a) // divisor * pow(step_a // divisor, -1, modulus)) % modulus if modulus > 1 else 0
+    day = first_a + step_a * k
+    period = step_a * modulus  # lcm
+
+    lowest = max(first_a, first_b)
+    if day < lowest:
+        day += -((day - lowest) // period) * period
+    ends = [last for last in (last_a, last_b) if last is not None]
+    if ends and day > min(ends):
+        return None
+    return day
+
+
+def first_conflict(a, b):
+    """First date on which Schedules a and b both have an occurrence, or None."""
+    days = [
+        day for day in (_first_common_day(p, q) for p in progressions(a) for q in progressions(b))
+        if day is not None
+    ]
+    return date.fromordinal(min(days)) if days else None
+
+
+def active_filter(start, end=None):
+    """Q for bookings that may have an occurrence between start and end (None: open-ended)."""
+    still_running = Q(recurrence='', service_date__gte=start) | (
+        ~Q(recurrence='') & (Q(recurrence_until__isnull=True) | Q(recurrence_until__gte=start))
+    )
+    if end is not None:
+        still_running &= Q(service_date__lte=end)
+    return still_running
+
+
+def describe(schedule):
+    if not schedule.recurrence:
+        return ''
+    if schedule.recurrence == 'daily':
+        if schedule.interval == 1:
+            text = _("Every day")
+        else:
+            text = _("Every %(count)s days") % {'count': schedule.interval}
+    else:
+        days = ', '.join(
+            str(WEEKDAY_NAMES[day]) for day in weekday_list(schedule.weekdays) or [schedule.start.weekday()]
+        )
+        if schedule.interval == 1:
+            text = _("Weekly on %(days)s") % {'days': days}
+        else:
+            text = _("Every %(count)s weeks on %(days)s") % {'count': schedule.interval, 'days': days}
+    if schedule.until:
+        text += ' ' + _("until %(date)s") % {'date': date_format(schedule.until)}
+    return text
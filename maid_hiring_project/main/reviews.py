@@ -0,0 +1,53 @@
+"""
+Reviews of completed bookings.
+
+Each review updates the maid's rating_count, rating_sum and rating_score in
+one UPDATE built from F() expressions, in the same transaction as the
+review insert. Concurrent reviews therefore never lose an increment, and
+the listing can filter and sort on the indexed rating_score instead of
+averaging the reviews table on every request.
+"""
+from django.db import transaction
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+
+from . import listings
+from .models import MaidProfile, Review
+
+PRIOR_TOTAL = MaidProfile.RATING_PRIOR_MEAN * MaidProfile.RATING_PRIOR_WEIGHT
+
+
+class ReviewNotAllowed(Exception):
+    pass
+
+
+def can_review(booking, user):
+    return (
+        booking.customer_id == user.pk
+        and booking.status == 'completed'
+        and not Review.objects.filter(booking=booking).exists()
+    )
+
+
+def submit_review(booking, user, rating, comment=''):
+    """Store the review and fold it into the maid's aggregates."""
+    if not can_review(booking, user):
+        raise ReviewNotAllowed("Only the customer of a completed booking can review it, once.")
+
+    with transaction.atomic():
+        review = Review.objects.create(
+            booking=booking, maid_id=booking.maid_id, customer=user, rating=rating, comment=comment,
+        )
+        # Every F() on the right-hand side reads the row's pre-update values
+        MaidProfile.objects.filter(pk=booking.maid_id).update(
+            rating_count=F('rating_count') + 1,
+            rating_sum=F('rating_sum') + rating,
+            rating_score=ExpressionWrapper(
+                (Value(PRIOR_TOTAL) + F('rating_sum') + rating)
+                / (Value(float(MaidProfile.RATING_PRIOR_WEIGHT)) + F('rating_count') + 1),
+                output_field=FloatField(),
+            ),
+        )
+        # update() skips the save signals, so refresh the city listing here
+        city = MaidProfile.objects.filter(pk=booking.maid_id).values_list('city_key', flat=True).first()
+        transaction.on_commit(lambda: listings.invalidate_city(city or ''))
+    return review
@@ -0,0 +1,110 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from . import autocomplete, dedupe, history, listings, metrics, moderation, recommendations, user_summary
+from .cards import refresh_card
+from .cities import city_key
+from .models import Booking, MaidProfile, Message, Profile
+
+
+@receiver(post_init, sender=MaidProfile)
+def remember_maid_status(sender, instance, **kwargs):
+    # Keep the loaded values so post_save can tell what changed without
+    # another query. Read __dict__ directly so deferred fields stay deferred.
+    instance._loaded_status = instance.__dict__.get('status')
+    instance._loaded_card_source = (instance.__dict__.get('name'), instance.__dict__.get('skills'))
+    instance._loaded_city_key = instance.__dict__.get('city_key')
+    instance._loaded_location = instance.__dict__.get('location')
+
+
+# Must be connected before update_maid_counters, which resets _loaded_status
+@receiver(post_save, sender=MaidProfile)
+def record_status_history(sender, instance, created, **kwargs):
+    actor = getattr(instance, '_status_actor', None)
+    if created:
+        history.record_status_change(instance, None, actor)
+    elif instance._loaded_status not in (None, instance.status):
+        history.record_status_change(instance, instance._loaded_status, actor)
+
+
+@receiver(post_save, sender=MaidProfile)
+def update_maid_counters(sender, instance, created, **kwargs):
+    moderation.maid_changed(
+        instance, created,
+        old_status=instance._loaded_status,
+        old_city_key=instance._loaded_city_key,
+        old_location=instance._loaded_location,
+    )
+    instance._loaded_status = instance.status
+    instance._loaded_city_key = instance.city_key
+    instance._loaded_location = instance.location
+
+
+@receiver(post_delete, sender=MaidProfile)
+def release_maid_counters(sender, instance, **kwargs):
+    metrics.adjust_maid_count(instance._loaded_status, -1)
+    if instance._loaded_status == 'verified':
+        transaction.on_commit(lambda: recommendations.maid_changed(instance, removed=True))
+        transaction.on_commit(lambda: listings.invalidate_city(instance._loaded_city_key or ''))
+        transaction.on_commit(lambda: autocomplete.maid_changed(old_location=instance._loaded_location))
+
+
+@receiver(post_save, sender=MaidProfile)
+def update_maid_card(sender, instance, created, **kwargs):
+    card_source = (instance.name, instance.skills)
+    if created or card_source != instance._loaded_card_source:
+        refresh_card(instance)
+    instance._loaded_card_source = card_source
+
+
+@receiver(pre_save, sender=MaidProfile)
+def fill_duplicate_keys(sender, instance, **kwargs):
+    dedupe.fill_keys(instance)
+
+
+@receiver(post_save, sender=MaidProfile)
+def flag_possible_duplicate(sender, instance, created, **kwargs):
+    # Only new registrations are checked; admins see live matches on the detail page
+    if created and dedupe.find_candidates(instance):
+        MaidProfile.objects.filter(pk=instance.pk).update(possible_duplicate=True)
+        instance.possible_duplicate = True
+
+
+@receiver(pre_save, sender=MaidProfile)
+@receiver(pre_save, sender=Profile)
+def fill_city_key(sender, instance, **kwargs):
+    instance.city_key = city_key(instance.location)
+
+
+# Admin user summaries (see main/user_summary.py)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_summary(sender, instance, **kwargs):
+    user_summary.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_save, sender=MaidProfile)
+@receiver(post_delete, sender=MaidProfile)
+def forget_owner_summary(sender, instance, **kwargs):
+    user_summary.invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def forget_booking_summaries(sender, instance, **kwargs):
+    if Booking.maid.is_cached(instance):
+        # Usually loaded already (form views set it, cascades pass it in)
+        user_summary.invalidate(instance.customer_id, instance.maid.user_id)
+    else:
+        user_summary.invalidate(instance.customer_id)
+        user_summary.invalidate_maid(instance.maid_id)
+
+
+@receiver(post_save, sender=Message)
+@receiver(post_delete, sender=Message)
+def forget_message_summaries(sender, instance, **kwargs):
+    user_summary.invalidate(instance.sender_id, instance.recipient_id)
@@ -0,0 +1,47 @@
+"""
+Static file view for deployments without a separate web server in front.
+
+Serves files from STATIC_ROOT, picks the precompressed .br/.gz copy written
+by build_assets when the client accepts it, and marks content-hashed files
+as immutable so browsers never revalidate them.
+"""
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+
+from .assets import is_hashed
+from .compression import accepted_encodings
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+SHORT_LIVED = 'public, max-age=300'
+
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def serve_static(request, path):
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Invalid path")
+    if not os.path.isfile(full_path):
+        raise Http404("File not found")
+
+    content_type, _encoding = mimetypes.guess_type(full_path)
+    accepted = accepted_encodings(request.headers.get('Accept-Encoding'))
+    served_path, content_encoding = full_path, None
+    for encoding, suffix in ENCODINGS:
+        if encoding in accepted and os.path.isfile(full_path + suffix):
+            served_path, content_encoding = full_path + suffix, encoding
+            break
+
+    response = FileResponse(open(served_path, 'rb'), content_type=content_type or 'application/octet-stream')
+    if content_encoding:
+        response['Content-Encoding'] = content_encoding
+    response['Cache-Control'] = IMMUTABLE if is_hashed(path) else SHORT_LIVED
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
@@ -0,0 +1,58 @@
+from urllib.parse import quote, urljoin
+
+from django import template
+from django.templatetags.static import PrefixNode, static
+from django.utils.html import format_html, format_html_join
+
+from main.assets import load_manifest
+
+register = template.Library()
+
+DEFAULT_SIZES = '(min-width: 992px) 50vw, 100vw'
+
+
+def _built_url(name):
+    # Names in the manifest are already content-hashed, so bypass the
+    # staticfiles storage lookup.
+    return urljoin(PrefixNode.handle_simple('STATIC_URL'), quote(name))
+
+
+def _srcset(variants):
+    return ', '.join(f"{_built_url(name)} {width}w" for name, width in variants)
+
+
+@register.simple_tag
+def responsive_image(name, alt='', css_class='', style='', sizes=DEFAULT_SIZES, loading='lazy', fetchpriority=''):
+    """
+    <picture> with AVIF/WebP srcsets from the build_assets manifest, falling
+    back to a plain <img> of the original file when no variants were built.
+    """
+    entry = load_manifest().get(name)
+    extra = format_html(' fetchpriority="{}"', fetchpriority) if fetchpriority else ''
+    if not entry:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" style="{}" loading="{}" decoding="async"{}>',
+            static(name), alt, css_class, style, loading, extra,
+        )
+
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((mime_type, _srcset(variants), sizes) for mime_type, variants in entry['sources'].items()),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" alt="{}" class="{}" style="{}" width="{}" height="{}" loading="{}" decoding="async"{}></picture>',
+        sources, _built_url(entry['fallback']), alt, css_class, style, entry['width'], entry['height'], loading, extra,
+    )
+
+
+@register.simple_tag
+def preload_image(name, sizes=DEFAULT_SIZES):
+    """<link rel=preload> for the preferred responsive variant of a hero image."""
+    entry = load_manifest().get(name)
+    if not entry or not entry['sources']:
+        return format_html('<link rel="preload" as="image" href="{}">', static(name))
+    mime_type, variants = next(iter(entry['sources'].items()))
+    return format_html(
+        '<link rel="preload" as="image" type="{}" imagesrcset="{}" imagesizes="{}">',
+        mime_type, _srcset(variants), sizes,
+    )
@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+
+from main.models import Booking, MaidProfile, Profile
+
+
+def make_user(email, role='customer', **extra):
+    user = User.objects.create_user(username=email, email=email, password='password', **extra)
+    Profile.objects.create(user=user, full_name=email.split('@')[0], phone_number='9876543210', role=role, location='Mumbai')
+    return user
+
+
+def make_maid(email, status='verified', **fields):
+    # Document names without files: the duplicate-key hashing skips them
+    values = {
+        'name': 'Sita Devi', 'mobile_number': '9876543210', 'location': 'Andheri, Mumbai',
+        'expected_salary': 8000, 'skills': 'cleaning, cooking',
+        'aadhaar_document': 'documents/aadhaar/missing.pdf',
+        'police_verification': 'documents/police/missing.pdf',
+        **fields,
+    }
+    return MaidProfile.objects.create(user=make_user(email, role='maid'), email=email, status=status, **values)
+
+
+def make_bookings(maid, customer, count, **fields):
+    return Booking.objects.bulk_create(
+        Booking(maid=maid, customer=customer, **{'message': f'Booking {number}', **fields}) for number in range(count)
+    )
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from main import bookings, recurrence
+from main.models import MaidProfile
+
+from .factories import make_bookings, make_maid, make_user
+
+
+class MaidDashboardQueryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.maid = make_maid('maid@example.com')
+        self.customer = make_user('customer@example.com')
+        self.client.force_login(self.maid.user)
+
+    def queries_for(self, tab):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('maid_bookings'), {'tab': tab})
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_bookings(self):
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        make_bookings(self.maid, self.customer, 3, service_date=tomorrow)
+        make_bookings(self.maid, self.customer, 2, service_date=tomorrow, status='accepted')
+        self.queries_for('pending')  # caches filled by the first request
+        few = {tab: self.queries_for(tab) for tab in ('pending', 'upcoming', 'accepted')}
+
+        make_bookings(self.maid, self.customer, 60, service_date=tomorrow)
+        make_bookings(self.maid, self.customer, 60, service_date=tomorrow, status='accepted')
+        many = {tab: self.queries_for(tab) for tab in ('pending', 'upcoming', 'accepted')}
+
+        self.assertEqual(few, many)
+        # Session, user, maid, counts and one page of bookings with their customers
+        self.assertEqual(many['pending'], 6)
+
+
+class AvailabilityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.customer = make_user('customer@example.com')
+        self.start = timezone.localdate() + timedelta(days=7)
+        self.busy = make_maid('busy@example.com')
+        self.free = make_maid('free@example.com')
+        make_bookings(self.busy, self.customer, 1, service_date=self.start, status='accepted')
+
+    def test_busy_maids_only_checks_the_given_maids(self):
+        schedule = recurrence.Schedule(self.start)
+        self.assertEqual(bookings.busy_maids(schedule, [self.busy.pk, self.free.pk]), {self.busy.pk})
+        self.assertEqual(bookings.busy_maids(schedule, [self.free.pk]), set())
+
+    def test_busy_maids_looks_ahead_to_the_horizon(self):
+        later = self.start + bookings.AVAILABILITY_HORIZON + timedelta(days=1)
+        make_bookings(self.free, self.customer, 1, service_date=later, status='accepted')
+        daily = recurrence.Schedule(self.start - timedelta(days=1), 'daily')
+        self.assertEqual(bookings.busy_maids(daily, MaidProfile.objects.values('id')), {self.busy.pk})
+
+    def test_booking_a_taken_date_is_refused(self):
+        self.client.force_login(self.customer)
+        response = self.client.post(
+            reverse('book_maid', args=[self.busy.pk]),
+            {'service_date': self.start.isoformat(), 'recurrence': '', 'recurrence_interval': 1, 'message': 'Hello'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].non_field_errors())
+        self.assertEqual(self.busy.bookings.count(), 1)
+
+    def test_accepting_a_clashing_booking_is_refused(self):
+        [pending] = make_bookings(self.busy, self.customer, 1, service_date=self.start)
+        self.client.force_login(self.busy.user)
+        self.client.post(reverse('respond_to_booking', args=[pending.pk, 'accept']))
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, 'pending')
+
+    def test_booking_without_a_date_can_be_accepted(self):
+        [undated] = make_bookings(self.busy, self.customer, 1, service_date=None)
+        self.assertIsNone(bookings.first_clash(self.busy.pk, recurrence.Schedule(None)))
+        self.assertEqual(bookings.busy_maids(recurrence.Schedule(None), [self.busy.pk]), set())
+
+        self.client.force_login(self.busy.user)
+        self.client.post(reverse('respond_to_booking', args=[undated.pk, 'accept']))
+        undated.refresh_from_db()
+        self.assertEqual(undated.status, 'accepted')
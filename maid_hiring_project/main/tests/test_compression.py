@@ -0,0 +1,115 @@
+import gzip
+import os
+
+from asgiref.sync import async_to_sync
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from main.compression import strip_whitespace
+from main.middleware import CompressionMiddleware
+
+INDENTED_HTML = b'<html>\n    <body>\n        <p>Hello</p>\n    </body>\n</html>\n'
+
+
+class StripWhitespaceTests(SimpleTestCase):
+    def test_strips_indentation(self):
+        self.assertEqual(strip_whitespace(INDENTED_HTML), b'<html>\n<body>\n<p>Hello</p>\n</body>\n</html>\n')
+
+    def test_keeps_blank_lines(self):
+        # Message bodies are shown with white-space: pre-line
+        html = b'<div style="white-space: pre-line;">Hello,\n\n    see you at 9.\r\n\r\nThanks</div>\n\n    <p>'
+        self.assertEqual(strip_whitespace(html), b'<div style="white-space: pre-line;">Hello,\n\nsee you at 9.\n\nThanks</div>\n\n<p>')
+
+    def test_keeps_preformatted_script_and_style_blocks(self):
+        for block in (
+            b'<pre>\n    a\n        b\n</pre>',
+            b'<textarea name="t">\n    a\n</textarea>',
+            b'<script>\n    const text = `\n        two\n    `;\n</script>',
+            b'<style>\n    p {\n        margin: 0;\n    }\n</style>',
+        ):
+            with self.subTest(block=block):
+                self.assertIn(block, strip_whitespace(b'<div>\n    ' + block + b'\n    </div>'))
+
+
+@override_settings(STRIP_HTML_WHITESPACE=True, COMPRESSION_MIN_SIZE=512)
+class CompressionMiddlewareTests(SimpleTestCase):
+    """Content-Length must match the body sent on every branch."""
+
+    def run_middleware(self, response, accept_encoding='gzip'):
+        # CommonMiddleware sets Content-Length before this middleware sees the response
+        if not response.streaming:
+            response.headers['Content-Length'] = str(len(response.content))
+        request = RequestFactory().get('/', headers={'accept-encoding': accept_encoding} if accept_encoding else {})
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def assertContentLengthMatches(self, response):
+        self.assertEqual(int(response.headers['Content-Length']), len(response.content))
+
+    def test_not_compressible(self):
+        response = self.run_middleware(HttpResponse(b'\x89PNG' * 300, content_type='image/png'))
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.content, b'\x89PNG' * 300)
+        self.assertContentLengthMatches(response)
+
+    def test_stripped_without_accepted_encoding(self):
+        response = self.run_middleware(HttpResponse(INDENTED_HTML * 50), accept_encoding=None)
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.content, strip_whitespace(INDENTED_HTML * 50))
+        self.assertContentLengthMatches(response)
+
+    def test_stripped_below_min_size(self):
+        response = self.run_middleware(HttpResponse(INDENTED_HTML))
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.content, strip_whitespace(INDENTED_HTML))
+        self.assertContentLengthMatches(response)
+
+    def test_stripped_but_compression_not_smaller(self):
+        html = b'<p>\n    ' + os.urandom(2000).hex().encode() + b'\n</p>'
+        with override_settings(COMPRESSION_GZIP_LEVEL=0):
+            response = self.run_middleware(HttpResponse(html))
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.content, strip_whitespace(html))
+        self.assertContentLengthMatches(response)
+
+    def test_compressed(self):
+        response = self.run_middleware(HttpResponse(INDENTED_HTML * 50, headers={'ETag': '"abc"'}))
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), strip_whitespace(INDENTED_HTML * 50))
+        self.assertContentLengthMatches(response)
+        self.assertEqual(response.headers['ETag'], 'W/"abc"')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+
+    def test_streaming(self):
+        chunks = [b'{"row": %d}\n' % number for number in range(100)]
+        response = self.run_middleware(StreamingHttpResponse(iter(chunks), content_type='application/json'))
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response.headers)
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b''.join(chunks))
+
+    @override_settings(COMPRESSION_STREAM_BUFFER=400)
+    def test_streaming_buffers_small_chunks(self):
+        chunks = [b'{"row": %d}\n' % number for number in range(100)]
+        response = self.run_middleware(StreamingHttpResponse(iter(chunks), content_type='application/json'))
+        parts = list(response.streaming_content)
+        # 1190 bytes of rows: two flushes of at least 400 bytes, then the rest
+        self.assertEqual(len(parts), 3)
+        self.assertEqual(gzip.decompress(b''.join(parts)), b''.join(chunks))
+
+    def test_async_streaming(self):
+        async def rows():
+            for number in range(100):
+                yield b'{"row": %d}\n' % number
+
+        async def body(response):
+            return b''.join([part async for part in response.streaming_content])
+
+        response = self.run_middleware(StreamingHttpResponse(rows(), content_type='application/json'))
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        expected = b''.join(b'{"row": %d}\n' % number for number in range(100))
+        self.assertEqual(gzip.decompress(async_to_sync(body)(response)), expected)
+
+    def test_event_stream_untouched(self):
+        response = self.run_middleware(StreamingHttpResponse(iter([b'data: 1\n\n']), content_type='text/event-stream'))
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(b''.join(response.streaming_content), b'data: 1\n\n')
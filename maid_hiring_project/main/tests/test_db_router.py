@@ -0,0 +1,28 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.test import SimpleTestCase
+
+from core import db_router
+from main.models import MaidProfile
+
+
+@mock.patch('core.db_router.replica_configured', return_value=True)
+class ReplicaRouterTests(SimpleTestCase):
+    def route(self, model, read_only=True):
+        state = db_router.RoutingState()
+        state.read_only = read_only
+        token = db_router._routing_state.set(state)
+        try:
+            return db_router.ReplicaRouter().db_for_read(model)
+        finally:
+            db_router._routing_state.reset(token)
+
+    def test_main_models_read_from_replica(self, _configured):
+        self.assertEqual(self.route(MaidProfile), db_router.REPLICA_ALIAS)
+        self.assertEqual(self.route(MaidProfile, read_only=False), db_router.PRIMARY_ALIAS)
+
+    def test_sessions_and_auth_stay_on_primary(self, _configured):
+        self.assertEqual(self.route(Session), db_router.PRIMARY_ALIAS)
+        self.assertEqual(self.route(User), db_router.PRIMARY_ALIAS)
@@ -0,0 +1,26 @@
+import csv
+import io
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .factories import make_bookings, make_maid, make_user
+
+
+class CsvExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.maid = make_maid('maid@example.com', name='@SUM(A1:A9)', location='-2+3')
+        self.customer = make_user('customer@example.com')
+        make_bookings(self.maid, self.customer, 1, message='=HYPERLINK("http://example.com")')
+        self.client.force_login(make_user('admin@example.com', is_staff=True))
+
+    def test_formula_like_cells_are_quoted(self):
+        response = self.client.get(reverse('admin_export_bookings'))
+        [header, row] = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        row = dict(zip(header, row))
+        self.assertEqual(row['maid_name'], "'@SUM(A1:A9)")
+        self.assertEqual(row['maid_location'], "'-2+3")
+        self.assertEqual(row['message'], "'=HYPERLINK(\"http://example.com\")")
+        self.assertEqual(row['customer_email'], 'customer@example.com')
@@ -0,0 +1,36 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .factories import make_maid, make_user
+
+
+class MaidListParameterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cheap = make_maid('cheap@example.com', expected_salary=6000)
+        self.dear = make_maid('dear@example.com', expected_salary=12000)
+        self.client.force_login(make_user('customer@example.com'))
+
+    def listed(self, **params):
+        response = self.client.get(reverse('maid_list'), params)
+        self.assertEqual(response.status_code, 200)
+        return {maid['id'] for maid in response.context['maids']}
+
+    def test_unparseable_salaries_are_ignored(self):
+        everyone = {self.cheap.pk, self.dear.pk}
+        for sort in ('best', 'rating', ''):
+            with self.subTest(sort=sort):
+                self.assertEqual(self.listed(sort=sort, min_salary='abc'), everyone)
+                self.assertEqual(self.listed(sort=sort, max_salary='NaN', location='Mumbai'), everyone)
+
+    def test_zero_budget_is_no_budget(self):
+        self.assertEqual(self.listed(sort='best', max_salary='0'), set())
+        self.assertEqual(self.listed(sort='best', min_salary='0'), {self.cheap.pk, self.dear.pk})
+        self.assertEqual(self.listed(sort='best', min_salary='-5', max_salary='7000'), {self.cheap.pk})
+
+    def test_city_search_includes_cities_named_after_it(self):
+        navi = make_maid('navi@example.com', location='Vashi, Navi Mumbai')
+        self.assertEqual(self.listed(location='Mumbai'), {self.cheap.pk, self.dear.pk, navi.pk})
+        self.assertEqual(self.listed(location='Navi Mumbai'), {navi.pk})
+        self.assertEqual(self.listed(location='Andheri, Mumbai'), {self.cheap.pk, self.dear.pk})
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from main import messaging
+
+from .factories import make_maid, make_user
+
+
+@override_settings(MESSAGE_WATCH_INTERVAL=0.01)
+class LiveMessageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.customer = make_user('customer@example.com')
+        self.maid = make_maid('maid@example.com')
+        self.conversation = messaging.start_conversation(self.customer, self.maid)
+
+    def post(self, body):
+        with self.captureOnCommitCallbacks(execute=True):
+            return messaging.post_message(self.conversation, self.maid.user, body)
+
+    async def connected(self, count=1):
+        while messaging.hub.connection_count() < count:
+            await asyncio.sleep(0.01)
+
+    async def test_stream_frames_new_messages_as_events(self):
+        await self.async_client.aforce_login(self.customer)
+        response = await self.async_client.get(reverse('message_stream'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+        # The stream subscribes, finds nothing new and waits for a wake-up
+        first = asyncio.ensure_future(anext(stream))
+        await self.connected()
+        message = await sync_to_async(self.post)('Can you start on Monday?')
+        frame = (await asyncio.wait_for(first, 5)).decode()
+
+        # A disconnect cancels the pending read, like the ASGI handler does
+        waiting = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+
+        header, data = frame.split('\ndata: ')
+        self.assertEqual(header, f'id: {message.pk}\nevent: message')
+        self.assertTrue(data.endswith('\n\n'))
+        self.assertEqual(json.loads(data)['body'], 'Can you start on Monday?')
+        self.assertEqual(json.loads(data)['sender'], self.maid.user.pk)
+        self.assertEqual(messaging.hub.connection_count(), 0)
+
+    @override_settings(MESSAGE_POLL_TIMEOUT=0.05)
+    async def test_poll_times_out_without_messages(self):
+        await self.async_client.aforce_login(self.customer)
+        response = await self.async_client.get(reverse('message_poll'), {'after': 0})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'messages': [], 'last_id': 0})
+
+    async def test_poll_returns_when_a_message_arrives(self):
+        await self.async_client.aforce_login(self.customer)
+        poll = asyncio.ensure_future(self.async_client.get(reverse('message_poll'), {'after': 0}))
+        await self.connected()
+        message = await sync_to_async(self.post)('On my way')
+        response = await asyncio.wait_for(poll, 5)
+        self.assertEqual(response.json()['last_id'], message.pk)
+        self.assertEqual([row['body'] for row in response.json()['messages']], ['On my way'])
+
+    def test_wsgi_fallback_answers_at_once(self):
+        self.client.force_login(self.customer)
+        self.assertEqual(self.client.get(reverse('message_stream')).status_code, 204)
+
+        # Nothing new: the poll still returns straight away, with a retry hint
+        response = self.client.get(reverse('message_poll'), {'after': 0})
+        self.assertEqual(response.json(), {'messages': [], 'last_id': 0, 'retry_after': 10})
+        self.assertEqual(messaging.hub.connection_count(), 0)
+
+        message = self.post('Hello')
+        response = self.client.get(reverse('message_poll'), {'after': 0})
+        self.assertEqual(response.json()['last_id'], message.pk)
@@ -0,0 +1,18 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+@override_settings(DEBUG=False, INTERNAL_IPS=['127.0.0.1'])
+class MetricsAccessTests(TestCase):
+    @override_settings(METRICS_TOKEN=None)
+    def test_without_token_only_internal_ips(self):
+        self.assertEqual(self.client.get(reverse('metrics'), REMOTE_ADDR='127.0.0.1').status_code, 200)
+        self.assertEqual(self.client.get(reverse('metrics'), REMOTE_ADDR='203.0.113.5').status_code, 404)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_with_token_any_address(self):
+        self.assertEqual(self.client.get(reverse('metrics'), REMOTE_ADDR='203.0.113.5').status_code, 401)
+        response = self.client.get(
+            reverse('metrics'), REMOTE_ADDR='203.0.113.5', headers={'authorization': 'Bearer secret'},
+        )
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,52 @@
+from django.contrib.messages import get_messages
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from main import metrics, moderation
+from main.models import MaidProfile, MaidStatusEvent
+
+from .factories import make_maid, make_user
+
+
+class TransitionConflictTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.maid = make_maid('maid@example.com', status='pending')
+        self.admin = make_user('admin@example.com', is_staff=True)
+
+    def test_losing_transition_changes_nothing(self):
+        first = MaidProfile.objects.get(pk=self.maid.pk)
+        second = MaidProfile.objects.get(pk=self.maid.pk)
+        metrics.prime_maid_counts()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(moderation.transition(first, 'verified', actor=self.admin))
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(moderation.TransitionConflict) as conflict:
+                moderation.transition(second, 'rejected', actor=self.admin)
+
+        self.assertEqual(conflict.exception.status, 'verified')
+        self.assertEqual(callbacks, [])
+        self.maid.refresh_from_db()
+        self.assertEqual((self.maid.status, self.maid.version), ('verified', 1))
+        # Besides the registration's own 'pending' event
+        decisions = MaidStatusEvent.objects.filter(maid=self.maid).exclude(to_status='pending')
+        self.assertEqual(list(decisions.values_list('to_status', flat=True)), ['verified'])
+        counts = metrics.get_maid_counts()
+        self.assertEqual((counts['pending'], counts['verified'], counts['rejected']), (0, 1, 0))
+
+    def test_stale_admin_page_is_refused(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            moderation.transition(MaidProfile.objects.get(pk=self.maid.pk), 'verified', actor=self.admin)
+
+        self.client.force_login(self.admin)
+        # The page was rendered before the approval, at version 0
+        response = self.client.post(reverse('reject_maid', args=[self.maid.pk]), {'version': 0})
+
+        self.assertRedirects(response, reverse('admin_maid_detail', args=[self.maid.pk]), fetch_redirect_response=False)
+        self.assertIn('updated by another admin', str(list(get_messages(response.wsgi_request))[0]))
+        self.maid.refresh_from_db()
+        self.assertEqual(self.maid.status, 'verified')
+        self.assertEqual(mail.outbox, [])
@@ -0,0 +1,20 @@
+import warnings
+
+from django.core.cache import CacheKeyWarning, cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+@override_settings(RATELIMIT_ENABLED=True)
+class RateLimitKeyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_submitted_value_is_not_used_raw_in_cache_keys(self):
+        email = 'a b\x01' + 'x' * 300 + '@example.com'
+        with warnings.catch_warnings():
+            # Keys memcached would refuse (spaces, control characters, over 250 bytes)
+            warnings.simplefilter('error', CacheKeyWarning)
+            for _ in range(6):
+                response = self.client.post(reverse('login'), {'email': email, 'password': 'wrong'})
+        self.assertEqual(response.status_code, 429)
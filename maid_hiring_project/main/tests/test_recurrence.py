@@ -0,0 +1,70 @@
+import random
+from datetime import date, timedelta
+
+from django.test import SimpleTestCase
+
+from main import recurrence
+from main.recurrence import Schedule
+
+WINDOW_START = date(2026, 1, 1)
+WINDOW_END = date(2027, 6, 30)
+
+
+def brute_force_dates(schedule, start=WINDOW_START, end=WINDOW_END):
+    """Every date of the schedule in [start, end], found by checking each day."""
+    if schedule.recurrence == 'weekly':
+        weekdays = recurrence.weekday_list(schedule.weekdays) or [schedule.start.weekday()]
+        # The first date on or after the start with each weekday, then every `interval` weeks
+        firsts = [schedule.start + timedelta(days=(day - schedule.start.weekday()) % 7) for day in weekdays]
+        step = 7 * schedule.interval
+    elif schedule.recurrence == 'daily':
+        firsts, step = [schedule.start], schedule.interval
+    else:
+        firsts, step = [schedule.start], None
+
+    dates = []
+    day = start
+    while day <= end:
+        if schedule.until is None or day <= schedule.until:
+            if step is None:
+                if day == schedule.start:
+                    dates.append(day)
+            elif any(day >= first and (day - first).days % step == 0 for first in firsts):
+                dates.append(day)
+        day += timedelta(days=1)
+    return dates
+
+
+def random_schedule(rng):
+    start = WINDOW_START + timedelta(days=rng.randrange(60))
+    kind = rng.choice(['', 'daily', 'weekly'])
+    until = start + timedelta(days=rng.randrange(200)) if kind and rng.random() < 0.5 else None
+    weekdays = recurrence.weekday_mask(rng.sample(range(7), rng.randint(1, 3))) if kind == 'weekly' and rng.random() < 0.7 else 0
+    return Schedule(start, kind, rng.randint(1, 4), weekdays, until)
+
+
+class RecurrenceBruteForceTests(SimpleTestCase):
+    """Compare the arithmetic in main.recurrence with checking every day."""
+
+    def test_occurrences(self):
+        rng = random.Random(1)
+        for _ in range(500):
+            schedule = random_schedule(rng)
+            window_start = WINDOW_START + timedelta(days=rng.randrange(120))
+            window_end = window_start + timedelta(days=rng.randrange(150))
+            with self.subTest(schedule=schedule, window=(window_start, window_end)):
+                self.assertEqual(
+                    list(recurrence.occurrences(schedule, window_start, window_end)),
+                    brute_force_dates(schedule, window_start, window_end),
+                )
+
+    def test_first_conflict(self):
+        rng = random.Random(2)
+        # Starts lie in the first 60 days and the steps are at most 28 days, so
+        # any shared date comes well before WINDOW_END
+        for _ in range(1000):
+            a, b = random_schedule(rng), random_schedule(rng)
+            shared = sorted(set(brute_force_dates(a)) & set(brute_force_dates(b)))
+            with self.subTest(a=a, b=b):
+                self.assertEqual(recurrence.first_conflict(a, b), shared[0] if shared else None)
+                self.assertEqual(recurrence.first_conflict(b, a), shared[0] if shared else None)
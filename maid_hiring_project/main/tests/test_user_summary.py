@@ -0,0 +1,37 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from main import user_summary
+from main.models import Booking
+
+from .factories import make_maid, make_user
+
+
+class UserSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.maid = make_maid('maid@example.com')
+        self.customer = make_user('customer@example.com')
+
+    def booking_total(self, user):
+        return user_summary.get_summary(user.pk)['customer_booking_total' if user == self.customer else 'maid_booking_total']
+
+    def test_new_booking_refreshes_both_sides_without_extra_queries(self):
+        self.assertEqual((self.booking_total(self.customer), self.booking_total(self.maid.user)), (0, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            # Only the INSERT: the maid's user id comes from the loaded maid
+            with self.assertNumQueries(1):
+                Booking.objects.create(customer=self.customer, maid=self.maid, message='Hello')
+
+        self.assertEqual((self.booking_total(self.customer), self.booking_total(self.maid.user)), (1, 1))
+
+    @override_settings(PROCESS_LOCAL_CACHE_TIMEOUT=30, USER_SUMMARY_CACHE_TIMEOUT=900)
+    def test_process_local_cache_keeps_summaries_briefly(self):
+        # Other workers never see this worker's invalidations
+        with mock.patch('main.user_summary.cache') as summary_cache:
+            summary_cache.get.return_value = None
+            user_summary.get_summary(self.customer.pk)
+        self.assertEqual(summary_cache.set.call_args.args[2], 30)
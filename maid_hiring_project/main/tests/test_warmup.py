@@ -0,0 +1,37 @@
+import asyncio
+import importlib
+import sys
+from unittest import mock
+
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from main import listings, warmup
+
+from .factories import make_maid
+
+
+class WarmUpTests(SimpleTestCase):
+    @mock.patch('main.warmup.connections')
+    def test_closes_connections_before_workers_fork(self, connections):
+        with mock.patch.object(warmup, 'PHASES', [('urls', warmup.warm_urls)]):
+            report = warmup.warm_up()
+        self.assertIn('urls_ms', report)
+        connections.close_all.assert_called_once_with()
+
+
+class AsgiStartupTests(TransactionTestCase):
+    def tearDown(self):
+        sys.modules.pop('core.asgi', None)
+
+    @override_settings(WARMUP_ON_STARTUP=True)
+    def test_import_inside_running_event_loop(self):
+        make_maid('maid@example.com')
+
+        async def serve():
+            # Like uvicorn and daphne, which load the application in their loop
+            sys.modules.pop('core.asgi', None)
+            return importlib.import_module('core.asgi').application
+
+        with self.assertNoLogs('main.performance', level='WARNING'):
+            self.assertIsNotNone(asyncio.run(serve()))
+        self.assertEqual(listings._hot_snapshots.keys(), {'mumbai'})
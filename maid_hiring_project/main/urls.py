@@ -14,12 +14,32 @@ urlpatterns = [
     path('portal-admin/users/<str:category>/', views.admin_user_list, name='admin_user_list'),
     path('portal-admin/profile/<int:user_id>/', views.admin_user_profile, name='admin_user_profile'),
     path('portal-admin/maid-detail/<int:maid_id>/', views.admin_maid_detail, name='admin_maid_detail'),
+    path('portal-admin/archive/<int:archive_id>/documents/', views.admin_archived_documents, name='admin_archived_documents'),
     path('portal-admin/approve/<int:maid_id>/', views.approve_maid, name='approve_maid'),
     path('portal-admin/reject/<int:maid_id>/', views.reject_maid, name='reject_maid'),
     path('portal-admin/formal-reject-email/<int:maid_id>/', views.admin_send_formal_rejection_email, name='admin_send_formal_rejection_email'),
+    path('portal-admin/import-maids/', views.admin_import_maids, name='admin_import_maids'),
+    path('portal-admin/export/users/<str:category>/', views.admin_export_users, name='admin_export_users'),
+    path('portal-admin/export/bookings/', views.admin_export_bookings, name='admin_export_bookings'),
     
     # User Feature URLs
     path('maids/', views.maid_list_view, name='maid_list'),
+    path('maids/locations/', views.location_suggestions, name='location_suggestions'),
     path('maid-profile/<int:maid_id>/', views.customer_maid_profile, name='customer_maid_profile'),
     path('send-email/<int:maid_id>/', views.send_email_to_maid, name='send_email_to_maid'),
+    path('book/<int:maid_id>/', views.book_maid, name='book_maid'),
+    path('review/<int:booking_id>/', views.review_booking, name='review_booking'),
+
+    # Maid bookings
+    path('bookings/', views.maid_bookings, name='maid_bookings'),
+    path('bookings/<int:booking_id>/<str:action>/', views.respond_to_booking, name='respond_to_booking'),
+
+    # Messaging
+    path('messages/', views.inbox, name='inbox'),
+    path('messages/<int:conversation_id>/', views.conversation_view, name='conversation'),
+    path('messages/stream/', views.message_stream, name='message_stream'),
+    path('messages/poll/', views.message_poll, name='message_poll'),
+
+    # Monitoring
+    path('metrics', views.metrics_view, name='metrics'),
 ]
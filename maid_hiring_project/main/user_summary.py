@@ -0,0 +1,127 @@
+"""
+Per-user activity summary for the admin user profile page.
+
+One query reads the user with their customer profile and maid
+registration joined in, and computes everything else as correlated
+subqueries in the same statement: bookings by status on each side,
+messages sent and received, and the latest activity. A registered maid's
+verification history is one more indexed query. The result is cached per
+user until something it counts changes: the signals and the code paths
+that change rows with queryset updates (bookings.respond(),
+moderation.transition()) call invalidate().
+
+Invalidation only reaches other workers through a shared cache; with the
+per-process default, summaries are kept for at most
+PROCESS_LOCAL_CACHE_TIMEOUT seconds instead (see main/caching.py).
+"""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .caching import bounded_timeout
+from .models import Booking, MaidProfile, MaidStatusEvent, Message
+
+USER_FIELDS = (
+    'id', 'username', 'email', 'date_joined', 'last_login', 'is_staff',
+    'profile__full_name', 'profile__role', 'profile__phone_number', 'profile__location',
+    'maid_profile__id', 'maid_profile__name', 'maid_profile__mobile_number',
+    'maid_profile__location', 'maid_profile__status', 'maid_profile__created_at',
+)
+
+
+def _cache_key(user_id):
+    return f'user-summary:{user_id}'
+
+
+def _aggregate(queryset, group_by, aggregate):
+    """Scalar subquery: `aggregate` over the rows of `queryset`, which is filtered on OuterRef."""
+    return Subquery(queryset.order_by().values(group_by).annotate(value=aggregate).values('value'))
+
+
+def _count(queryset, group_by):
+    return Coalesce(_aggregate(queryset, group_by, Count('id')), 0)
+
+
+def _booking_annotations():
+    sides = {
+        'customer': (Booking.objects.filter(customer=OuterRef('pk')), 'customer'),
+        'maid': (Booking.objects.filter(maid=OuterRef('maid_profile__id')), 'maid'),
+    }
+    annotations = {}
+    for side, (bookings, group_by) in sides.items():
+        for status, _label in Booking.STATUS_CHOICES:
+            annotations[f'{side}_{status}'] = _count(bookings.filter(status=status), group_by)
+        annotations[f'{side}_last_booking'] = _aggregate(bookings, group_by, Max('created_at'))
+    return annotations
+
+
+def _load(user_id):
+    sent = Message.objects.filter(sender=OuterRef('pk'))
+    annotations = {
+        **_booking_annotations(),
+        'messages_sent': _count(sent, 'sender'),
+        'messages_received': _count(Message.objects.filter(recipient=OuterRef('pk')), 'recipient'),
+        'last_message': _aggregate(sent, 'sender', Max('created_at')),
+    }
+    row = User.objects.filter(pk=user_id).annotate(**annotations).values(*USER_FIELDS, *annotations).first()
+    if row is None:
+        return None
+
+    summary = {
+        'user': {field: row[field] for field in USER_FIELDS},
+        'messages_sent': row['messages_sent'],
+        'messages_received': row['messages_received'],
+        'status_history': [],
+    }
+    for side in ('customer', 'maid'):
+        counts = [(label, row[f'{side}_{status}']) for status, label in Booking.STATUS_CHOICES]
+        summary[f'{side}_bookings'] = counts
+        summary[f'{side}_booking_total'] = sum(count for _label, count in counts)
+
+    # The user's own actions: logging in, requesting a booking, sending a message
+    moments = [row['last_login'], row['customer_last_booking'], row['last_message']]
+    moments = [moment for moment in moments if moment is not None]
+    summary['last_activity'] = max(moments) if moments else None
+
+    if row['maid_profile__id'] is not None:
+        summary['status_history'] = list(
+            MaidStatusEvent.objects.filter(maid_id=row['maid_profile__id'])
+            .values('from_status', 'to_status', 'created_at', 'actor__email')[:20]
+        )
+        labels = dict(MaidProfile.STATUS_CHOICES)
+        for event in summary['status_history']:
+            event['from_label'] = labels.get(event['from_status'], '')
+            event['to_label'] = labels.get(event['to_status'], event['to_status'])
+    return summary
+
+
+def get_summary(user_id):
+    """The cached summary of a user, or None if there is no such user."""
+    key = _cache_key(user_id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = _load(user_id)
+        if summary is not None:
+            cache.set(key, summary, bounded_timeout(settings.USER_SUMMARY_CACHE_TIMEOUT))
+    return summary
+
+
+def invalidate(*user_ids):
+    """Drop the cached summaries of these users once the current transaction commits."""
+    keys = [_cache_key(user_id) for user_id in set(user_ids) if user_id is not None]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_maid(maid_id):
+    invalidate(MaidProfile.objects.filter(pk=maid_id).values_list('user_id', flat=True).first())
+
+
+def invalidate_booking(booking_id):
+    """For changes made with a queryset update, which sends no signals."""
+    row = Booking.objects.filter(pk=booking_id).values_list('customer_id', 'maid__user_id').first()
+    if row is not None:
+        invalidate(*row)
@@ -1,16 +1,35 @@
+import io
+import os
+import zipfile
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
 from django.shortcuts import render, redirect
+from django.urls import reverse
+from django.http import FileResponse, HttpResponse, Http404, JsonResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.models import User
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from .forms import MaidProfileForm
-from .models import MaidProfile, Profile
+from .forms import BookingForm, MaidProfileForm, MaidImportForm, ReviewForm
+from .models import MaidCard, MaidProfile, Profile, Booking, Review, ArchivedBooking, ArchivedMaidProfile
+from . import autocomplete, bookings, dedupe, history, listings, messaging, metrics, moderation, recommendations, recurrence, reviews, user_summary
+from .listings import MAID_CARD_FIELDS
+from .ratelimit import rate_limit
+from .importers import import_maids
+from .exports import export_response
+from .cards import card_fields, card_language
 from django.core.mail import send_mail, EmailMessage
 from django.conf import settings
+from django.db import IntegrityError, router, transaction
+from django.db.models import Case, F, Q, When
 from django.contrib.admin.views.decorators import staff_member_required
-from django.utils import translation
+from django.utils import timezone, translation
+from django.utils.formats import date_format
 from django.conf import settings
 from django.utils.translation import gettext as _
+from core.db_router import use_read_replica
 
 def switch_language(request):
     if request.method == 'POST':
@@ -39,12 +58,14 @@ def register_maid(request):
         if form.is_valid():
             profile = form.save(commit=False)
             profile.user = request.user
-            profile.save()
-            
-            # Update User Profile role to 'maid'
-            if hasattr(request.user, 'profile'):
-                request.user.profile.role = 'maid'
-                request.user.profile.save()
+            profile._status_actor = request.user
+            with transaction.atomic():
+                profile.save()
+
+                # Update User Profile role to 'maid'
+                if hasattr(request.user, 'profile'):
+                    request.user.profile.role = 'maid'
+                    request.user.profile.save()
             
             messages.success(request, _("Registered as Maid Successfully. Admin will verify your profile soon."))
             return redirect('home')
@@ -61,84 +82,287 @@ def register_maid(request):
 
     return render(request, 'main/register_maid.html', {'form': form})
 
+def _number_param(value):
+    """A finite Decimal from a query parameter, or None if it is missing or unparseable."""
+    try:
+        number = Decimal(value) if value else None
+    except InvalidOperation:
+        return None
+    return number if number is not None and number.is_finite() else None
+
+@use_read_replica
 @login_required
 def maid_list_view(request):
     """
     View to display a list of verified maids with filtering options.
     """
-    # 1. Base Query: Only show verified maids
-    maids = MaidProfile.objects.filter(status='verified')
-    
-    # 2. Get Filtering Parameters from Request
+    # 1. Get Filtering Parameters from Request
     skill_filter = request.GET.get('skill')
     location_filter = request.GET.get('location')
     min_salary = request.GET.get('min_salary')
     max_salary = request.GET.get('max_salary')
+    min_rating = request.GET.get('min_rating')
+    available_on = request.GET.get('available_on')
+    repeat = request.GET.get('repeat') or ''
+    sort = request.GET.get('sort')
+    language = card_language()
 
-    # 3. Apply Filters
-    if skill_filter:
-        # distinct_skills in context will rely on exact matches usually, 
-        # but icontains allows partial matches which is flexible for search.
-        maids = maids.filter(skills__icontains=skill_filter)
-    
-    if location_filter:
-        maids = maids.filter(location__icontains=location_filter)
-        
-    if min_salary:
-        maids = maids.filter(expected_salary__gte=min_salary)
-        
-    if max_salary:
-        maids = maids.filter(expected_salary__lte=max_salary)
+    # Maids with an accepted booking on the requested date(s) are left out
+    try:
+        start = date.fromisoformat(available_on) if available_on else None
+    except ValueError:
+        start = None
+    if repeat not in ('daily', 'weekly'):
+        repeat = ''
+    schedule = recurrence.Schedule(start, repeat) if start else None
+
+    # Unparseable numbers are ignored like an unparseable date
+    rating_floor = _number_param(min_rating)
+    salary_floor = _number_param(min_salary)
+    salary_ceiling = _number_param(max_salary)
+
+    ranked_ids = None
+    if sort == 'best' and recommendations.available():
+        # Order by best match (in-memory scoring)
+        profile = getattr(request.user, 'profile', None)
+        # Scored against the most the customer will pay, else the least
+        budget = salary_ceiling if salary_ceiling is not None else salary_floor
+        ranked_ids = recommendations.get_catalogue().top_k(
+            skills=skill_filter,
+            location=location_filter or (profile.location if profile else None),
+            location_contains=location_filter,
+            budget=budget if budget is not None and budget > 0 else None,
+            min_salary=salary_floor,
+            max_salary=salary_ceiling,
+        )
 
-    # Order by newest first
-    maids = maids.order_by('-created_at')
-    
-    # 4. Prepare Dynamic Filter Data (Distinct Skills)
-    # Fetch all verified maids to generate the complete list of available skills
-    all_verified_maids = MaidProfile.objects.filter(status='verified')
-    distinct_skills = set()
-    
-    for m in all_verified_maids:
-        if m.skills:
-            # unique skills extraction
-            raw_skills = m.skills.split(',')
-            for s in raw_skills:
-                clean_skill = s.strip()
-                if clean_skill:  # Avoid empty strings
-                    distinct_skills.add(clean_skill)
-            
-    # 5. Pre-process maids for template display (convert comma-string to list)
-    # We do this iteration because we need to display badges for each skill
-    for m in maids:
-        if m.skills:
-            m.skills_list = [s.strip().title() for s in m.skills.split(',') if s.strip()]
+    # 2. Searches in a known city are served from that city's cached snapshot
+    snapshot = listings.search_snapshot(location_filter)
+
+    if snapshot and snapshot['count']:
+        rows = listings.filter_rows(
+            snapshot['rows'], skill_filter, salary_floor, salary_ceiling, rating_floor, location=location_filter,
+        )
+        if schedule and rows:
+            busy_ids = bookings.busy_maids(schedule, [row['id'] for row in rows])
+            rows = [row for row in rows if row['id'] not in busy_ids]
+        if ranked_ids is not None:
+            # The top matches first, then everyone else newest first (rows
+            # are already newest first and sorted() is stable)
+            rank = {maid_id: position for position, maid_id in enumerate(ranked_ids)}
+            rows = sorted(rows, key=lambda row: rank.get(row['id'], len(rank)))
+        elif sort == 'rating':
+            rows = listings.by_rating(rows)
+        maids = [{**row, 'skills_list': (row['skill_labels'] or {}).get(language, [])} for row in rows]
+        skill_facets = snapshot['skills']
+    else:
+        # 3. Otherwise query verified maids directly
+        maids = MaidProfile.objects.filter(status='verified')
+        if skill_filter:
+            # distinct_skills in context will rely on exact matches usually, 
+            # but icontains allows partial matches which is flexible for search.
+            maids = maids.filter(skills__icontains=skill_filter)
+        if location_filter:
+            maids = maids.filter(location__icontains=location_filter)
+        if salary_floor is not None:
+            maids = maids.filter(expected_salary__gte=salary_floor)
+        if salary_ceiling is not None:
+            maids = maids.filter(expected_salary__lte=salary_ceiling)
+        if rating_floor is not None:
+            maids = maids.filter(rating_score__gte=rating_floor)
+        if schedule:
+            maids = maids.exclude(id__in=bookings.busy_maids(schedule, maids.values('id')))
+
+        if ranked_ids is not None:
+            # The top matches first, then everyone else newest first
+            maids = maids.order_by(
+                Case(
+                    *[When(id=maid_id, then=position) for position, maid_id in enumerate(ranked_ids)],
+                    default=len(ranked_ids),
+                ),
+                '-created_at',
+            )
+        elif sort == 'rating':
+            # Served by the (status, -rating_score) index
+            maids = maids.order_by('-rating_score', '-rating_count')
         else:
-            m.skills_list = []
-            
+            maids = maids.order_by('-created_at')
+
+        # Project only what the cards display; skill badges come
+        # pre-translated from the MaidCard read model.
+        maids = list(maids.values(*MAID_CARD_FIELDS, skills_list=F(f'card__skill_labels__{language}')))
+        skill_facets = listings.all_skill_facets()
+
     context = {
         'maids': maids,
-        'distinct_skills': sorted(list(distinct_skills)), # Sort for dropdown
+        'maid_count': len(maids),
+        'skill_facets': skill_facets,
+        'best_match_available': recommendations.available(),
         'current_filters': {
+            'sort': sort,
             'skill': skill_filter,
             'location': location_filter,
             'min_salary': min_salary,
             'max_salary': max_salary,
+            'min_rating': min_rating,
+            'available_on': available_on,
+            'repeat': repeat,
         }
     }
     return render(request, 'main/maid_list.html', context)
 
+@login_required
+def maid_bookings(request):
+    maid = MaidProfile.objects.filter(user=request.user).values('id', 'name', 'status').first()
+    if maid is None:
+        messages.info(request, _("Register as a maid to receive booking requests."))
+        return redirect('register_maid')
+
+    tab = request.GET.get('tab')
+    if tab not in bookings.TABS:
+        tab = 'pending'
+    today = timezone.localdate()
+    page, next_cursor = bookings.booking_page(
+        maid['id'], tab, today, after=bookings.decode_cursor(request.GET.get('after')),
+    )
+    for booking in page:
+        schedule = recurrence.schedule_of(booking)
+        booking.schedule_text = recurrence.describe(schedule)
+        booking.next_date = recurrence.next_occurrence(schedule, today) if booking.recurrence else None
+    context = {
+        'maid': maid,
+        'tab': tab,
+        'tabs': bookings.TABS,
+        'counts': bookings.status_counts(maid['id'], today),
+        'bookings': page,
+        'next_cursor': next_cursor,
+        'today': today,
+    }
+    return render(request, 'main/maid_bookings.html', context)
+
+@login_required
+def respond_to_booking(request, booking_id, action):
+    if request.method != 'POST' or action not in bookings.TRANSITIONS:
+        return redirect('maid_bookings')
+    maid_id = MaidProfile.objects.filter(user=request.user).values_list('id', flat=True).first()
+    if maid_id is None:
+        raise Http404("Booking not found")
+
+    with transaction.atomic():
+        if action == 'accept':
+            # Held until the update commits, so no other booking can be
+            # accepted for this maid between the check and the update
+            bookings.lock_maid(maid_id)
+            booking = Booking.objects.filter(pk=booking_id, maid_id=maid_id).values(*bookings.SCHEDULE_FIELDS).first()
+            clash = booking and bookings.first_clash(maid_id, recurrence.schedule_of(booking), exclude_id=booking_id)
+            if clash:
+                messages.warning(request, _("This booking clashes with one you accepted on %(date)s.") % {'date': date_format(clash)})
+                return redirect('maid_bookings')
+        updated = bookings.respond(booking_id, maid_id, action, timezone.localdate())
+
+    if updated:
+        messages.success(request, _("Booking updated."))
+    else:
+        messages.warning(request, _("This booking has already been updated."))
+    tab = request.POST.get('tab')
+    return redirect(f"{reverse('maid_bookings')}?tab={tab if tab in bookings.TABS else 'pending'}")
+
+@login_required
+@rate_limit('booking', '20/h', key='user', burst=5)
+def book_maid(request, maid_id):
+    maid = MaidProfile.objects.filter(id=maid_id, status='verified').values('id', 'name', 'user_id').first()
+    if maid is None:
+        raise Http404("Maid not found")
+    today = timezone.localdate()
+
+    if request.method == 'POST':
+        form = BookingForm(request.POST, today=today)
+        if form.is_valid():
+            with transaction.atomic():
+                # No booking can be accepted for this maid between the check and the insert
+                bookings.lock_maid(maid['id'])
+                clash = bookings.first_clash(maid['id'], form.schedule())
+                if not clash:
+                    booking = form.save(commit=False)
+                    booking.customer = request.user
+                    booking.maid_id = maid['id']
+                    booking.save()
+            if clash:
+                form.add_error(None, _("%(name)s is already booked on %(date)s.") % {'name': maid['name'], 'date': date_format(clash)})
+            else:
+                messages.success(request, _("Booking request sent. You will hear back once it is accepted."))
+                return redirect('customer_maid_profile', maid_id=maid['id'])
+    else:
+        form = BookingForm(today=today, initial={'service_date': today})
+    return render(request, 'main/book_maid.html', {'form': form, 'maid': maid})
+
+@login_required
+def location_suggestions(request):
+    # Suggestions come from the in-memory index; the only queries are
+    # login_required's session and user lookups
+    results = autocomplete.get_index().suggest(request.GET.get('q', '')[:100])
+    response = JsonResponse({'results': results})
+    response['Cache-Control'] = 'private, max-age=60'
+    return response
+
+@use_read_replica
 @login_required
 def customer_maid_profile(request, maid_id):
-    maid = MaidProfile.objects.get(id=maid_id, status='verified')
-    # Pre-process skills for template usage
-    if maid.skills:
-        maid.skills_list = [s.strip().title() for s in maid.skills.split(',') if s.strip()]
+    maid = MaidProfile.objects.filter(id=maid_id, status='verified').values(
+        *MAID_CARD_FIELDS,
+        user_email=F('user__email'),
+        first_name=F('card__first_name'),
+        skills_list=F(f'card__skill_labels__{card_language()}'),
+    ).first()
+    if maid is None:
+        raise Http404("Maid not found")
+    if maid['first_name'] is None:
+        # No card yet (created without signals)
+        skills = MaidProfile.objects.filter(id=maid_id).values_list('skills', flat=True).first()
+        card = card_fields(maid['name'], skills)
+        maid['first_name'] = card['first_name']
+        maid['skills_list'] = card['skill_labels'].get(card_language(), [])
+
+    recent_reviews = Review.objects.filter(maid_id=maid_id).order_by('-created_at').values(
+        'rating', 'comment', 'created_at', reviewer=F('customer__profile__full_name'),
+    )[:10]
+    reviewable_booking = Booking.objects.filter(
+        maid_id=maid_id, customer=request.user, status='completed', review__isnull=True,
+    ).values_list('id', flat=True).first()
+    return render(request, 'main/customer_maid_profile.html', {
+        'maid': maid,
+        'recent_reviews': recent_reviews,
+        'reviewable_booking': reviewable_booking,
+    })
+
+
+@login_required
+def review_booking(request, booking_id):
+    booking = Booking.objects.filter(id=booking_id, customer=request.user).first()
+    if booking is None:
+        raise Http404("Booking not found")
+    if not reviews.can_review(booking, request.user):
+        messages.info(request, _("This booking can't be reviewed."))
+        return redirect('customer_maid_profile', maid_id=booking.maid_id)
+
+    if request.method == 'POST':
+        form = ReviewForm(request.POST)
+        if form.is_valid():
+            try:
+                reviews.submit_review(
+                    booking, request.user, form.cleaned_data['rating'], form.cleaned_data['comment'],
+                )
+            except (reviews.ReviewNotAllowed, IntegrityError):
+                # Already reviewed, e.g. by a double submit
+                messages.info(request, _("This booking can't be reviewed."))
+            else:
+                messages.success(request, _("Thank you for your review."))
+            return redirect('customer_maid_profile', maid_id=booking.maid_id)
     else:
-        maid.skills_list = []
-    
-    maid.first_name = maid.name.split()[0] if maid.name else ""
-    return render(request, 'main/customer_maid_profile.html', {'maid': maid})
+        form = ReviewForm()
+    return render(request, 'main/review_booking.html', {'form': form, 'booking': booking})
 
+@rate_limit('register', '10/h', key='ip', burst=5)
 def register_view(request):
     if request.method == 'POST':
         full_name = request.POST.get('full_name')
@@ -152,19 +376,23 @@ def register_view(request):
             messages.error(request, _("Passwords do not match."))
             return render(request, 'main/register.html')
 
-        if User.objects.filter(username=email).exists():
+        # User and Profile are created together; the unique username and
+        # email indexes reject duplicates even when two sign-ups race.
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(username=email, email=email, password=password)
+                Profile.objects.create(user=user, full_name=full_name, phone_number=phone_number, role=role)
+        except IntegrityError:
             messages.error(request, _("Email already registered."))
             return render(request, 'main/register.html')
 
-        user = User.objects.create_user(username=email, email=email, password=password)
-        # Create Profile
-        Profile.objects.create(user=user, full_name=full_name, phone_number=phone_number, role=role)
-
         messages.success(request, _("Account created successfully. Please sign in."))
         return redirect('login')
 
     return render(request, 'main/register.html')
 
+@rate_limit('login', '20/m', key='ip', burst=10)
+@rate_limit('login', '5/m', key='post:email')
 def login_view(request):
     if request.method == 'POST':
         email = request.POST.get('email')
@@ -189,34 +417,86 @@ def logout_view(request):
 def admin_dashboard(request):
     total_users = User.objects.filter(is_superuser=False).count()
     customers_count = Profile.objects.filter(role='customer').count()
-    verified_maids_count = MaidProfile.objects.filter(status='verified').count()
-    unverified_maids_count = MaidProfile.objects.filter(status='pending').count()
+    # Maid counts come from the same cached counters as /metrics
+    maid_counts = metrics.get_maid_counts()
+    # Verification turnaround from the daily rollups
+    daily_stats, stats_totals = history.daily_summary(days=14)
     
     context = {
         'total_users': total_users,
         'customers_count': customers_count,
-        'verified_maids_count': verified_maids_count,
-        'unverified_maids_count': unverified_maids_count,
+        'verified_maids_count': maid_counts['verified'],
+        'unverified_maids_count': maid_counts['pending'],
+        'daily_stats': daily_stats,
+        'stats_totals': stats_totals,
     }
     return render(request, 'main/admin/dashboard.html', context)
 
+# Admin user list categories: title and User filter
+USER_CATEGORIES = {
+    'total': ("Total Users", {'is_superuser': False}),
+    'customers': ("Customers", {'profile__role': 'customer'}),
+    'verified': ("Verified Maids", {'maid_profile__status': 'verified'}),
+    'unverified': ("Unverified Maids", {'maid_profile__status': 'pending'}),
+}
+
+USER_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('username', 'username'),
+    ('email', 'email'),
+    ('date_joined', 'date_joined'),
+    ('profile__full_name', 'full_name'),
+    ('profile__phone_number', 'phone_number'),
+    ('profile__role', 'role'),
+    ('profile__location', 'location'),
+    ('maid_profile__status', 'maid_status'),
+    ('maid_profile__expected_salary', 'expected_salary'),
+    ('maid_profile__skills', 'skills'),
+]
+
+BOOKING_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('status', 'status'),
+    ('service_date', 'service_date'),
+    ('created_at', 'created_at'),
+    ('customer__email', 'customer_email'),
+    ('maid_id', 'maid_id'),
+    ('maid__name', 'maid_name'),
+    ('maid__location', 'maid_location'),
+    ('message', 'message'),
+]
+
+@staff_member_required
+def admin_import_maids(request):
+    """Bulk intake of partner agency registrations (CSV + documents zip)."""
+    result = None
+    if request.method == 'POST':
+        form = MaidImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            # Large uploads are already spooled to temporary files by Django;
+            # both are read incrementally from there.
+            csv_file = io.TextIOWrapper(form.cleaned_data['csv_file'].file, encoding='utf-8-sig', newline='')
+            try:
+                result = import_maids(csv_file, form.cleaned_data['documents_zip'].file)
+                messages.success(request, _("Imported %(created)s maids, rejected %(skipped)s rows.") % {
+                    'created': result.created, 'skipped': result.skipped,
+                })
+            except (ValueError, zipfile.BadZipFile) as e:
+                messages.error(request, _("Import failed: %(error)s") % {'error': e})
+    else:
+        form = MaidImportForm()
+
+    return render(request, 'main/admin/import_maids.html', {'form': form, 'result': result})
+
+@use_read_replica
 @staff_member_required
 def admin_user_list(request, category):
     users = []
     title = ""
     
-    if category == 'total':
-        users = User.objects.filter(is_superuser=False)
-        title = "Total Users"
-    elif category == 'customers':
-        users = User.objects.filter(profile__role='customer')
-        title = "Customers"
-    elif category == 'verified':
-        users = User.objects.filter(maid_profile__status='verified')
-        title = "Verified Maids"
-    elif category == 'unverified':
-        users = User.objects.filter(maid_profile__status='pending')
-        title = "Unverified Maids"
+    if category in USER_CATEGORIES:
+        title, filters = USER_CATEGORIES[category]
+        users = User.objects.filter(**filters)
         
     for u in users:
         u.display_name = u.username
@@ -229,42 +509,116 @@ def admin_user_list(request, category):
 
     return render(request, 'main/admin/user_list.html', {'users_list': users, 'title': title, 'category': category})
 
+@use_read_replica
+@staff_member_required
+def admin_export_users(request, category):
+    if category not in USER_CATEGORIES:
+        raise Http404("Unknown user category")
+    _title, filters = USER_CATEGORIES[category]
+    # Rows are fetched after the view returns, so pin the database now
+    users = User.objects.using(router.db_for_read(User)).filter(**filters).order_by('id')
+    return export_response(users, USER_EXPORT_COLUMNS, f"users-{category}", request.GET.get('format', 'csv'))
+
+@use_read_replica
+@staff_member_required
+def admin_export_bookings(request):
+    bookings = Booking.objects.using(router.db_for_read(Booking)).order_by('id')
+    status = request.GET.get('status')
+    if status:
+        bookings = bookings.filter(status=status)
+    return export_response(bookings, BOOKING_EXPORT_COLUMNS, "bookings", request.GET.get('format', 'csv'))
+
 @staff_member_required
 def admin_user_profile(request, user_id):
-    target_user = User.objects.get(id=user_id)
-    # Ensure profile exists to avoid template errors
-    if not hasattr(target_user, 'profile'):
-        Profile.objects.create(user=target_user, role='customer', full_name=target_user.username)
-    
-    target_user.display_name = target_user.username
-    if target_user.profile and target_user.profile.full_name:
-        target_user.display_name = target_user.profile.full_name
-    elif hasattr(target_user, 'maid_profile') and target_user.maid_profile and target_user.maid_profile.name:
-        target_user.display_name = target_user.maid_profile.name
-    
-    target_user.display_initial = target_user.display_name[0].upper() if target_user.display_name else "?"
-    
-    return render(request, 'main/admin/user_profile.html', {'target_user': target_user})
+    # One cached, read-only summary; a user without a Profile is shown as is
+    summary = user_summary.get_summary(user_id)
+    if summary is None:
+        raise Http404("User not found")
+    user = summary['user']
+
+    display_name = user['profile__full_name'] or user['maid_profile__name'] or user['username']
+    target_user = {
+        'id': user['id'],
+        'email': user['email'],
+        'role': user['profile__role'] or ('maid' if user['maid_profile__id'] else ''),
+        'phone_number': user['profile__phone_number'] or user['maid_profile__mobile_number'],
+        'location': user['profile__location'] or user['maid_profile__location'],
+        'date_joined': user['date_joined'],
+        'last_login': user['last_login'],
+        'maid_status': user['maid_profile__status'],
+        'display_name': display_name,
+        'display_initial': display_name[0].upper() if display_name else "?",
+    }
+
+    context = {'target_user': target_user, 'summary': summary, 'show_archived': request.GET.get('archived') == '1'}
+    if context['show_archived']:
+        # Archive tables are only read on request
+        registrations = list(ArchivedMaidProfile.objects.filter(user_id=user_id))
+        maid_ids = [archived.original_id for archived in registrations]
+        if user['maid_profile__id'] is not None:
+            maid_ids.append(user['maid_profile__id'])
+        context['archived_registrations'] = registrations
+        context['archived_bookings'] = ArchivedBooking.objects.filter(
+            Q(customer_id=user_id) | Q(maid_original_id__in=maid_ids)
+        )[:50]
+    return render(request, 'main/admin/user_profile.html', context)
+
+@staff_member_required
+def admin_archived_documents(request, archive_id):
+    archived = ArchivedMaidProfile.objects.filter(id=archive_id).exclude(documents='').first()
+    if archived is None:
+        raise Http404("No archived documents")
+    try:
+        return FileResponse(
+            open(os.path.join(settings.MEDIA_ROOT, archived.documents), 'rb'),
+            as_attachment=True,
+            filename=f'maid-{archived.original_id}-documents.zip',
+        )
+    except FileNotFoundError:
+        raise Http404("Archived documents are missing")
 
 @staff_member_required
 def admin_maid_detail(request, maid_id):
-    maid = MaidProfile.objects.get(id=maid_id)
-    maid.display_name = maid.name
-    maid.display_initial = maid.name[0].upper() if maid.name else "?"
-    
-    # Pre-process skills for template usage
-    if maid.skills:
-        maid.skills_list = [s.strip().title() for s in maid.skills.split(',') if s.strip()]
-    else:
-        maid.skills_list = []
+    maid = MaidProfile.objects.select_related('user', 'card').get(id=maid_id)
+    # Rows created without signals (bulk_create) have no card yet; build
+    # one in memory rather than writing on a GET
+    card = maid.card if hasattr(maid, 'card') else MaidCard(maid=maid, **card_fields(maid.name, maid.skills))
+    maid.display_name = card.display_name
+    maid.display_initial = card.display_initial
+    maid.skills_list = card.skill_labels.get(card_language(), [])
+    # Other registrations sharing a phone, Aadhaar scan or name (index lookups)
+    duplicates = dedupe.find_candidates(maid)
     
-    return render(request, 'main/admin/maid_detail.html', {'maid': maid})
+    return render(request, 'main/admin/maid_detail.html', {'maid': maid, 'duplicates': duplicates})
+
+def _shown_version(request):
+    """The maid version the admin's detail page was rendered with, if posted."""
+    try:
+        return int(request.POST.get('version'))
+    except (TypeError, ValueError):
+        return None
+
+def _moderate(request, maid, status):
+    """Apply an admin decision: True if applied, False if already so, None on a conflict."""
+    try:
+        return moderation.transition(maid, status, actor=request.user, expected_version=_shown_version(request))
+    except moderation.TransitionConflict as conflict:
+        messages.error(
+            request,
+            f"{maid.name}'s registration was updated by another admin in the meantime "
+            f"(now {conflict.status}). Please review it again.",
+        )
+        return None
 
 @staff_member_required
 def approve_maid(request, maid_id):
-    maid = MaidProfile.objects.get(id=maid_id)
-    maid.status = 'verified'
-    maid.save()
+    maid = MaidProfile.objects.select_related('user').get(id=maid_id)
+    changed = _moderate(request, maid, 'verified')
+    if changed is None:
+        return redirect('admin_maid_detail', maid_id=maid_id)
+    if not changed:
+        messages.info(request, f"{maid.name} is already verified.")
+        return redirect('admin_dashboard')
     
     # Send Email
     subject = "Maid Registration Verified - Maid Hiring System"
@@ -289,12 +643,11 @@ Maid Hiring System Team
 @staff_member_required
 def admin_send_formal_rejection_email(request, maid_id):
     try:
-        maid = MaidProfile.objects.get(id=maid_id)
+        maid = MaidProfile.objects.select_related('user').get(id=maid_id)
         
         # Mark as rejected if not already
-        if maid.status != 'rejected':
-            maid.status = 'rejected'
-            maid.save()
+        if _moderate(request, maid, 'rejected') is None:
+            return redirect('admin_maid_detail', maid_id=maid_id)
             
         subject = "Update on your Maid Registration - Not Eligible"
         message = f"""Hello {maid.name},
@@ -324,9 +677,13 @@ Maid Hiring System
 
 @staff_member_required
 def reject_maid(request, maid_id):
-    maid = MaidProfile.objects.get(id=maid_id)
-    maid.status = 'rejected'
-    maid.save()
+    maid = MaidProfile.objects.select_related('user').get(id=maid_id)
+    changed = _moderate(request, maid, 'rejected')
+    if changed is None:
+        return redirect('admin_maid_detail', maid_id=maid_id)
+    if not changed:
+        messages.info(request, f"{maid.name} is already rejected.")
+        return redirect('admin_dashboard')
     
     # Send Email
     subject = "Maid Registration Update - Maid Hiring System"
@@ -353,6 +710,8 @@ Maid Hiring System Team
     return redirect('admin_dashboard')
 
 @login_required
+@rate_limit('maid-inquiry', '10/h', key='user', burst=3)
+@rate_limit('maid-inquiry', '30/h', key='ip', burst=10)
 def send_email_to_maid(request, maid_id):
     if request.method == 'POST':
         try:
@@ -378,6 +737,11 @@ Message:
 To reply, please email {request.user.email} directly.
 """
             
+            # Keep a copy in the in-app inbox
+            conversation = messaging.start_conversation(request.user, maid, subject or '')
+            body = message if subject == conversation.subject else f"{subject}\n\n{message}"
+            messaging.post_message(conversation, request.user, body)
+
             email = EmailMessage(
                 subject=email_subject,
                 body=email_message,
@@ -385,11 +749,134 @@ To reply, please email {request.user.email} directly.
                 to=[maid.user.email],
                 reply_to=[request.user.email]
             )
-            email.send(fail_silently=False)
-            messages.success(request, _("Your email has been sent successfully!"))
+            try:
+                email.send(fail_silently=False)
+            except Exception:
+                # The message is already in the maid's inbox; only the email copy failed
+                messages.warning(request, _("Your message was delivered to the maid's inbox, but the email copy could not be sent."))
+            else:
+                messages.success(request, _("Your email has been sent successfully!"))
         except MaidProfile.DoesNotExist:
              messages.error(request, _("Maid profile not found."))
         except Exception as e:
             messages.error(request, _(f"Failed to send email: {str(e)}"))
             
     return redirect('customer_maid_profile', maid_id=maid_id)
+
+
+# ---------------- Messaging ----------------
+
+@login_required
+def inbox(request):
+    conversations = messaging.conversations_for(request.user).order_by('-last_message_at').values(
+        'id', 'subject', 'last_message_at', 'customer_id', 'customer__username',
+        'customer__profile__full_name', 'maid__name', 'customer_read_at', 'maid_read_at',
+    )[:50]
+
+    threads = []
+    for conversation in conversations:
+        as_customer = conversation['customer_id'] == request.user.pk
+        read_at = conversation['customer_read_at'] if as_customer else conversation['maid_read_at']
+        threads.append({
+            'id': conversation['id'],
+            'subject': conversation['subject'],
+            'last_message_at': conversation['last_message_at'],
+            'other_name': conversation['maid__name'] if as_customer else (
+                conversation['customer__profile__full_name'] or conversation['customer__username']),
+            'unread': read_at is None or read_at < conversation['last_message_at'],
+        })
+    context = {
+        'threads': threads,
+        # Live updates start after the newest message the page already reflects
+        'last_id': messaging.latest_ids(request.user.pk).first() or 0,
+    }
+    return render(request, 'main/inbox.html', context)
+
+@login_required
+@rate_limit('message', '60/h', key='user', burst=10)
+def conversation_view(request, conversation_id):
+    conversation = messaging.conversations_for(request.user).select_related('maid', 'customer').filter(pk=conversation_id).first()
+    if conversation is None:
+        raise Http404("Conversation not found")
+
+    if request.method == 'POST':
+        body = request.POST.get('body', '').strip()
+        if body:
+            messaging.post_message(conversation, request.user, body)
+        return redirect('conversation', conversation_id=conversation.pk)
+
+    thread = list(conversation.messages.order_by('-id').values(
+        'id', 'sender_id', 'body', 'created_at', 'sender__username', 'sender__profile__full_name',
+    )[:100])[::-1]
+    messaging.mark_read(conversation, request.user)
+
+    as_customer = messaging.is_customer(conversation, request.user)
+    context = {
+        'conversation': conversation,
+        'thread': thread,
+        'other_name': conversation.maid.name if as_customer else conversation.customer.username,
+        'last_id': messaging.latest_ids(request.user.pk).first() or 0,
+    }
+    return render(request, 'main/conversation.html', context)
+
+def _after_param(request):
+    value = request.headers.get('Last-Event-ID') or request.GET.get('after')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+async def message_stream(request):
+    """Server-Sent Events feed of the user's new messages (ASGI only)."""
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=403)
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI an endless response would hold a worker thread; 204
+        # tells EventSource not to reconnect, and the page long-polls instead.
+        return HttpResponse(status=204)
+
+    after = _after_param(request)
+    if after is None:
+        after = await messaging.latest_message_id(user.pk)
+    response = StreamingHttpResponse(messaging.event_stream(user.pk, after), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+async def message_poll(request):
+    """
+    Long-poll fallback: returns as soon as there are messages after ?after=<id>.
+    Under WSGI it answers at once (holding the request would hold a worker
+    thread, as with message_stream) and tells the client when to poll again.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=403)
+
+    after = _after_param(request)
+    if after is None:
+        return JsonResponse({'messages': [], 'last_id': await messaging.latest_message_id(user.pk)})
+    if not isinstance(request, ASGIRequest):
+        new_messages = [messaging.serialize(row) for row in await messaging.fetch_new(user.pk, after)]
+        return JsonResponse({
+            'messages': new_messages,
+            'last_id': new_messages[-1]['id'] if new_messages else after,
+            'retry_after': settings.MESSAGE_POLL_INTERVAL,
+        })
+    new_messages = await messaging.wait_for_messages(user.pk, after, settings.MESSAGE_POLL_TIMEOUT)
+    return JsonResponse({
+        'messages': new_messages,
+        'last_id': new_messages[-1]['id'] if new_messages else after,
+    })
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint."""
+    token = settings.METRICS_TOKEN
+    if token and request.headers.get('Authorization') != f"Bearer {token}":
+        return HttpResponse(status=401)
+    if not token and not settings.DEBUG and request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS:
+        # Request paths and counts are not for the public
+        raise Http404
+    return HttpResponse(metrics.render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
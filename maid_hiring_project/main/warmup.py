@@ -0,0 +1,142 @@
+"""
+Worker start-up warm-up.
+
+A fresh worker otherwise pays for template parsing, URL resolver population,
+translation catalogue loading, the busiest cities' listing snapshots and the
+location autocomplete index on its first few requests. warm_up() does all of
+that up front and returns how long each phase took.
+
+Under an ASGI server the application module is imported inside the running
+event loop, where the ORM refuses to run. The database phases then run in
+a short-lived thread instead, with their own connections.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.exceptions import SynchronousOnlyOperation
+from django.db import DatabaseError, connections
+from django.template import engines
+from django.template.loaders.app_directories import get_app_template_dirs
+from django.urls import get_resolver
+from django.utils import translation
+
+logger = logging.getLogger('main.performance')
+
+
+def template_names():
+    """Every template under the configured template directories."""
+    directories = []
+    for engine in engines.all():
+        directories.extend(getattr(engine, 'dirs', []))
+    directories.extend(get_app_template_dirs('templates'))
+
+    names = set()
+    for directory in directories:
+        for root, _dirs, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith('.html'):
+                    names.add(os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def warm_templates():
+    compiled = failed = 0
+    for engine in engines.all():
+        for name in template_names():
+            try:
+                engine.get_template(name)
+                compiled += 1
+            except Exception as e:
+                failed += 1
+                logger.warning("Could not precompile template %s: %s", name, e)
+    return {'templates': compiled, 'template_errors': failed}
+
+
+def warm_urls():
+    resolver = get_resolver()
+    for code, _name in settings.LANGUAGES:
+        with translation.override(code):
+            # Accessing reverse_dict populates the resolver for this language
+            resolver.reverse_dict
+    return {'url_patterns': len(resolver.url_patterns)}
+
+
+def warm_translations():
+    for code, _name in settings.LANGUAGES:
+        with translation.override(code):
+            translation.gettext("Maid Hiring System")
+    return {'languages': len(settings.LANGUAGES)}
+
+
+def warm_hot_cities():
+    from . import listings
+    try:
+        cities = listings.preload_hot_cities()
+    except (DatabaseError, SynchronousOnlyOperation) as e:
+        logger.warning("Could not preload hot city listings: %s", e)
+        cities = []
+    return {'hot_cities': len(cities)}
+
+
+def warm_locations():
+    from . import autocomplete
+    index = autocomplete.get_index()
+    try:
+        index.load()
+    except (DatabaseError, SynchronousOnlyOperation) as e:
+        logger.warning("Could not load the location index: %s", e)
+    return {'locations': len(index.labels)}
+
+
+PHASES = [
+    ('templates', warm_templates),
+    ('urls', warm_urls),
+    ('translations', warm_translations),
+    ('hot_cities', warm_hot_cities),
+    ('locations', warm_locations),
+]
+
+# Phases that query the database
+DATABASE_PHASES = {'hot_cities', 'locations'}
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _run_in_thread(func):
+    def run():
+        try:
+            return func()
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run).result()
+
+
+def warm_up():
+    in_event_loop = _in_event_loop()
+    report = {}
+    for phase, func in PHASES:
+        start = time.perf_counter()
+        if in_event_loop and phase in DATABASE_PHASES:
+            report.update(_run_in_thread(func))
+        else:
+            report.update(func())
+        report[f'{phase}_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    if not in_event_loop:
+        # warm_up() runs at import time, possibly in a server's master
+        # process: forked workers must not share the connections it opened
+        connections.close_all()
+    logger.info(json.dumps({'event': 'warmup', **report}))
+    return report